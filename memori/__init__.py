@@ -12,6 +12,7 @@ import os
 from uuid import uuid4
 
 from memori._config import Config
+from memori.llm._embeddings import EmbeddingOptions, warm_up_embeddings
 from memori.llm._providers import Anthropic as LlmProviderAnthropic
 from memori.llm._providers import Google as LlmProviderGoogle
 from memori.llm._providers import LangChain as LlmProviderLangChain
@@ -30,10 +31,16 @@ class Memori:
         self.config = Config()
         self.config.api_key = os.environ.get("MEMORI_API_KEY", None)
         self.config.enterprise = os.environ.get("MEMORI_ENTERPRISE", "0") == "1"
+        self.config.embeddings_warm_up = (
+            os.environ.get("MEMORI_EMBEDDINGS_WARM_UP", "0") == "1"
+        )
         self.config.session_id = uuid4()
         self.config.storage = StorageManager(self.config).start(conn)
         self.config.augmentation = AugmentationManager(self.config).start(conn)
 
+        if self.config.embeddings_warm_up:
+            warm_up_embeddings(options=EmbeddingOptions().configure(self.config))
+
         self.anthropic = LlmProviderAnthropic(self)
         self.google = LlmProviderGoogle(self)
         self.langchain = LlmProviderLangChain(self)
@@ -70,3 +77,6 @@ class Memori:
 
     def recall(self, query: str, limit: int = 5):
         return Recall(self.config).search_facts(query, limit)
+
+    def recall_many(self, queries: list[str], limit: int = 5):
+        return Recall(self.config).search_facts_many(queries, limit)
@@ -10,6 +10,7 @@ r"""
 
 import sys
 
+from memori._benchmark import Manager as BenchmarkManager
 from memori._cli import Cli
 from memori._config import Config
 from memori._setup import Manager as SetupManager
@@ -22,10 +23,16 @@ def main():
     cli.banner()
 
     if len(sys.argv) > 1:
-        if sys.argv[1] == "quota":
+        if sys.argv[1] == "benchmark":
+            BenchmarkManager(Config()).execute()
+        elif sys.argv[1] == "quota":
             ApiQuotaManager(Config()).execute()
         elif sys.argv[1] == "setup":
-            SetupManager(Config()).execute()
+            if len(sys.argv) > 3:
+                print("usage: python -m memori setup [embeddings_backend]\n")
+                sys.exit(1)
+
+            SetupManager(Config()).execute(sys.argv[2] if len(sys.argv) == 3 else None)
         elif sys.argv[1] == "sign-up":
             if len(sys.argv) != 3:
                 print("usage: python -m memori sign-up <email_address>\n")
@@ -0,0 +1,104 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import time
+
+import numpy as np
+
+from memori._cli import Cli
+from memori._config import Config
+from memori._index import EntityIndex, IndexOptions
+
+SIZES = (16, 64, 256, 1024, 4096, 16384)
+
+
+def time_search(
+    backend: str,
+    num_rows: int,
+    dimension: int = 768,
+    limit: int = 5,
+    repeat: int = 50,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Time an exact search over num_rows random embeddings with one backend.
+
+    Returns:
+        Tuple of (cold, warm) median seconds; cold builds the index and then
+        searches it, as a recall without the index cache does, warm searches
+        an index that was already built
+    """
+    rng = np.random.default_rng(seed)
+    matrix = rng.standard_normal((num_rows, dimension)).astype(np.float32)
+    query = rng.standard_normal(dimension).astype(np.float32)
+
+    options = IndexOptions()
+    options.numpy_threshold = num_rows + 1 if backend == "numpy" else 0
+
+    ids = list(range(num_rows))
+    index = EntityIndex(ids, matrix.copy(), options)
+
+    cold = []
+    warm = []
+    for _ in range(repeat):
+        rows = matrix.copy()
+        start = time.perf_counter()
+        EntityIndex(ids, rows, options).search(query, limit)
+        cold.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index.search(query, limit)
+        warm.append(time.perf_counter() - start)
+
+    return float(np.median(cold)), float(np.median(warm))
+
+
+class Manager:
+    def __init__(self, config: Config):
+        self.config = config
+
+    def execute(self, sizes: tuple[int, ...] = SIZES):
+        cli = Cli(self.config)
+
+        cli.notice("Benchmarking exact recall search (768 dimensions, top 5)")
+        cli.notice("median microseconds, cold = build + search:", 1)
+        cli.notice("-----")
+        cli.notice(
+            f"{'facts':>8} {'numpy cold':>12} {'flat cold':>12} "
+            f"{'numpy warm':>12} {'flat warm':>12}",
+            1,
+        )
+
+        numpy_faster_to = None
+        for num_rows in sizes:
+            numpy_cold, numpy_warm = time_search("numpy", num_rows)
+            flat_cold, flat_warm = time_search("flat", num_rows)
+            cli.notice(
+                f"{num_rows:>8} {numpy_cold * 1e6:>12.1f} {flat_cold * 1e6:>12.1f} "
+                f"{numpy_warm * 1e6:>12.1f} {flat_warm * 1e6:>12.1f}",
+                1,
+            )
+
+            if numpy_cold < flat_cold:
+                numpy_faster_to = num_rows
+
+        cli.notice("-----\n")
+
+        if numpy_faster_to is None:
+            cli.notice("FAISS was faster to build and search at every size")
+        else:
+            cli.notice(
+                f"numpy was faster to build and search up to {numpy_faster_to:,} facts"
+            )
+        cli.notice(
+            "current recall_numpy_threshold: "
+            + f"{self.config.recall_numpy_threshold:,}\n"
+        )
+
+        return self
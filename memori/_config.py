@@ -17,6 +17,7 @@ class Cache:
         self.conversation_id = None
         self.entity_id = None
         self.process_id = None
+        self.recall_context_tokens = 0
         self.session_id = None
 
 
@@ -30,15 +31,47 @@ class Config:
         self.api_key = None
         self.augmentation = None
         self.cache = Cache()
+        self.embeddings_backend = "sentence-transformers"
+        self.embeddings_batch_max_size = None
+        self.embeddings_batch_secs_max_wait = 0.005
+        self.embeddings_format = "float32"
+        self.embeddings_process_threads = None
+        self.embeddings_processes = None
+        self.embeddings_warm_up = False
         self.enterprise = False
         self.llm = Llm()
         self.framework = Framework()
         self.entity_id = None
         self.process_id = None
         self.raise_final_request_attempt = True
+        self.recall_ann_backend = None
+        self.recall_ann_hnsw_ef_construction = 40
+        self.recall_ann_hnsw_ef_search = 64
+        self.recall_ann_hnsw_m = 32
+        self.recall_ann_ivf_nlist = None
+        self.recall_ann_ivf_nprobe = 16
+        self.recall_ann_threshold = 10000
+        self.recall_batch_secs_window = None
+        self.recall_context_dedup_threshold = None
+        self.recall_context_max_tokens = None
+        self.recall_context_max_tokens_by_model = {}
+        self.recall_embeddings_include_content = False
         self.recall_embeddings_limit = 1000
         self.recall_facts_limit = 5
+        self.recall_index_cache_max_bytes = 0
+        self.recall_index_cache_secs_ttl = 300
+        self.recall_lexical_limit = 20
+        self.recall_lexical_weight = 0.0
+        self.recall_numpy_threshold = 4096
+        self.recall_rank_weight = 0.0
         self.recall_relevance_threshold = 0.1
+        self.recall_scan_chunk_size = None
+        self.recall_shared_matrix_dir = None
+        self.recall_shared_matrix_max_bytes = 1 << 30
+        self.recall_shared_matrix_secs_ttl = 300
+        self.recall_signature_candidates = None
+        self.recall_snapshot_dir = None
+        self.recall_snapshot_max_bytes = 1 << 33
         self.request_backoff_factor = 1
         self.request_num_backoff = 5
         self.request_secs_timeout = 5
@@ -0,0 +1,522 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+class IndexOptions:
+    """Controls which index type is built for an entity.
+
+    Entities with fewer than numpy_threshold facts are searched exactly with a
+    numpy matrix product, which skips the cost of building a FAISS index.
+    Entities with fewer than ann_threshold facts use an exact flat FAISS
+    inner-product index. Larger entities use the approximate nearest neighbour
+    backend named by ann_backend ("hnsw" or "ivf"), if one is configured and
+    the index cache can keep the built index; an ANN index takes far longer
+    to build than an exact search, so one that would be rebuilt on every
+    recall is replaced by a flat index.
+    `python -m memori benchmark` measures where numpy stops paying off.
+
+    A non-zero rank_weight blends similarity with each fact's position in the
+    frequency/recency order the embeddings were loaded in.
+    """
+
+    def __init__(self):
+        self.ann_backend: str | None = None
+        self.ann_threshold = 10000
+        self.hnsw_m = 32
+        self.hnsw_ef_construction = 40
+        self.hnsw_ef_search = 64
+        self.ivf_nlist: int | None = None
+        self.ivf_nprobe = 16
+        self.numpy_threshold = 4096
+        self.rank_weight = 0.0
+
+    def configure(self, config) -> "IndexOptions":
+        self.ann_backend = config.recall_ann_backend
+        self.ann_threshold = config.recall_ann_threshold
+        self.hnsw_m = config.recall_ann_hnsw_m
+        self.hnsw_ef_construction = config.recall_ann_hnsw_ef_construction
+        self.hnsw_ef_search = config.recall_ann_hnsw_ef_search
+        self.ivf_nlist = config.recall_ann_ivf_nlist
+        self.ivf_nprobe = config.recall_ann_ivf_nprobe
+        self.numpy_threshold = config.recall_numpy_threshold
+        self.rank_weight = config.recall_rank_weight
+
+        if self.ann_backend is not None and not config.recall_index_cache_max_bytes:
+            warnings.warn(
+                "recall_ann_backend needs recall_index_cache_max_bytes; without "
+                "an index cache budget, recall uses an exact flat index.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+        return self
+
+    def backend_for(
+        self,
+        num_rows: int,
+        dimension: int | None = None,
+        max_bytes: int | None = None,
+    ) -> str:
+        """Select the backend for an entity of num_rows facts.
+
+        When max_bytes is given, an ANN backend is only selected if its index
+        fits in that many bytes, i.e. if the index cache will keep it.
+        """
+        if self.ann_backend is None or num_rows < self.ann_threshold:
+            return "numpy" if num_rows < self.numpy_threshold else "flat"
+
+        if self.ann_backend not in ("hnsw", "ivf"):
+            raise ValueError(f"Unsupported ANN backend: {self.ann_backend}")
+
+        if (
+            max_bytes is not None
+            and dimension is not None
+            and self.nbytes_for(self.ann_backend, num_rows, dimension) > max_bytes
+        ):
+            return "flat"
+
+        return self.ann_backend
+
+    def nbytes_for(self, backend: str, num_rows: int, dimension: int) -> int:
+        """Estimate the size of an index, as EntityIndex.nbytes reports it."""
+        nbytes = num_rows * dimension * 4
+        if backend == "hnsw":
+            nbytes += num_rows * self.hnsw_m * 2 * 4
+        elif backend == "ivf":
+            nlist = min(self.ivf_nlist or max(1, int(np.sqrt(num_rows))), num_rows)
+            nbytes += num_rows * 8 + nlist * dimension * 4
+        return nbytes
+
+
+class MatrixIndex:
+    """Exact inner-product search over a numpy matrix.
+
+    Has the add/search/ntotal interface of a FAISS flat index, but adding rows
+    does not copy them into a FAISS-owned buffer and a search is a single
+    matrix product, so small entities avoid FAISS's fixed per-call overhead.
+    """
+
+    def __init__(self, dimension: int):
+        self.matrix = np.empty((0, dimension), dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.matrix)
+
+    def add(self, matrix: np.ndarray) -> None:
+        if self.ntotal == 0:
+            self.matrix = matrix
+        else:
+            self.matrix = np.concatenate([self.matrix, matrix], axis=0)
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        similarities = queries @ self.matrix.T
+        rows = np.arange(len(queries))[:, None]
+        if k < self.ntotal:
+            indices = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            order = np.argsort(-similarities[rows, indices], axis=1, kind="stable")
+            indices = indices[rows, order]
+        else:
+            indices = np.argsort(-similarities, axis=1, kind="stable")
+
+        return similarities[rows, indices], indices
+
+
+def _normalize_rows(matrix: np.ndarray) -> None:
+    """L2-normalize the rows of a float32 matrix in place, as faiss.normalize_L2."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+class EntityIndex:
+    """FAISS inner-product index over the normalized fact embeddings of an entity.
+
+    Args:
+        ids: Fact ids, positionally aligned with the rows of matrix
+        matrix: 2D float32 array of embeddings, one row per fact
+        options: Index type selection; defaults to an exact flat index
+        max_bytes: Size an ANN index may have, usually the index cache budget;
+            larger ones are built as flat indexes instead
+    """
+
+    def __init__(
+        self,
+        ids: list[Any],
+        matrix: np.ndarray,
+        options: IndexOptions | None = None,
+        max_bytes: int | None = None,
+    ):
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if not matrix.flags.writeable:
+            matrix = matrix.copy()
+        _normalize_rows(matrix)
+
+        if options is None:
+            options = IndexOptions()
+
+        self.ids = list(ids)
+        self.positions = {fact_id: i for i, fact_id in enumerate(self.ids)}
+        self.contents: dict[Any, Any] = {}
+        self.content_nbytes = 0
+        self.dimension = matrix.shape[1]
+        self.backend = options.backend_for(len(self.ids), self.dimension, max_bytes)
+        self.index = self._build(matrix, options)
+        self.date_created = time.time()
+        self.lock = threading.Lock()
+
+    def _build(self, matrix: np.ndarray, options: IndexOptions):
+        if self.backend == "numpy":
+            index = MatrixIndex(self.dimension)
+            index.add(matrix)
+            return index
+
+        # Imported here so that processes which never build a FAISS index,
+        # such as those that only write, do not pay for loading it.
+        import faiss
+
+        if self.backend == "hnsw":
+            index = faiss.IndexHNSWFlat(
+                self.dimension, options.hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            index.hnsw.efConstruction = options.hnsw_ef_construction
+            index.hnsw.efSearch = options.hnsw_ef_search
+        elif self.backend == "ivf":
+            nlist = options.ivf_nlist or max(1, int(np.sqrt(len(matrix))))
+            nlist = min(nlist, len(matrix))
+            self._quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFFlat(
+                self._quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(matrix)  # type: ignore[call-arg]
+            index.nprobe = min(options.ivf_nprobe, nlist)
+            index.make_direct_map()
+        else:
+            index = faiss.IndexFlatIP(self.dimension)
+
+        index.add(matrix)  # type: ignore[call-arg]
+        return index
+
+    @property
+    def nbytes(self) -> int:
+        nbytes = self.index.ntotal * self.dimension * 4
+        if self.backend == "hnsw":
+            nbytes += self.index.ntotal * self.index.hnsw.nb_neighbors(0) * 4
+        elif self.backend == "ivf":
+            nbytes += self.index.ntotal * 8 + self.index.nlist * self.dimension * 4
+        return nbytes + self.content_nbytes
+
+    def add(self, ids: list[Any], matrix: np.ndarray) -> int:
+        """Add new rows to the index, skipping ids that are already present.
+
+        Returns:
+            Number of rows added
+        """
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            return 0
+
+        keep = []
+        seen = set()
+        for i, fact_id in enumerate(ids):
+            if fact_id not in self.positions and fact_id not in seen:
+                keep.append(i)
+                seen.add(fact_id)
+
+        if not keep:
+            return 0
+
+        rows = np.ascontiguousarray(matrix[keep], dtype=np.float32)
+        _normalize_rows(rows)
+
+        with self.lock:
+            self.index.add(rows)  # type: ignore[call-arg]
+            for i in keep:
+                self.positions[ids[i]] = len(self.ids)
+                self.ids.append(ids[i])
+
+        return len(keep)
+
+    def add_contents(self, contents: dict[Any, Any]) -> int:
+        """Remember the content of facts in the index, so it need not be fetched.
+
+        Returns:
+            Number of contents added
+        """
+        added = 0
+        with self.lock:
+            for fact_id, content in contents.items():
+                if fact_id in self.positions and fact_id not in self.contents:
+                    self.contents[fact_id] = content
+                    self.content_nbytes += len(str(content))
+                    added += 1
+
+        return added
+
+    def vectors(self, ids: list[Any]) -> dict[Any, np.ndarray]:
+        """Return the normalized embeddings of the given facts in the index."""
+        vectors = {}
+        with self.lock:
+            for fact_id in ids:
+                position = self.positions.get(fact_id)
+                if position is None:
+                    continue
+                if self.backend == "numpy":
+                    vectors[fact_id] = self.index.matrix[position]
+                else:
+                    vectors[fact_id] = self.index.reconstruct(position)
+
+        return vectors
+
+    def search(self, query_embedding, limit: int) -> list[tuple[Any, float]]:
+        """Search the index for the rows most similar to the query.
+
+        Returns:
+            List of (id, similarity_score) tuples, sorted by similarity desc
+        """
+        return self.search_many([query_embedding], limit)[0]
+
+    def search_many(
+        self, query_embeddings: list, limit: int, rank_weight: float = 0.0
+    ) -> list[list[tuple[Any, float]]]:
+        """Search the index for several queries in one batch.
+
+        Args:
+            query_embeddings: Query embeddings, one row per query
+            limit: Number of results to return per query
+            rank_weight: Weight in [0, 1] of the frequency/recency prior, i.e.
+                the fact's position in load order, blended with similarity
+
+        Returns:
+            One list of (id, similarity_score) tuples per query, each sorted by
+            similarity desc (or by blended score when rank_weight is set)
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        query_array = np.array(query_embeddings, dtype=np.float32)
+        if query_array.ndim != 2 or query_array.shape[1] != self.dimension:
+            return [[] for _ in query_embeddings]
+
+        _normalize_rows(query_array)
+
+        with self.lock:
+            k = min(limit, self.index.ntotal)
+            if k <= 0:
+                return [[] for _ in query_embeddings]
+
+            k_candidates = k
+            if rank_weight > 0:
+                k_candidates = self.index.ntotal
+                # Exact backends blend over every fact; only the approximate
+                # ones, whose searches grow costly with k, are capped.
+                if self.backend in ("hnsw", "ivf"):
+                    k_candidates = min(k_candidates, limit * 10)
+
+            similarities, indices = self.index.search(query_array, k_candidates)  # type: ignore[call-arg]
+            ids = self.ids
+            num_rows = len(ids)
+
+        if rank_weight > 0:
+            similarities, indices = _blend_rank(
+                similarities, indices, num_rows, k, rank_weight
+            )
+
+        results = []
+        for query_idx in range(len(query_array)):
+            query_results = []
+            for result_idx, embedding_idx in enumerate(indices[query_idx]):
+                if embedding_idx >= 0 and embedding_idx < len(ids):
+                    query_results.append(
+                        (ids[embedding_idx], float(similarities[query_idx][result_idx]))
+                    )
+            results.append(query_results)
+
+        return results
+
+
+def _blend_rank(
+    similarities: np.ndarray,
+    indices: np.ndarray,
+    num_rows: int,
+    k: int,
+    rank_weight: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    valid = (indices >= 0) & (indices < num_rows)
+    prior = 1.0 - indices / max(num_rows, 1)
+    scores = np.where(
+        valid, (1.0 - rank_weight) * similarities + rank_weight * prior, -np.inf
+    )
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return (
+        np.take_along_axis(similarities, order, axis=1),
+        np.take_along_axis(indices, order, axis=1),
+    )
+
+
+class IndexCache:
+    """In-process LRU cache of entity indexes, bounded by memory.
+
+    Entries are keyed by entity id. New facts written by EntityFact.create are
+    added to a cached entry incrementally, and fact contents are kept once
+    fetched; entries are dropped when the memory budget is exceeded, when they
+    outlive the TTL or when invalidated.
+    """
+
+    def __init__(self):
+        self.entries: OrderedDict[Any, EntityIndex] = OrderedDict()
+        self.lock = threading.Lock()
+        self.max_bytes = 0
+        self.secs_ttl: float | None = None
+        self.nbytes = 0
+
+    def configure(self, config) -> "IndexCache":
+        self.max_bytes = config.recall_index_cache_max_bytes
+        self.secs_ttl = config.recall_index_cache_secs_ttl
+        return self
+
+    def add(
+        self,
+        entity_id,
+        ids: list[Any],
+        embeddings: list,
+        contents: list | None = None,
+    ) -> "IndexCache":
+        """Add freshly written facts to a cached entity index, if there is one."""
+        index = self.get(entity_id)
+        if index is None or not ids:
+            return self
+
+        rows = []
+        row_ids = []
+        row_contents = {}
+        for i, (fact_id, embedding) in enumerate(zip(ids, embeddings, strict=False)):
+            if embedding is None or len(embedding) != index.dimension:
+                continue
+            rows.append(embedding)
+            row_ids.append(fact_id)
+            if contents is not None and i < len(contents):
+                row_contents[fact_id] = contents[i]
+
+        if not rows:
+            return self
+
+        before = index.nbytes
+        index.add(row_ids, np.asarray(rows, dtype=np.float32))
+        index.add_contents(row_contents)
+
+        with self.lock:
+            if self.entries.get(entity_id) is index:
+                self.nbytes += index.nbytes - before
+                self._evict()
+
+        return self
+
+    def add_contents(
+        self, entity_id, index: EntityIndex, contents: dict[Any, Any]
+    ) -> "IndexCache":
+        """Remember fetched fact contents on an index, keeping the budget."""
+        before = index.nbytes
+        if index.add_contents(contents) == 0:
+            return self
+
+        with self.lock:
+            if self.entries.get(entity_id) is index:
+                self.nbytes += index.nbytes - before
+                self._evict()
+
+        return self
+
+    def clear(self) -> "IndexCache":
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+        return self
+
+    def contains(self, entity_id) -> bool:
+        with self.lock:
+            return entity_id in self.entries
+
+    def get(self, entity_id) -> EntityIndex | None:
+        with self.lock:
+            index = self.entries.get(entity_id)
+            if index is None:
+                return None
+
+            if (
+                self.secs_ttl is not None
+                and time.time() - index.date_created > self.secs_ttl
+            ):
+                self._remove(entity_id)
+                return None
+
+            self.entries.move_to_end(entity_id)
+            return index
+
+    def invalidate(self, entity_id) -> "IndexCache":
+        with self.lock:
+            self._remove(entity_id)
+        return self
+
+    def put(self, entity_id, index: EntityIndex) -> EntityIndex:
+        with self.lock:
+            self._remove(entity_id)
+
+            if index.nbytes > self.max_bytes:
+                return index
+
+            self.entries[entity_id] = index
+            self.nbytes += index.nbytes
+            self._evict()
+
+        return index
+
+    def _evict(self) -> None:
+        while self.entries and self.nbytes > self.max_bytes:
+            _, index = self.entries.popitem(last=False)
+            self.nbytes -= index.nbytes
+
+    def _remove(self, entity_id) -> None:
+        index = self.entries.pop(entity_id, None)
+        if index is not None:
+            self.nbytes -= index.nbytes
+
+
+_index_caches: dict[Any, IndexCache] = {None: IndexCache()}
+_index_caches_lock = threading.Lock()
+
+
+def get_index_cache(config=None) -> IndexCache:
+    """Return the process's index cache for config's budget and TTL.
+
+    Memori instances configured alike share a cache and others get their own,
+    so that no instance changes the budget of another. Without a config, the
+    unconfigured default cache is returned.
+    """
+    key = None
+    if config is not None:
+        key = (config.recall_index_cache_max_bytes, config.recall_index_cache_secs_ttl)
+
+    with _index_caches_lock:
+        if key not in _index_caches:
+            _index_caches[key] = IndexCache().configure(config)
+        return _index_caches[key]
+
+
+def get_index_caches() -> list[IndexCache]:
+    """Return every index cache in the process."""
+    with _index_caches_lock:
+        return list(_index_caches.values())
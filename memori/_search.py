@@ -8,34 +8,434 @@ r"""
                       memorilabs.ai
 """
 
+import heapq
 import json
+import re
+import struct
 from typing import Any
 
-import faiss
 import numpy as np
 
+from memori._index import EntityIndex, IndexCache, IndexOptions, _blend_rank
+from memori._shared import SharedMatrixStore
+from memori._snapshot import SnapshotStore
+
+# Embeddings written in a format other than plain float32 start with an 8 byte
+# header: magic, version, dtype code and dimension count. The magic bytes read
+# as a NaN float32, so they can never start an unversioned embedding.
+EMBEDDING_HEADER = struct.Struct("<4sBBH")
+EMBEDDING_MAGIC = b"ME\xff\x7f"
+EMBEDDING_VERSION = 1
+EMBEDDING_FORMATS = {"float32": 1, "float16": 2, "int8": 3}
+_EMBEDDING_DTYPES = {1: "<f4", 2: "<f2", 3: "i1"}
+_INT8_SCALE = struct.Struct("<f")
+
+
+def encode_embedding(embedding, embeddings_format: str = "float32") -> bytes:
+    """Encode an embedding into its binary database format.
+
+    float32 embeddings are written as plain little-endian floats without a
+    header, the layout used by every version of Memori. float16 and int8
+    embeddings get a versioned header; int8 embeddings are scaled by a single
+    per-embedding factor stored after the header.
+    """
+    if embeddings_format not in EMBEDDING_FORMATS:
+        raise ValueError(f"Unsupported embeddings format: {embeddings_format}")
+
+    values = np.asarray(embedding, dtype=np.float32).ravel()
+    if embeddings_format == "float32":
+        return values.astype("<f4", copy=False).tobytes()
+
+    header = EMBEDDING_HEADER.pack(
+        EMBEDDING_MAGIC,
+        EMBEDDING_VERSION,
+        EMBEDDING_FORMATS[embeddings_format],
+        len(values),
+    )
+    if embeddings_format == "float16":
+        return header + values.astype("<f2").tobytes()
+
+    max_abs = float(np.abs(values).max()) if len(values) else 0.0
+    scale = max_abs / 127 if max_abs > 0 else 1.0
+    quantized = np.clip(np.rint(values / scale), -127, 127).astype("i1")
+    return header + _INT8_SCALE.pack(scale) + quantized.tobytes()
+
+
+def _decode_embedding(raw: bytes) -> np.ndarray:
+    if len(raw) < EMBEDDING_HEADER.size or raw[:4] != EMBEDDING_MAGIC:
+        return np.frombuffer(raw, dtype="<f4")
+
+    _, version, dtype_code, dimensions = EMBEDDING_HEADER.unpack_from(raw)
+    if version != EMBEDDING_VERSION or dtype_code not in _EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding encoding: v{version}/{dtype_code}")
+
+    offset = EMBEDDING_HEADER.size
+    if dtype_code == EMBEDDING_FORMATS["int8"]:
+        (scale,) = _INT8_SCALE.unpack_from(raw, offset)
+        values = np.frombuffer(
+            raw, dtype="i1", count=dimensions, offset=offset + _INT8_SCALE.size
+        )
+        return values.astype(np.float32) * np.float32(scale)
+
+    values = np.frombuffer(
+        raw, dtype=_EMBEDDING_DTYPES[dtype_code], count=dimensions, offset=offset
+    )
+    return values.astype(np.float32)
+
 
 def parse_embedding(raw) -> np.ndarray:
     """Parse embedding from database format to numpy array.
 
     Handles multiple storage formats:
-    - Binary (BYTEA/BLOB/BinData): Most common, used by all databases
+    - Binary (BYTEA/BLOB/BinData): Most common, used by all databases; either
+      plain float32 or a versioned float16/int8 encoding
     - JSON string: Legacy format
     - Native array: Fallback
     """
     if isinstance(raw, bytes | memoryview):
-        return np.frombuffer(raw, dtype="<f4")
+        return _decode_embedding(bytes(raw))
     elif isinstance(raw, str):
         # Legacy JSON format
         return np.array(json.loads(raw), dtype=np.float32)
     else:
         # Try to extract bytes from bson.Binary or other wrappers
         if hasattr(raw, "__bytes__"):
-            return np.frombuffer(bytes(raw), dtype="<f4")
+            return _decode_embedding(bytes(raw))
         # Fallback to native array (MongoDB array format)
         return np.asarray(raw, dtype=np.float32)
 
 
+def _blob_size(raw) -> int | None:
+    if isinstance(raw, memoryview):
+        return raw.nbytes
+    if isinstance(raw, bytes):
+        return len(raw)
+    return None
+
+
+def _decode_blobs(blobs: np.ndarray) -> np.ndarray | None:
+    """Decode equally sized blobs, one per row of a uint8 array, in one step.
+
+    Returns:
+        float32 matrix, or None when the blobs do not share one encoding
+    """
+    size = blobs.shape[1]
+    header_size = EMBEDDING_HEADER.size
+    magic = np.frombuffer(EMBEDDING_MAGIC, dtype=np.uint8)
+    versioned = (
+        (blobs[:, :4] == magic).all(axis=1)
+        if size >= header_size
+        else np.zeros(len(blobs), dtype=bool)
+    )
+
+    if not versioned.any():
+        if size % 4 != 0:
+            return None
+        return blobs.view("<f4")
+
+    if (
+        not versioned.all()
+        or not (blobs[:, :header_size] == blobs[0, :header_size]).all()
+    ):
+        return None
+
+    _, version, dtype_code, dimensions = EMBEDDING_HEADER.unpack(
+        blobs[0, :header_size].tobytes()
+    )
+    if version != EMBEDDING_VERSION or dtype_code not in _EMBEDDING_DTYPES:
+        return None
+
+    if dtype_code == EMBEDDING_FORMATS["int8"]:
+        scale_end = header_size + _INT8_SCALE.size
+        if size != scale_end + dimensions:
+            return None
+        scales = np.ascontiguousarray(blobs[:, header_size:scale_end]).view("<f4")
+        values = np.ascontiguousarray(blobs[:, scale_end:]).view("i1")
+        return values.astype(np.float32) * scales
+
+    dtype = np.dtype(_EMBEDDING_DTYPES[dtype_code])
+    if size != header_size + dimensions * dtype.itemsize:
+        return None
+    values = np.ascontiguousarray(blobs[:, header_size:]).view(dtype)
+    return values.astype(np.float32)
+
+
+def parse_embeddings(
+    ids: list[Any], raws: list[Any]
+) -> tuple[list[Any], np.ndarray | None]:
+    """Parse a column of embeddings into one contiguous float32 matrix.
+
+    When every embedding is a binary blob of the same size and encoding (the
+    formats written by format_embedding_for_db), the column is decoded in a
+    single vectorized step. Otherwise each row is parsed on its own and
+    malformed rows are skipped.
+
+    Args:
+        ids: Fact ids, positionally aligned with raws
+        raws: Embeddings in database format
+
+    Returns:
+        Tuple of (ids, matrix); matrix is None when nothing could be parsed
+    """
+    if not raws:
+        return [], None
+
+    size = _blob_size(raws[0])
+    if size and all(_blob_size(raw) == size for raw in raws):
+        blobs = np.frombuffer(bytearray().join(raws), dtype=np.uint8)
+        matrix = _decode_blobs(blobs.reshape(len(raws), size))
+        if matrix is not None:
+            return list(ids), matrix
+
+    embeddings_list = []
+    id_list = []
+
+    for fact_id, raw in zip(ids, raws, strict=True):
+        try:
+            parsed = parse_embedding(raw)
+            embeddings_list.append(parsed)
+            id_list.append(fact_id)
+        except Exception:
+            continue
+
+    if not embeddings_list:
+        return [], None
+
+    return id_list, np.stack(embeddings_list, axis=0)
+
+
+def compute_signature(embedding) -> bytes:
+    """Pack the sign bits of an embedding into a binary signature.
+
+    768 dimensions pack into 96 bytes. The Hamming distance between two
+    signatures approximates the angle between their embeddings.
+    """
+    return np.packbits(np.asarray(embedding, dtype=np.float32).ravel() > 0).tobytes()
+
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT[values]
+
+
+def hamming_top_k(
+    signatures: np.ndarray, query_signatures: np.ndarray, k: int
+) -> list[np.ndarray]:
+    """Find the signatures nearest to each query signature by Hamming distance.
+
+    Args:
+        signatures: 2D uint8 array, one packed signature per row
+        query_signatures: 2D uint8 array, one packed signature per query
+        k: Number of rows to return per query
+
+    Returns:
+        One array of row indices per query, nearest first
+    """
+    k = min(k, len(signatures))
+    if k <= 0:
+        return [np.empty(0, dtype=np.intp) for _ in query_signatures]
+
+    results = []
+    for query_signature in query_signatures:
+        distances = _popcount(signatures ^ query_signature).sum(axis=1, dtype=np.int32)
+        top = np.argpartition(distances, k - 1)[:k]
+        results.append(top[np.argsort(distances[top], kind="stable")])
+
+    return results
+
+
+def search_signatures(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    candidates: int,
+    embeddings_limit: int | None = None,
+    vectors: dict[Any, np.ndarray] | None = None,
+) -> list[list[tuple[Any, float]]] | None:
+    """Shortlist facts by signature, then rerank them on their embeddings.
+
+    Only the shortlisted facts' embeddings are fetched from the database.
+
+    Args:
+        entity_fact_driver: Driver instance with get_signatures and
+            get_embeddings_by_ids methods
+        entity_id: Entity ID to search within
+        query_embeddings: Query embeddings, one list of floats per query
+        limit: Number of results to return per query
+        candidates: Number of facts to shortlist per query
+        embeddings_limit: Optional maximum number of signatures to scan
+        vectors: Optional dict that the embeddings of the results are added to
+
+    Returns:
+        One list of (id, similarity_score) tuples per query, or None when the
+        driver does not store signatures or some facts have none yet
+    """
+    rows = entity_fact_driver.get_signatures(entity_id, embeddings_limit)
+    if rows is None:
+        return None
+
+    # Facts written before the signatures were backfilled would never be
+    # shortlisted, so search without signatures until they all have one.
+    # Empty signatures, written for facts without an embedding, count as
+    # missing.
+    if any(not row["content_signature"] for row in rows):
+        return None
+
+    query_signatures = np.stack(
+        [
+            np.frombuffer(compute_signature(query_embedding), dtype=np.uint8)
+            for query_embedding in query_embeddings
+        ]
+    )
+    size = query_signatures.shape[1]
+
+    ids = []
+    raws = []
+    for row in rows:
+        if _blob_size(row["content_signature"]) == size:
+            ids.append(row["id"])
+            raws.append(row["content_signature"])
+    if not ids:
+        return [[] for _ in query_embeddings]
+
+    signatures = np.frombuffer(bytearray().join(raws), dtype=np.uint8)
+    shortlists = hamming_top_k(
+        signatures.reshape(len(ids), size), query_signatures, max(candidates, limit)
+    )
+
+    candidate_ids = list(
+        dict.fromkeys(ids[i] for shortlist in shortlists for i in shortlist)
+    )
+    embeddings = {
+        row["id"]: row["content_embedding"]
+        for row in entity_fact_driver.get_embeddings_by_ids(candidate_ids)
+    }
+
+    similar_many = [
+        find_similar_embeddings(
+            [(ids[i], embeddings[ids[i]]) for i in shortlist if ids[i] in embeddings],
+            query_embedding,
+            limit,
+        )
+        for shortlist, query_embedding in zip(shortlists, query_embeddings, strict=True)
+    ]
+    if vectors is not None:
+        for fact_id in _top_ids(similar_many):
+            vectors[fact_id] = parse_embedding(embeddings[fact_id])
+
+    return similar_many
+
+
+_RRF_K = 60
+
+
+def lexical_terms(text: str) -> list[str]:
+    """Split query text into the words used for full-text search."""
+    return re.findall(r"\w+", text.lower())
+
+
+def search_lexical(
+    entity_fact_driver, entity_id: int, query_texts: list[str], limit: int
+) -> list[list[dict]] | None:
+    """Search entity facts with the database's full-text index.
+
+    Returns:
+        One list of dicts with keys id, content, score per query, best match
+        first, or None when the datastore has no full-text index
+    """
+    results = []
+    for query_text in query_texts:
+        rows = entity_fact_driver.search_lexical(entity_id, query_text, limit)
+        if rows is None:
+            return None
+
+        results.append(
+            [
+                {"id": row["id"], "content": row["content"], "score": row["score"]}
+                for row in rows
+            ]
+        )
+
+    return results
+
+
+def fuse_facts(
+    entity_fact_driver,
+    query_embeddings: list[list[float]],
+    dense_many: list[list[dict]],
+    lexical_many: list[list[dict]],
+    limit: int,
+    lexical_weight: float,
+    include_embeddings: bool = False,
+) -> list[list[dict]]:
+    """Fuse vector and full-text results with weighted reciprocal rank fusion.
+
+    Facts that only the full-text stage found have their embeddings fetched,
+    so every result still carries its cosine similarity to the query.
+
+    Returns:
+        One list of dicts with keys id, content, similarity per query, ordered
+        by fused rank
+    """
+    lexical_only = []
+    for dense, lexical in zip(dense_many, lexical_many, strict=True):
+        dense_ids = {fact["id"] for fact in dense}
+        lexical_only.extend(
+            fact["id"] for fact in lexical if fact["id"] not in dense_ids
+        )
+
+    vectors: dict[Any, np.ndarray] = {}
+    if lexical_only:
+        rows = entity_fact_driver.get_embeddings_by_ids(
+            list(dict.fromkeys(lexical_only))
+        )
+        ids, matrix = parse_embeddings(
+            [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+        )
+        if matrix is not None:
+            vectors = dict(zip(ids, _normalize_rows(matrix), strict=True))
+
+    results = []
+    for query_embedding, dense, lexical in zip(
+        query_embeddings, dense_many, lexical_many, strict=True
+    ):
+        query = _normalize_rows(np.asarray(query_embedding, dtype=np.float32))
+        scores: dict[Any, float] = {}
+        facts: dict[Any, dict] = {}
+
+        for rank, fact in enumerate(dense):
+            scores[fact["id"]] = (1 - lexical_weight) / (_RRF_K + rank + 1)
+            facts[fact["id"]] = fact
+
+        for rank, fact in enumerate(lexical):
+            fact_id = fact["id"]
+            scores[fact_id] = scores.get(fact_id, 0.0) + lexical_weight / (
+                _RRF_K + rank + 1
+            )
+            if fact_id not in facts:
+                vector = vectors.get(fact_id)
+                similarity = 0.0
+                if vector is not None and vector.shape == query.shape:
+                    similarity = float(vector @ query)
+                facts[fact_id] = {
+                    "id": fact_id,
+                    "content": fact["content"],
+                    "similarity": similarity,
+                }
+                if include_embeddings and vector is not None:
+                    facts[fact_id]["embedding"] = vector
+
+        ranked = sorted(scores, key=lambda fact_id: -scores[fact_id])
+        results.append([facts[fact_id] for fact_id in ranked[:limit]])
+
+    return results
+
+
 def find_similar_embeddings(
     embeddings: list[tuple[int, Any]],
     query_embedding: list[float],
@@ -54,42 +454,67 @@ def find_similar_embeddings(
     if not embeddings:
         return []
 
-    embeddings_list = []
-    id_list = []
+    id_list, embeddings_array = parse_embeddings(
+        [fact_id for fact_id, _ in embeddings], [raw for _, raw in embeddings]
+    )
+    if embeddings_array is None:
+        return []
 
-    for fact_id, raw in embeddings:
-        try:
-            parsed = parse_embedding(raw)
-            embeddings_list.append(parsed)
-            id_list.append(fact_id)
-        except Exception:
-            continue
+    return EntityIndex(id_list, embeddings_array).search(query_embedding, limit)
 
-    if not embeddings_list:
-        return []
 
-    embeddings_array = np.stack(embeddings_list, axis=0)
+def _uses_snapshot(
+    snapshot_store: SnapshotStore | None, embeddings_limit: int | None
+) -> bool:
+    # Snapshots hold all of an entity's facts in id order, so they can only
+    # stand in for a load without a limit.
+    return (
+        snapshot_store is not None
+        and snapshot_store.enabled
+        and embeddings_limit is None
+    )
 
-    faiss.normalize_L2(embeddings_array)
-    query_array = np.asarray([query_embedding], dtype=np.float32)
 
-    if embeddings_array.shape[1] != query_array.shape[1]:
-        return []
+def _load_embedding_matrix(
+    entity_fact_driver,
+    entity_id: int,
+    embeddings_limit: int | None,
+    snapshot_store: SnapshotStore | None = None,
+) -> tuple[list[Any], np.ndarray | None]:
+    if snapshot_store is not None and _uses_snapshot(snapshot_store, embeddings_limit):
+        return snapshot_store.load(entity_fact_driver, entity_id)
 
-    faiss.normalize_L2(query_array)
+    return entity_fact_driver.get_embedding_matrix(entity_id, embeddings_limit)
 
-    index = faiss.IndexFlatIP(embeddings_array.shape[1])
-    index.add(embeddings_array)  # type: ignore[call-arg]
 
-    k = min(limit, len(embeddings_array))
-    similarities, indices = index.search(query_array, k)  # type: ignore[call-arg]
+def _load_entity_index(
+    entity_fact_driver,
+    entity_id: int,
+    embeddings_limit: int | None,
+    index_options: IndexOptions | None = None,
+    include_content: bool = False,
+    snapshot_store: SnapshotStore | None = None,
+    max_bytes: int | None = None,
+) -> EntityIndex | None:
+    contents = None
+    if include_content and not _uses_snapshot(snapshot_store, embeddings_limit):
+        id_list, embeddings_array, contents = (
+            entity_fact_driver.get_embedding_matrix_with_content(
+                entity_id, embeddings_limit
+            )
+        )
+    else:
+        id_list, embeddings_array = _load_embedding_matrix(
+            entity_fact_driver, entity_id, embeddings_limit, snapshot_store
+        )
+    if embeddings_array is None:
+        return None
 
-    results = []
-    for result_idx, embedding_idx in enumerate(indices[0]):
-        if embedding_idx >= 0 and embedding_idx < len(id_list):
-            results.append((id_list[embedding_idx], float(similarities[0][result_idx])))
+    index = EntityIndex(id_list, embeddings_array, index_options, max_bytes)
+    if contents:
+        index.add_contents(contents)
 
-    return results
+    return index
 
 
 def search_entity_facts(
@@ -97,46 +522,469 @@ def search_entity_facts(
     entity_id: int,
     query_embedding: list[float],
     limit: int,
-    embeddings_limit: int,
+    embeddings_limit: int | None,
+    index_cache: IndexCache | None = None,
+    index_options: IndexOptions | None = None,
+    include_content: bool = False,
+    scan_chunk_size: int | None = None,
+    signature_candidates: int | None = None,
+    shared_store: SharedMatrixStore | None = None,
+    snapshot_store: SnapshotStore | None = None,
+    query_text: str | None = None,
+    lexical_weight: float = 0.0,
+    lexical_limit: int = 20,
+    include_embeddings: bool = False,
 ) -> list[dict]:
     """Search entity facts by embedding similarity.
 
     Args:
-        entity_fact_driver: Driver instance with get_embeddings and get_facts_by_ids methods
+        entity_fact_driver: Driver instance with search_similar,
+            get_embedding_matrix and get_facts_by_ids methods
         entity_id: Entity ID to search within
         query_embedding: Query embedding as list of floats
         limit: Number of results to return
-        embeddings_limit: Number of embeddings to retrieve from database
+        embeddings_limit: Number of embeddings to retrieve from database, or
+            None to retrieve all of the entity's embeddings
+        index_cache: Optional cache of entity indexes; when given, the entity's
+            embeddings are only fetched from the database on a cache miss
+        index_options: Optional index type selection (exact or ANN)
+        include_content: Fetch fact content together with the embeddings, so
+            that a search needs a single query instead of two
+        scan_chunk_size: Scan the entity's embeddings this many at a time with
+            bounded memory instead of loading them all into an index
+        signature_candidates: Shortlist this many facts by the Hamming distance
+            of their sign-bit signatures, then rerank them on full embeddings
+        shared_store: Optional node-local store of entity matrices shared
+            between processes; used for exact searches on an index cache miss
+        snapshot_store: Optional on-disk store of entity embedding snapshots;
+            when given and embeddings_limit is None, embeddings are read from
+            the snapshot and only facts newer than it are fetched
+        query_text: Query text, used for the full-text stage of hybrid recall
+        lexical_weight: Weight in [0, 1] of full-text rank when fusing it with
+            vector rank; 0 disables the full-text stage
+        lexical_limit: Number of full-text candidates to fuse
+        include_embeddings: Also return each fact's embedding, as already
+            loaded by the search, under the key embedding where known
 
     Returns:
         List of dicts with keys: id, content, similarity
+
+    Drivers that can rank facts on the database server (e.g. PostgreSQL with
+    pgvector) return results from search_similar; other drivers return None
+    and the entity's embeddings are searched in process with FAISS.
     """
-    results = entity_fact_driver.get_embeddings(entity_id, embeddings_limit)
+    return search_entity_facts_many(
+        entity_fact_driver,
+        entity_id,
+        [query_embedding],
+        limit,
+        embeddings_limit,
+        index_cache=index_cache,
+        index_options=index_options,
+        include_content=include_content,
+        scan_chunk_size=scan_chunk_size,
+        signature_candidates=signature_candidates,
+        shared_store=shared_store,
+        snapshot_store=snapshot_store,
+        query_texts=None if query_text is None else [query_text],
+        lexical_weight=lexical_weight,
+        lexical_limit=lexical_limit,
+        include_embeddings=include_embeddings,
+    )[0]
 
-    if not results:
-        return []
 
-    embeddings = [(row["id"], row["content_embedding"]) for row in results]
-    similar = find_similar_embeddings(embeddings, query_embedding, limit)
+def search_entity_facts_many(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    embeddings_limit: int | None,
+    index_cache: IndexCache | None = None,
+    index_options: IndexOptions | None = None,
+    include_content: bool = False,
+    scan_chunk_size: int | None = None,
+    signature_candidates: int | None = None,
+    shared_store: SharedMatrixStore | None = None,
+    snapshot_store: SnapshotStore | None = None,
+    query_texts: list[str] | None = None,
+    lexical_weight: float = 0.0,
+    lexical_limit: int = 20,
+    include_embeddings: bool = False,
+) -> list[list[dict]]:
+    """Search entity facts for several queries at once.
+
+    The entity's embeddings are loaded once, all queries are searched in a
+    single batch and fact content is fetched with one query.
+
+    Args:
+        entity_fact_driver: Driver instance with search_similar,
+            get_embedding_matrix and get_facts_by_ids methods
+        entity_id: Entity ID to search within
+        query_embeddings: Query embeddings, one list of floats per query
+        limit: Number of results to return per query
+        embeddings_limit: Number of embeddings to retrieve from database, or
+            None to retrieve all of the entity's embeddings
+        index_cache: Optional cache of entity indexes
+        index_options: Optional index type selection (exact or ANN)
+        include_content: Fetch fact content together with the embeddings
+        scan_chunk_size: Scan the entity's embeddings in chunks of this size
+        signature_candidates: Shortlist this many facts by signature first
+        shared_store: Optional node-local store of shared entity matrices
+        snapshot_store: Optional on-disk store of entity embedding snapshots
+        query_texts: Query texts, positionally aligned with query_embeddings
+        lexical_weight: Weight of full-text rank in hybrid recall
+        lexical_limit: Number of full-text candidates to fuse
+        include_embeddings: Also return each fact's embedding where known
 
-    if not similar:
+    Returns:
+        One list of dicts with keys id, content, similarity per query
+    """
+    if len(query_embeddings) == 0:
         return []
 
-    top_ids = [fact_id for fact_id, _ in similar]
-    similarities_map = dict(similar)
+    # Hybrid recall fuses the full-text matches with a complete dense search;
+    # they do not narrow it, so it costs one more query rather than saving any.
+    if lexical_weight > 0 and query_texts:
+        lexical_many = search_lexical(
+            entity_fact_driver, entity_id, query_texts, lexical_limit
+        )
+        if lexical_many is not None:
+            dense_many = search_entity_facts_many(
+                entity_fact_driver,
+                entity_id,
+                query_embeddings,
+                max(limit, lexical_limit),
+                embeddings_limit,
+                index_cache=index_cache,
+                index_options=index_options,
+                include_content=include_content,
+                scan_chunk_size=scan_chunk_size,
+                signature_candidates=signature_candidates,
+                shared_store=shared_store,
+                snapshot_store=snapshot_store,
+                include_embeddings=include_embeddings,
+            )
+            return fuse_facts(
+                entity_fact_driver,
+                query_embeddings,
+                dense_many,
+                lexical_many,
+                limit,
+                lexical_weight,
+                include_embeddings,
+            )
+
+    pushed_down = entity_fact_driver.search_similar(
+        entity_id, query_embeddings[0], limit
+    )
+    if pushed_down is not None:
+        results = [pushed_down]
+        for query_embedding in query_embeddings[1:]:
+            results.append(
+                entity_fact_driver.search_similar(entity_id, query_embedding, limit)
+            )
+
+        facts_many = []
+        for rows in results:
+            facts = []
+            for row in rows or []:
+                fact = {
+                    "id": row["id"],
+                    "content": row["content"],
+                    "similarity": float(row["similarity"]),
+                }
+                if include_embeddings and row.get("content_embedding") is not None:
+                    fact["embedding"] = parse_embedding(row["content_embedding"])
+                facts.append(fact)
+            facts_many.append(facts)
+
+        return facts_many
+
+    vectors: dict[Any, np.ndarray] | None = {} if include_embeddings else None
+    similar_many = None
+    if signature_candidates is not None:
+        similar_many = search_signatures(
+            entity_fact_driver,
+            entity_id,
+            query_embeddings,
+            limit,
+            signature_candidates,
+            embeddings_limit,
+            vectors,
+        )
+    if similar_many is None and scan_chunk_size is not None:
+        similar_many = scan_entity_embeddings(
+            entity_fact_driver,
+            entity_id,
+            query_embeddings,
+            limit,
+            scan_chunk_size,
+            vectors=vectors,
+        )
+
+    # Cached entries are keyed by the database as well as the entity, as
+    # entity ids are only unique within a database.
+    key = entity_fact_driver.cache_key(entity_id)
 
-    content_results = entity_fact_driver.get_facts_by_ids(top_ids)
-    content_map = {row["id"]: row["content"] for row in content_results}
+    index = None
+    if similar_many is None:
+        index = index_cache.get(key) if index_cache is not None else None
+        if (
+            index is None
+            and shared_store is not None
+            and shared_store.enabled
+            and (index_options is None or index_options.ann_backend is None)
+        ):
+            similar_many = search_shared_matrix(
+                entity_fact_driver,
+                shared_store,
+                entity_id,
+                query_embeddings,
+                limit,
+                embeddings_limit,
+                index_options.rank_weight if index_options is not None else 0.0,
+                snapshot_store,
+                vectors,
+            )
+
+    if similar_many is not None:
+        top_ids = _top_ids(similar_many)
+        if not top_ids:
+            return [[] for _ in query_embeddings]
+
+        content_map = {
+            row["id"]: row["content"]
+            for row in entity_fact_driver.get_facts_by_ids(top_ids)
+        }
+        return _facts_with_content(similar_many, content_map, vectors)
+
+    if index is None:
+        index = _load_entity_index(
+            entity_fact_driver,
+            entity_id,
+            embeddings_limit,
+            index_options,
+            include_content,
+            snapshot_store,
+            # An ANN index is only worth building when it stays cached.
+            index_cache.max_bytes if index_cache is not None else 0,
+        )
+        if index is None:
+            return [[] for _ in query_embeddings]
+
+        if index_cache is not None:
+            index_cache.put(key, index)
+
+    similar_many = index.search_many(
+        query_embeddings,
+        limit,
+        index_options.rank_weight if index_options is not None else 0.0,
+    )
+
+    top_ids = _top_ids(similar_many)
+    if not top_ids:
+        return [[] for _ in query_embeddings]
 
-    facts_with_similarity = []
-    for fact_id in top_ids:
-        if fact_id in content_map:
-            facts_with_similarity.append(
-                {
+    missing_ids = [fact_id for fact_id in top_ids if fact_id not in index.contents]
+    if missing_ids:
+        contents = {
+            row["id"]: row["content"]
+            for row in entity_fact_driver.get_facts_by_ids(missing_ids)
+        }
+        if index_cache is not None:
+            index_cache.add_contents(key, index, contents)
+        else:
+            index.add_contents(contents)
+
+    if vectors is not None:
+        vectors.update(index.vectors(top_ids))
+
+    return _facts_with_content(similar_many, index.contents, vectors)
+
+
+def search_shared_matrix(
+    entity_fact_driver,
+    shared_store: SharedMatrixStore,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    embeddings_limit: int | None,
+    rank_weight: float = 0.0,
+    snapshot_store: SnapshotStore | None = None,
+    vectors: dict[Any, np.ndarray] | None = None,
+) -> list[list[tuple[Any, float]]]:
+    """Exact search over an entity's matrix in the node-local shared store.
+
+    On a miss the matrix is loaded from the database and shared, so other
+    processes on the node can attach to it instead of loading it themselves.
+
+    Returns:
+        One list of (id, similarity_score) tuples per query, each sorted by
+        similarity desc (or by blended score when rank_weight is set)
+    """
+    key = entity_fact_driver.cache_key(entity_id)
+    shared = shared_store.get(key, embeddings_limit)
+    if shared is None:
+        token = shared_store.generation(key)
+        ids, matrix = _load_embedding_matrix(
+            entity_fact_driver, entity_id, embeddings_limit, snapshot_store
+        )
+        if matrix is None:
+            return [[] for _ in query_embeddings]
+
+        shared = shared_store.put(key, embeddings_limit, token, ids, matrix)
+
+    ids, matrix = shared
+    queries = np.array(query_embeddings, dtype=np.float32)
+    if (
+        queries.ndim != 2
+        or queries.shape[1] != matrix.shape[1]
+        or limit <= 0
+        or not ids
+    ):
+        return [[] for _ in query_embeddings]
+
+    similarities = _normalize_rows(queries) @ matrix.T
+    indices = np.broadcast_to(np.arange(len(ids)), similarities.shape)
+    k = min(limit, len(ids))
+    if rank_weight > 0:
+        similarities, indices = _blend_rank(
+            similarities, indices, len(ids), k, rank_weight
+        )
+    else:
+        order = np.argsort(-similarities, axis=1, kind="stable")[:, :k]
+        similarities = np.take_along_axis(similarities, order, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+
+    if vectors is not None:
+        for row_idx in np.unique(indices):
+            vectors[ids[row_idx]] = matrix[row_idx]
+
+    return [
+        [
+            (ids[row_idx], float(similarity))
+            for row_idx, similarity in zip(row_indices, row_similarities, strict=True)
+        ]
+        for row_indices, row_similarities in zip(indices, similarities, strict=True)
+    ]
+
+
+def scan_entity_embeddings(
+    entity_fact_driver,
+    entity_id: int,
+    query_embeddings: list[list[float]],
+    limit: int,
+    chunk_size: int,
+    vectors: dict[Any, np.ndarray] | None = None,
+) -> list[list[tuple[Any, float]]]:
+    """Exact search over all of an entity's embeddings, one chunk at a time.
+
+    Only one chunk and a top-k heap per query are held in memory, so peak
+    memory does not grow with the number of facts. Every fact is scanned, as
+    the chunks come in id order and a cut-off would drop the newest facts.
+
+    Args:
+        entity_fact_driver: Driver instance with iter_embedding_matrices
+        entity_id: Entity ID to search within
+        query_embeddings: Query embeddings, one list of floats per query
+        limit: Number of results to return per query
+        chunk_size: Number of embeddings to fetch from the database at a time
+        vectors: Optional dict that the embeddings of the results are added to
+
+    Returns:
+        One list of (id, similarity_score) tuples per query, each sorted by
+        similarity desc
+    """
+    queries = np.array(query_embeddings, dtype=np.float32)
+    if queries.ndim != 2 or limit <= 0:
+        return [[] for _ in query_embeddings]
+
+    queries = _normalize_rows(queries)
+    heaps: list[list[tuple[float, int, Any, np.ndarray]]] = [
+        [] for _ in query_embeddings
+    ]
+
+    scanned = 0
+    for ids, matrix in entity_fact_driver.iter_embedding_matrices(
+        entity_id, chunk_size
+    ):
+        scanned += len(ids)
+
+        if matrix is not None and matrix.shape[1] == queries.shape[1] and ids:
+            _push_top_k(heaps, ids, matrix, queries, limit, scanned)
+
+    if vectors is not None:
+        for heap in heaps:
+            for _, _, fact_id, row in heap:
+                vectors[fact_id] = row
+
+    return [
+        [
+            (fact_id, similarity)
+            for similarity, _, fact_id, _ in sorted(heap, key=lambda x: (-x[0], x[1]))
+        ]
+        for heap in heaps
+    ]
+
+
+def _push_top_k(
+    heaps: list[list[tuple[float, int, Any, np.ndarray]]],
+    ids: list[Any],
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    limit: int,
+    scanned: int,
+) -> None:
+    matrix = _normalize_rows(matrix)
+    similarities = matrix @ queries.T
+    k = min(limit, len(ids))
+    top = np.argpartition(-similarities, k - 1, axis=0)[:k]
+
+    for query_idx, heap in enumerate(heaps):
+        for row_idx in top[:, query_idx]:
+            # Rows are copied so that the heap does not keep the chunk alive.
+            item = (
+                float(similarities[row_idx, query_idx]),
+                scanned - len(ids) + int(row_idx),
+                ids[row_idx],
+                matrix[row_idx].copy(),
+            )
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+
+def _facts_with_content(
+    similar_many: list[list[tuple[Any, float]]],
+    content_map: dict,
+    vectors: dict[Any, np.ndarray] | None = None,
+) -> list[list[dict]]:
+    facts_many = []
+    for similar in similar_many:
+        facts_with_similarity = []
+        for fact_id, similarity in similar:
+            if fact_id in content_map:
+                fact = {
                     "id": fact_id,
                     "content": content_map[fact_id],
-                    "similarity": similarities_map[fact_id],
+                    "similarity": similarity,
                 }
-            )
+                if vectors is not None and fact_id in vectors:
+                    fact["embedding"] = vectors[fact_id]
+                facts_with_similarity.append(fact)
+        facts_many.append(facts_with_similarity)
+
+    return facts_many
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
 
-    return facts_with_similarity
+def _top_ids(similar_many: list[list[tuple[Any, float]]]) -> list[Any]:
+    return list(
+        dict.fromkeys(fact_id for similar in similar_many for fact_id, _ in similar)
+    )
@@ -8,24 +8,26 @@ r"""
                        memorilabs.ai
 """
 
-from sentence_transformers import SentenceTransformer
-
 from memori._cli import Cli
 from memori._config import Config
+from memori.llm._embeddings import load_encoder
 
 
 class Manager:
     def __init__(self, config: Config):
         self.config = config
 
-    def execute(self):
+    def execute(self, backend: str | None = None):
         cli = Cli(self.config)
 
-        cli.notice("Installing model all-mpnet-base-v2")
+        if backend is None:
+            backend = self.config.embeddings_backend
+
+        cli.notice(f"Installing model all-mpnet-base-v2 ({backend})")
         cli.notice("this may take a moment; output to follow:", 1)
         cli.notice("-----")
 
-        SentenceTransformer("all-mpnet-base-v2")
+        load_encoder("all-mpnet-base-v2", backend)
 
         cli.notice("-----\n")
 
@@ -0,0 +1,237 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import glob
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+SEGMENT_HEADER = struct.Struct("<4s16sQI")
+SEGMENT_MAGIC = b"MSM\x01"
+GENERATION_SIZE = 16
+
+
+class SharedMatrixStore:
+    """Node-local store of entity embedding matrices, shared between processes.
+
+    Each matrix is written once to a memory-mapped file in directory (a tmpfs
+    such as /dev/shm keeps it in shared memory) and any process on the node
+    can attach to it without copying. Matrices are stored L2-normalized, so
+    they can be searched with a single matrix product.
+
+    Every entity has a generation token in a file next to its segments. Writes
+    to the entity replace the token, and a segment is only attached when it
+    was built under the current token, so segments built before a write are
+    never served. Segments older than secs_ttl are ignored as well, to pick up
+    writes made on other nodes.
+
+    Retired segments are removed when the token is replaced. After each new
+    segment, expired ones are removed too, and then the oldest until all
+    segments in directory fit in max_bytes.
+    """
+
+    def __init__(self):
+        self.directory: str | None = None
+        self.max_bytes: int | None = None
+        self.secs_ttl: float | None = None
+
+    def configure(self, config) -> "SharedMatrixStore":
+        self.directory = config.recall_shared_matrix_dir
+        self.max_bytes = config.recall_shared_matrix_max_bytes
+        self.secs_ttl = config.recall_shared_matrix_secs_ttl
+        return self
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def generation(self, entity_id) -> bytes:
+        """Return the entity's current generation token, creating it if needed."""
+        try:
+            with open(self._path(entity_id, "gen"), "rb") as f:
+                token = f.read(GENERATION_SIZE)
+            if len(token) == GENERATION_SIZE:
+                return token
+        except FileNotFoundError:
+            pass
+
+        return self.invalidate(entity_id)
+
+    def get(self, entity_id, limit: int | None) -> tuple[list[Any], np.ndarray] | None:
+        """Attach to the entity's matrix, if a current segment exists.
+
+        Returns:
+            Tuple of (ids, matrix), where matrix is a read-only view of the
+            shared segment, or None
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(entity_id, self._suffix(limit))
+        try:
+            with open(path, "rb") as f:
+                if (
+                    self.secs_ttl is not None
+                    and time.time() - os.fstat(f.fileno()).st_mtime > self.secs_ttl
+                ):
+                    return None
+
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if len(buffer) < SEGMENT_HEADER.size:
+            return None
+
+        magic, token, rows, dimension = SEGMENT_HEADER.unpack_from(buffer)
+        if magic != SEGMENT_MAGIC or token != self.generation(entity_id):
+            return None
+
+        offset = SEGMENT_HEADER.size
+        if len(buffer) != offset + rows * 8 + rows * dimension * 4:
+            return None
+
+        ids = np.frombuffer(buffer, dtype="<i8", count=rows, offset=offset)
+        matrix = np.frombuffer(
+            buffer, dtype="<f4", count=rows * dimension, offset=offset + rows * 8
+        )
+        return ids.tolist(), matrix.reshape(rows, dimension)
+
+    def invalidate(self, entity_id) -> bytes:
+        """Replace the entity's generation token, retiring its segments."""
+        token = os.urandom(GENERATION_SIZE)
+        if self.enabled:
+            self._write(self._path(entity_id, "gen"), token)
+            # Processes attached to a removed segment keep their mapping.
+            for path in glob.glob(self._path(entity_id, "*.mat")):
+                self._remove(path)
+        return token
+
+    def put(
+        self, entity_id, limit: int | None, token: bytes, ids: list[Any], matrix
+    ) -> tuple[list[Any], np.ndarray]:
+        """Share an entity's matrix, built under the given generation token.
+
+        Rows are L2-normalized first. Matrices whose ids are not integers are
+        returned without being shared.
+
+        Returns:
+            Tuple of (ids, normalized matrix)
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = np.ascontiguousarray(matrix / norms, dtype="<f4")
+
+        if not self.enabled or not all(
+            isinstance(fact_id, int) and not isinstance(fact_id, bool)
+            for fact_id in ids
+        ):
+            return list(ids), matrix
+
+        nbytes = SEGMENT_HEADER.size + len(ids) * 8 + matrix.nbytes
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return list(ids), matrix
+
+        self._write(
+            self._path(entity_id, self._suffix(limit)),
+            SEGMENT_HEADER.pack(SEGMENT_MAGIC, token, len(ids), matrix.shape[1])
+            + np.asarray(ids, dtype="<i8").tobytes()
+            + matrix.tobytes(),
+        )
+        self._evict()
+
+        return list(ids), matrix
+
+    def _evict(self) -> None:
+        segments = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                # Segments are named memori-<entity>.<limit>.mat; other files,
+                # such as tokens and files being written, are left alone.
+                parts = entry.name.split(".")
+                if not (
+                    entry.name.startswith("memori-")
+                    and len(parts) == 3
+                    and parts[2] == "mat"
+                ):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                segments.append((stat.st_mtime, stat.st_size, entry.path))
+
+        segments.sort()
+        nbytes = sum(size for _, size, _ in segments)
+        now = time.time()
+        for mtime, size, path in segments:
+            expired = self.secs_ttl is not None and now - mtime > self.secs_ttl
+            if not expired and (self.max_bytes is None or nbytes <= self.max_bytes):
+                break
+            self._remove(path)
+            nbytes -= size
+
+    def _path(self, entity_id, suffix: str) -> str:
+        key = hashlib.sha256(str(entity_id).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"memori-{key}.{suffix}")
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _suffix(self, limit: int | None) -> str:
+        return "all.mat" if limit is None else f"{limit}.mat"
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+_shared_matrix_stores: dict[Any, SharedMatrixStore] = {None: SharedMatrixStore()}
+_shared_matrix_stores_lock = threading.Lock()
+
+
+def get_shared_matrix_store(config=None) -> SharedMatrixStore:
+    """Return the process's shared matrix store for config's directory.
+
+    Memori instances configured alike share a store and others get their own,
+    so that no instance changes the directory or limits of another. Without a
+    config, the disabled default store is returned.
+    """
+    key = None
+    if config is not None:
+        key = (
+            config.recall_shared_matrix_dir,
+            config.recall_shared_matrix_max_bytes,
+            config.recall_shared_matrix_secs_ttl,
+        )
+
+    with _shared_matrix_stores_lock:
+        if key not in _shared_matrix_stores:
+            _shared_matrix_stores[key] = SharedMatrixStore().configure(config)
+        return _shared_matrix_stores[key]
+
+
+def get_shared_matrix_stores() -> list[SharedMatrixStore]:
+    """Return every shared matrix store in the process."""
+    with _shared_matrix_stores_lock:
+        return list(_shared_matrix_stores.values())
@@ -0,0 +1,280 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+SNAPSHOT_HEADER = struct.Struct("<4sQI")
+SNAPSHOT_MAGIC = b"MSS\x01"
+
+
+class SnapshotStore:
+    """On-disk snapshots of entity embedding matrices, loaded memory-mapped.
+
+    Each entity's fact ids and embeddings are kept as raw little-endian rows
+    in a pair of files in directory, in id order, next to a small header file
+    with the number of rows and the dimension. Loading a snapshot only fetches
+    the facts with an id greater than the last one in it and appends their
+    rows to the files, so a process that starts cold reads the entity's
+    embeddings from local disk instead of the database, and a new fact costs
+    one row of disk writes rather than a rewrite of the snapshot.
+
+    The header is replaced atomically after the rows are written, so readers
+    never see rows that are still being appended. Before a snapshot is used,
+    its row count and last id are checked against the database, so that
+    facts deleted since, or committed late with a lower id, cause a rebuild.
+
+    Snapshots cover all of an entity's facts and are keyed by the database
+    and the entity id, so one directory can serve several databases.
+
+    Loading a snapshot marks it as used. After each append, the least
+    recently used snapshots are removed until those in directory fit in
+    max_bytes.
+    """
+
+    def __init__(self):
+        self.chunk_size = 1000
+        self.directory: str | None = None
+        self.max_bytes: int | None = None
+
+    def configure(self, config) -> "SnapshotStore":
+        self.chunk_size = config.recall_scan_chunk_size or 1000
+        self.directory = config.recall_snapshot_dir
+        self.max_bytes = config.recall_snapshot_max_bytes
+        return self
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def invalidate(self, key) -> "SnapshotStore":
+        if not self.enabled:
+            return self
+
+        self._remove(self._paths(key))
+
+        return self
+
+    def load(
+        self, entity_fact_driver, entity_id
+    ) -> tuple[list[Any], np.ndarray | None]:
+        """Load an entity's snapshot, refreshed with any facts written since.
+
+        Returns:
+            Tuple of (ids, matrix); matrix is a read-only memory map unless
+            the snapshot could not be written, and None when the entity has no
+            embeddings
+        """
+        key = entity_fact_driver.cache_key(entity_id)
+        ids, matrix = self._read(key)
+        if ids and not self._is_current(entity_fact_driver, entity_id, ids):
+            self.invalidate(key)
+            ids, matrix = [], None
+
+        after_id = ids[-1] if ids else None
+        dimension = matrix.shape[1] if matrix is not None else None
+        new_ids: list[Any] = []
+        new_rows: list[np.ndarray] = []
+        for chunk_ids, chunk_matrix in entity_fact_driver.iter_embedding_matrices(
+            entity_id, self.chunk_size, after_id=after_id
+        ):
+            if chunk_matrix is None:
+                continue
+            if dimension is None:
+                dimension = chunk_matrix.shape[1]
+            elif chunk_matrix.shape[1] != dimension:
+                # The embedding model changed since the snapshot was written.
+                if matrix is not None:
+                    self.invalidate(key)
+                    return self.load(entity_fact_driver, entity_id)
+                continue
+            new_ids.extend(chunk_ids)
+            new_rows.append(chunk_matrix)
+
+        if not new_ids:
+            return ids, matrix
+
+        return self._append(key, ids, matrix, new_ids, np.concatenate(new_rows))
+
+    def _is_current(self, entity_fact_driver, entity_id, ids: list[Any]) -> bool:
+        stats = entity_fact_driver.get_embedding_stats(entity_id, ids[-1])
+        if stats is None:
+            return True
+
+        return stats["count"] == len(ids) and stats["max_id"] == ids[-1]
+
+    def _paths(self, key) -> tuple[str, str, str]:
+        digest = hashlib.sha256(str(key).encode("utf-8")).hexdigest()[:32]
+        prefix = os.path.join(self.directory, f"memori-{digest}")
+        return f"{prefix}.ids", f"{prefix}.mat", f"{prefix}.snap"
+
+    def _read(self, key) -> tuple[list[Any], np.ndarray | None]:
+        if not self.enabled:
+            return [], None
+
+        ids_path, matrix_path, header_path = self._paths(key)
+        try:
+            with open(header_path, "rb") as f:
+                header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) != SNAPSHOT_HEADER.size:
+                return [], None
+
+            magic, rows, dimension = SNAPSHOT_HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or rows == 0 or dimension == 0:
+                return [], None
+
+            # Rows past the header's count belong to an append in progress.
+            ids = np.memmap(ids_path, dtype="<i8", mode="r", shape=(rows,))
+            matrix = np.memmap(
+                matrix_path, dtype="<f4", mode="r", shape=(rows, dimension)
+            )
+        except (FileNotFoundError, ValueError):
+            return [], None
+
+        # The header's modification time records when the snapshot was last
+        # used, for eviction.
+        try:
+            os.utime(header_path)
+        except OSError:
+            pass
+
+        return ids.tolist(), matrix
+
+    def _append(
+        self,
+        key,
+        ids: list[Any],
+        matrix: np.ndarray | None,
+        new_ids: list[Any],
+        new_matrix: np.ndarray,
+    ) -> tuple[list[Any], np.ndarray]:
+        all_ids = ids + new_ids
+        if not self.enabled or not all(
+            isinstance(fact_id, int) and not isinstance(fact_id, bool)
+            for fact_id in new_ids
+        ):
+            if matrix is not None:
+                new_matrix = np.concatenate([matrix, new_matrix], axis=0)
+            return all_ids, new_matrix
+
+        os.makedirs(self.directory, exist_ok=True)
+        ids_path, matrix_path, header_path = self._paths(key)
+        dimension = new_matrix.shape[1]
+
+        # Rows are written at the offset the header ends at, so an append that
+        # was interrupted is overwritten by the next one, and cut off.
+        for path, offset, data in (
+            (ids_path, len(ids) * 8, np.asarray(new_ids, dtype="<i8")),
+            (
+                matrix_path,
+                len(ids) * dimension * 4,
+                np.ascontiguousarray(new_matrix, dtype="<f4"),
+            ),
+        ):
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+b") as f:
+                f.seek(offset)
+                f.write(data.tobytes())
+                f.truncate()
+
+        tmp_path = f"{header_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(all_ids), dimension))
+        os.replace(tmp_path, header_path)
+
+        # Mapped before eviction, which may remove this very snapshot.
+        mapped = np.memmap(
+            matrix_path, dtype="<f4", mode="r", shape=(len(all_ids), dimension)
+        )
+        self._evict()
+
+        return all_ids, mapped
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+
+        snapshots: dict[str, list] = {}
+        now = time.time()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.startswith("memori-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                name, _, suffix = entry.name.rpartition(".")
+                if suffix == "tmp":
+                    # Headers left behind by processes that died while
+                    # writing them.
+                    if now - stat.st_mtime > 3600:
+                        self._remove((entry.path,))
+                    continue
+                # Shared matrices, named memori-<entity>.<limit>.mat, may be
+                # kept in the same directory.
+                if suffix not in ("ids", "mat", "snap") or "." in name:
+                    continue
+
+                # Files without a header, left by an interrupted rebuild, go
+                # first.
+                prefix = os.path.join(self.directory, name)
+                snapshot = snapshots.setdefault(prefix, [0.0, 0])
+                snapshot[1] += stat.st_size
+                if suffix == "snap":
+                    snapshot[0] = stat.st_mtime
+
+        nbytes = sum(size for _, size in snapshots.values())
+        for prefix, (_, size) in sorted(snapshots.items(), key=lambda item: item[1][0]):
+            if nbytes <= self.max_bytes:
+                break
+            self._remove((f"{prefix}.ids", f"{prefix}.mat", f"{prefix}.snap"))
+            nbytes -= size
+
+    def _remove(self, paths: tuple[str, ...]) -> None:
+        # The header goes first, so that no reader attaches to rows that are
+        # about to be removed.
+        for path in reversed(paths):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_snapshot_stores: dict[Any, SnapshotStore] = {None: SnapshotStore()}
+_snapshot_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(config=None) -> SnapshotStore:
+    """Return the process's snapshot store for config's directory.
+
+    Memori instances configured alike share a store and others get their own,
+    so that no instance changes the directory of another. Without a config,
+    the disabled default store is returned.
+    """
+    key = None
+    if config is not None:
+        key = (
+            config.recall_snapshot_dir,
+            config.recall_snapshot_max_bytes,
+            config.recall_scan_chunk_size,
+        )
+
+    with _snapshot_stores_lock:
+        if key not in _snapshot_stores:
+            _snapshot_stores[key] = SnapshotStore().configure(config)
+        return _snapshot_stores[key]
@@ -8,6 +8,7 @@ r"""
                        memorilabs.ai
 """
 
+import asyncio
 import copy
 import json
 
@@ -15,6 +16,7 @@ from google.protobuf import json_format
 
 from memori._config import Config
 from memori._utils import merge_chunk
+from memori.llm._context import estimate_tokens, format_recall_context, pack_facts
 from memori.llm._utils import (
     llm_is_anthropic,
     llm_is_bedrock,
@@ -184,13 +186,17 @@ class BaseInvoke:
         return ""
 
     def inject_recalled_facts(self, kwargs: dict) -> dict:
+        # Reset first, so an early return does not report the previous call's.
+        self.config.cache.recall_context_tokens = 0
+
         if self.config.storage is None or self.config.storage.driver is None:
             return kwargs
 
         if self.config.entity_id is None:
             return kwargs
 
-        entity_id = self.config.storage.driver.entity.create(self.config.entity_id)
+        with self.config.storage.lock:
+            entity_id = self.config.storage.driver.entity.create(self.config.entity_id)
         if entity_id is None:
             return kwargs
 
@@ -200,29 +206,118 @@ class BaseInvoke:
 
         from memori.memory.recall import Recall
 
-        facts = Recall(self.config).search_facts(user_query, entity_id=entity_id)
+        facts = self._relevant_facts(
+            Recall(self.config).search_facts(
+                user_query,
+                entity_id=entity_id,
+                include_embeddings=self._dedups_recalled_facts(),
+            )
+        )
 
-        if not facts:
+        return self._inject_recalled_facts(
+            kwargs, facts, self._recalled_fact_embeddings(facts)
+        )
+
+    async def inject_recalled_facts_async(self, kwargs: dict) -> dict:
+        self.config.cache.recall_context_tokens = 0
+
+        if self.config.storage is None or self.config.storage.driver is None:
+            return kwargs
+
+        if self.config.entity_id is None:
+            return kwargs
+
+        user_query = self._extract_user_query(kwargs)
+        if not user_query:
             return kwargs
 
-        relevant_facts = [
+        from memori.memory.recall import Recall
+
+        facts = self._relevant_facts(
+            await Recall(self.config).search_facts_async(
+                user_query, include_embeddings=self._dedups_recalled_facts()
+            )
+        )
+
+        embeddings = None
+        if self._dedups_recalled_facts(facts):
+            loop = asyncio.get_running_loop()
+            embeddings = await loop.run_in_executor(
+                self.config.thread_pool_executor,
+                self._recalled_fact_embeddings,
+                facts,
+            )
+
+        return self._inject_recalled_facts(kwargs, facts, embeddings)
+
+    def _relevant_facts(self, facts: list[dict]) -> list[dict]:
+        return [
             f
-            for f in facts
+            for f in facts or []
             if f.get("similarity", 0) >= self.config.recall_relevance_threshold
         ]
 
+    def _dedups_recalled_facts(self, facts: list[dict] | None = None) -> bool:
+        if self.config.recall_context_dedup_threshold is None:
+            return False
+
+        return facts is None or len(facts) > 1
+
+    def _recalled_fact_embeddings(self, facts: list[dict]) -> dict | None:
+        if not self._dedups_recalled_facts(facts):
+            return None
+
+        # The search returns the embeddings it already loaded; only facts it
+        # had none for are fetched.
+        embeddings = {
+            fact["id"]: fact["embedding"] for fact in facts if "embedding" in fact
+        }
+        missing_ids = [
+            fact["id"] for fact in facts if "id" in fact and "embedding" not in fact
+        ]
+        if not missing_ids:
+            return embeddings
+
+        from memori._search import parse_embeddings
+
+        with self.config.storage.lock:
+            rows = self.config.storage.driver.entity_fact.get_embeddings_by_ids(
+                missing_ids
+            )
+        ids, matrix = parse_embeddings(
+            [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+        )
+        if matrix is not None:
+            embeddings.update(zip(ids, matrix, strict=True))
+
+        return embeddings
+
+    def _recall_context_max_tokens(self, kwargs: dict) -> int | None:
+        max_tokens_by_model = self.config.recall_context_max_tokens_by_model
+        model = kwargs.get("model")
+        if isinstance(model, str) and model in max_tokens_by_model:
+            return max_tokens_by_model[model]
+
+        if self.config.llm.provider in max_tokens_by_model:
+            return max_tokens_by_model[self.config.llm.provider]
+
+        return self.config.recall_context_max_tokens
+
+    def _inject_recalled_facts(
+        self, kwargs: dict, facts: list[dict], embeddings: dict | None = None
+    ) -> dict:
+        relevant_facts = pack_facts(
+            self._relevant_facts(facts),
+            self._recall_context_max_tokens(kwargs),
+            embeddings,
+            self.config.recall_context_dedup_threshold,
+        )
+
         if not relevant_facts:
             return kwargs
 
-        # Format the recalled facts content
-        fact_lines = [f"- {fact['content']}" for fact in relevant_facts]
-        recall_context = (
-            "\n\n<memori_context>\n"
-            "Only use the relevant context if it is relevant to the user's query. "
-            "Relevant context about the user:\n"
-            + "\n".join(fact_lines)
-            + "\n</memori_context>"
-        )
+        recall_context = format_recall_context(relevant_facts)
+        self.config.cache.recall_context_tokens = estimate_tokens(recall_context)
 
         # Check if there's already a system message
         messages = kwargs.get("messages", [])
@@ -246,9 +341,35 @@ class BaseInvoke:
         if self.config.storage is None or self.config.storage.driver is None:
             return kwargs
 
-        messages = self.config.storage.driver.conversation.messages.read(
+        messages = self._read_conversation_messages_locked(
             self.config.cache.conversation_id
         )
+
+        return self._inject_conversation_messages(kwargs, messages)
+
+    async def inject_conversation_messages_async(self, kwargs: dict) -> dict:
+        if self.config.cache.conversation_id is None:
+            return kwargs
+
+        if self.config.storage is None or self.config.storage.driver is None:
+            return kwargs
+
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(
+            self.config.thread_pool_executor,
+            self._read_conversation_messages_locked,
+            self.config.cache.conversation_id,
+        )
+
+        return self._inject_conversation_messages(kwargs, messages)
+
+    def _read_conversation_messages_locked(self, conversation_id) -> list[dict]:
+        with self.config.storage.lock:
+            return self.config.storage.driver.conversation.messages.read(
+                conversation_id
+            )
+
+    def _inject_conversation_messages(self, kwargs: dict, messages: list[dict]) -> dict:
         if not messages:
             return kwargs
 
@@ -358,6 +479,16 @@ class BaseInvoke:
 
         return cleaned_messages
 
+    async def handle_post_response_async(self, kwargs, start_time, raw_response):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.config.thread_pool_executor,
+            self.handle_post_response,
+            kwargs,
+            start_time,
+            raw_response,
+        )
+
     def handle_post_response(self, kwargs, start_time, raw_response):
         from memori.memory._manager import Manager as MemoryManager
 
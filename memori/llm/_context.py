@@ -0,0 +1,104 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+from typing import Any
+
+import numpy as np
+
+CHARS_PER_TOKEN = 4
+
+RECALL_CONTEXT_PREFIX = (
+    "\n\n<memori_context>\n"
+    "Only use the relevant context if it is relevant to the user's query. "
+    "Relevant context about the user:\n"
+)
+RECALL_CONTEXT_SUFFIX = "\n</memori_context>"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without a tokenizer.
+
+    Uses the common approximation of four characters per token, rounded up,
+    which is close enough for budgeting across providers.
+    """
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def format_fact_line(fact: dict) -> str:
+    return f"- {fact['content']}"
+
+
+def format_recall_context(facts: list[dict]) -> str:
+    return (
+        RECALL_CONTEXT_PREFIX
+        + "\n".join(format_fact_line(fact) for fact in facts)
+        + RECALL_CONTEXT_SUFFIX
+    )
+
+
+def pack_facts(
+    facts: list[dict],
+    max_tokens: int | None = None,
+    embeddings: dict[Any, np.ndarray] | None = None,
+    dedup_threshold: float | None = None,
+) -> list[dict]:
+    """Pick the facts to inject, most similar first, within a token budget.
+
+    Facts that do not fit in the remaining budget are skipped so that shorter,
+    less similar facts can still fill it. A fact whose embedding has a cosine
+    similarity of at least dedup_threshold with an already picked fact is a
+    near-duplicate and is skipped as well.
+
+    Args:
+        facts: Recalled facts with "content" and "similarity" keys
+        max_tokens: Budget for the whole context block; None for no bound
+        embeddings: Fact embeddings keyed by fact id, used for deduplication
+        dedup_threshold: Similarity at which two facts count as duplicates
+
+    Returns:
+        The picked facts, in order of similarity
+    """
+    ranked = sorted(facts, key=lambda fact: -fact.get("similarity", 0))
+
+    remaining = None
+    if max_tokens is not None:
+        remaining = max_tokens - estimate_tokens(
+            RECALL_CONTEXT_PREFIX + RECALL_CONTEXT_SUFFIX
+        )
+
+    picked: list[dict] = []
+    picked_rows: list[np.ndarray] = []
+    for fact in ranked:
+        # Facts are joined with a newline, which is counted with each line.
+        tokens = estimate_tokens(format_fact_line(fact) + "\n")
+        if remaining is not None and tokens > remaining:
+            continue
+
+        row = None
+        if dedup_threshold is not None and embeddings is not None:
+            row = embeddings.get(fact.get("id"))
+            if row is not None:
+                row = row / (np.linalg.norm(row) or 1.0)
+                if any(
+                    other.shape == row.shape
+                    and float(np.dot(row, other)) >= dedup_threshold
+                    for other in picked_rows
+                ):
+                    continue
+
+        picked.append(fact)
+        if row is not None:
+            picked_rows.append(row)
+        if remaining is not None:
+            remaining -= tokens
+
+    return picked
@@ -9,37 +9,570 @@ r"""
 """
 
 import asyncio
+import multiprocessing
 import os
-import struct
+import platform
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
 from typing import Any
 
-os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+import numpy as np
 
-from sentence_transformers import SentenceTransformer
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
-_MODEL_CACHE: dict[str, SentenceTransformer] = {}
+# sentence_transformers pulls in torch and transformers, which take seconds to
+# import, so it is only imported when the first encoder is loaded.
+_MODEL_CACHE: dict[str, Any] = {}
+_MODEL_LOCKS: dict[str, threading.Lock] = {}
+_MODEL_LOCKS_LOCK = threading.Lock()
 _DEFAULT_DIMENSION = 768
+_BACKENDS: dict[str, Callable[[str], Any]] = {}
+DEFAULT_BACKEND = "sentence-transformers"
+
+
+def register_embedding_backend(name: str):
+    """Register a loader that builds the encoder for a model name.
+
+    Encoders need the encode(texts, convert_to_numpy=True) and
+    get_sentence_embedding_dimension() methods of a SentenceTransformer.
+    """
+
+    def decorator(loader: Callable[[str], Any]):
+        _BACKENDS[name] = loader
+        return loader
+
+    return decorator
+
+
+@register_embedding_backend("sentence-transformers")
+def _load_sentence_transformer(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+@register_embedding_backend("onnx")
+def _load_onnx(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name, backend="onnx")
+
+
+@register_embedding_backend("onnx-int8")
+def _load_onnx_int8(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(
+        model_name,
+        backend="onnx",
+        model_kwargs={"file_name": onnx_int8_file_name()},
+    )
+
+
+def load_encoder(model_name: str, backend: str = DEFAULT_BACKEND) -> Any:
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unsupported embeddings backend: {backend}")
+    return _BACKENDS[backend](model_name)
+
+
+def onnx_int8_file_name() -> str:
+    """Name of the dynamically quantized ONNX export for this CPU."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+
+class EmbeddingOptions:
+    """Selects the backend that encodes text and how texts are batched.
+
+    "sentence-transformers" runs the model with PyTorch. "onnx" runs the same
+    model with ONNX Runtime, and "onnx-int8" runs a dynamically quantized
+    export of it; both produce vectors compatible with the PyTorch model and
+    need the memori[onnx] extra.
+
+    When batch_max_size is set, texts are encoded by the embedding service,
+    which batches them across callers. When processes is set, they are
+    encoded by that many worker processes, each limited to process_threads
+    threads when it is set.
+
+    Callers that hold a config build their own options from it, so that two
+    Memori instances in one process keep their own settings. The options
+    returned by get_embedding_options() apply to callers that pass none.
+    """
+
+    def __init__(self):
+        self.backend = DEFAULT_BACKEND
+        self.batch_max_size: int | None = None
+        self.batch_secs_max_wait = 0.005
+        self.process_threads: int | None = None
+        self.processes: int | None = None
+
+    def configure(self, config) -> "EmbeddingOptions":
+        if config.embeddings_backend not in _BACKENDS:
+            raise ValueError(
+                f"Unsupported embeddings backend: {config.embeddings_backend}"
+            )
+        self.backend = config.embeddings_backend
+        self.batch_max_size = config.embeddings_batch_max_size
+        self.batch_secs_max_wait = config.embeddings_batch_secs_max_wait
+        self.process_threads = config.embeddings_process_threads
+        self.processes = config.embeddings_processes
+        return self
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_max_size is not None
+
+    @property
+    def pooled(self) -> bool:
+        return bool(self.processes)
+
+    def model_key(self, model_name: str) -> str:
+        if self.backend == DEFAULT_BACKEND:
+            return model_name
+        return f"{self.backend}:{model_name}"
+
+
+_embedding_options = EmbeddingOptions()
+
+
+def get_embedding_options() -> EmbeddingOptions:
+    return _embedding_options
+
+
+class EmbeddingCache:
+    """Bounded LRU cache of text embeddings, keyed by model name and text.
+
+    Text is normalized by collapsing whitespace before lookup, so prompts that
+    only differ in spacing share an entry. Set max_entries to 0 to disable.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        self.misses = 0
+
+    def clear(self) -> "EmbeddingCache":
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+        return self
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        embedding = self.get_array(model, text)
+        return None if embedding is None else embedding.tolist()
+
+    def get_array(self, model: str, text: str) -> np.ndarray | None:
+        """Look up an embedding without copying it; the array is read-only."""
+        key = (model, self._normalize(text))
+        with self.lock:
+            embedding = self.entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return embedding
+
+    def put(self, model: str, text: str, embedding) -> "EmbeddingCache":
+        if self.max_entries <= 0:
+            return self
+
+        key = (model, self._normalize(text))
+        with self.lock:
+            entry = np.array(embedding, dtype=np.float32)
+            entry.flags.writeable = False
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return self
+
+    def _normalize(self, text: str) -> str:
+        return " ".join(text.split())
+
+
+_embedding_cache = EmbeddingCache()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    return _embedding_cache
+
+
+class EmbeddingService:
+    """Encodes the texts of all callers on one worker thread, in shared batches.
+
+    Each submit returns a future. The worker takes the oldest pending request,
+    then keeps collecting requests until it holds batch_max_size texts or
+    batch_secs_max_wait has passed, and encodes their distinct texts sorted by
+    length, so that texts padded together are of similar length.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests: queue.SimpleQueue[
+            tuple[list[str], str, EmbeddingOptions, Future]
+        ] = queue.SimpleQueue()
+        self.thread: threading.Thread | None = None
+
+    def submit(
+        self, texts: list[str], model: str, options: EmbeddingOptions | None = None
+    ) -> Future:
+        """Queue texts for encoding.
+
+        Returns:
+            Future of a 2D float32 array, one row per text
+        """
+        future: Future = Future()
+        self.requests.put((texts, model, options or get_embedding_options(), future))
+
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self._run, name="memori-embeddings", daemon=True
+                )
+                self.thread.start()
+
+        return future
+
+    async def submit_async(
+        self, texts: list[str], model: str, options: EmbeddingOptions | None = None
+    ) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts, model, options))
+
+    def _run(self) -> None:
+        while True:
+            self._encode_batch(self._next_batch())
+
+    def _next_batch(self) -> list[tuple[list[str], str, EmbeddingOptions, Future]]:
+        # The oldest request's options decide how long the batch is held open.
+        batch = [self.requests.get()]
+        options = batch[0][2]
+        max_size = options.batch_max_size or 1
+        size = len(batch[0][0])
+        deadline = time.monotonic() + options.batch_secs_max_wait
+        while size < max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request[0])
+
+        return batch
+
+    def _encode_batch(
+        self, batch: list[tuple[list[str], str, EmbeddingOptions, Future]]
+    ) -> None:
+        # Requests are encoded together when they use the same model with the
+        # same settings.
+        by_model: dict[tuple, tuple[str, EmbeddingOptions, list]] = {}
+        for texts, model, options, future in batch:
+            if future.set_running_or_notify_cancel():
+                key = (
+                    model,
+                    options.backend,
+                    options.batch_max_size,
+                    options.processes,
+                    options.process_threads,
+                )
+                by_model.setdefault(key, (model, options, []))[2].append(
+                    (texts, future)
+                )
+
+        pool = get_embedding_pool()
+
+        # Every model's texts are queued on the process pool before waiting on
+        # any of them, so the workers encode them in parallel.
+        groups = []
+        for model, options, requests in by_model.values():
+            batch_size = options.batch_max_size or 32
+            texts = sorted(
+                {text for request_texts, _ in requests for text in request_texts},
+                key=len,
+            )
+            pending: Future | Exception | None = None
+            if options.pooled:
+                try:
+                    pending = pool.submit(texts, model, batch_size, options)
+                except Exception as e:
+                    pending = e
+            groups.append((model, options, batch_size, requests, texts, pending))
+
+        for model, options, batch_size, requests, texts, pending in groups:
+            try:
+                if isinstance(pending, Exception):
+                    raise pending
+                if pending is not None:
+                    encoded = pending.result()
+                else:
+                    encoded = np.asarray(
+                        _get_model(model, options).encode(
+                            texts, batch_size=batch_size, convert_to_numpy=True
+                        ),
+                        dtype=np.float32,
+                    )
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            rows = {text: i for i, text in enumerate(texts)}
+            for request_texts, future in requests:
+                future.set_result(encoded[[rows[text] for text in request_texts]])
+
+
+_embedding_service = EmbeddingService()
+
+
+def get_embedding_service() -> EmbeddingService:
+    return _embedding_service
+
+
+def _init_pool_worker(num_threads: int | None) -> None:
+    if num_threads is None:
+        return
+
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    try:
+        import torch
 
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
 
-def _get_model(model_name: str) -> SentenceTransformer:
-    if model_name not in _MODEL_CACHE:
-        _MODEL_CACHE[model_name] = SentenceTransformer(model_name)
-    return _MODEL_CACHE[model_name]
 
+def _encode_in_pool_worker(
+    texts: list[str], model: str, batch_size: int, backend: str = DEFAULT_BACKEND
+) -> tuple[str, tuple[int, ...]]:
+    options = EmbeddingOptions()
+    options.backend = backend
+    encoded = np.ascontiguousarray(
+        _get_model(model, options).encode(
+            texts, batch_size=batch_size, convert_to_numpy=True
+        ),
+        dtype=np.float32,
+    )
 
-def format_embedding_for_db(embedding: list[float], dialect: str) -> Any:
+    shm = shared_memory.SharedMemory(create=True, size=max(encoded.nbytes, 1))
+    try:
+        np.ndarray(encoded.shape, dtype=np.float32, buffer=shm.buf)[:] = encoded
+    finally:
+        shm.close()
+
+    return shm.name, encoded.shape
+
+
+def _read_pool_result(name: str, shape: tuple[int, ...]) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+class EmbeddingPool:
+    """Encodes texts in worker processes, so encoding does not hold the GIL.
+
+    Each worker loads its own copy of the model. Workers are spawned, not
+    forked, so the calling program's main module must be import-safe. The
+    texts of a large call are split across the workers, and the encoded
+    float32 rows are handed back through shared memory rather than pickled.
+    A pool is started on first use for each number of processes and threads,
+    and each task names its backend, so callers with different options share
+    the process without restarting each other's pools.
+    """
+
+    def __init__(self):
+        self.executors: dict[tuple, ProcessPoolExecutor] = {}
+        self.lock = threading.Lock()
+
+    def submit(
+        self,
+        texts: list[str],
+        model: str,
+        batch_size: int = 32,
+        options: EmbeddingOptions | None = None,
+    ) -> Future:
+        """Queue texts for encoding, split across the worker processes.
+
+        Returns:
+            Future of a 2D float32 array, one row per text
+        """
+        options = options or get_embedding_options()
+
+        # Chunks smaller than a batch would leave the workers' batches part
+        # empty, so small calls go to a single worker.
+        size = max(batch_size, -(-len(texts) // (options.processes or 1)), 1)
+        chunks = [
+            self._submit_chunk(texts[i : i + size], model, batch_size, options)
+            for i in range(0, max(len(texts), 1), size)
+        ]
+        if len(chunks) == 1:
+            return chunks[0]
+
+        future: Future = Future()
+        lock = threading.Lock()
+
+        def done(chunk: Future) -> None:
+            with lock:
+                if future.done():
+                    return
+                if chunk.exception() is not None:
+                    future.set_exception(chunk.exception())
+                elif all(c.done() for c in chunks):
+                    future.set_result(np.concatenate([c.result() for c in chunks]))
+
+        for chunk in chunks:
+            chunk.add_done_callback(done)
+        return future
+
+    def _submit_chunk(
+        self, texts: list[str], model: str, batch_size: int, options: EmbeddingOptions
+    ) -> Future:
+        key = (options.processes, options.process_threads)
+
+        with self.lock:
+            executor = self.executors.get(key)
+            if executor is None:
+                executor = self.executors[key] = ProcessPoolExecutor(
+                    max_workers=options.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_pool_worker,
+                    initargs=(options.process_threads,),
+                )
+
+            try:
+                pending = executor.submit(
+                    _encode_in_pool_worker, texts, model, batch_size, options.backend
+                )
+            except BrokenProcessPool:
+                del self.executors[key]
+                raise
+
+        future: Future = Future()
+
+        def done(pending: Future) -> None:
+            try:
+                future.set_result(_read_pool_result(*pending.result()))
+            except BaseException as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._discard(key, executor)
+                future.set_exception(e)
+
+        pending.add_done_callback(done)
+        return future
+
+    async def submit_async(
+        self,
+        texts: list[str],
+        model: str,
+        batch_size: int = 32,
+        options: EmbeddingOptions | None = None,
+    ) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts, model, batch_size, options))
+
+    def shutdown(self) -> "EmbeddingPool":
+        with self.lock:
+            executors, self.executors = self.executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        return self
+
+    def _discard(self, key: tuple, executor: ProcessPoolExecutor) -> None:
+        with self.lock:
+            if self.executors.get(key) is executor:
+                del self.executors[key]
+
+
+_embedding_pool = EmbeddingPool()
+
+
+def get_embedding_pool() -> EmbeddingPool:
+    return _embedding_pool
+
+
+def _get_model(model_name: str, options: EmbeddingOptions | None = None) -> Any:
+    options = options or get_embedding_options()
+    key = options.model_key(model_name)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+
+    with _MODEL_LOCKS_LOCK:
+        lock = _MODEL_LOCKS.setdefault(key, threading.Lock())
+
+    # Only one thread loads a model; threads that ask for it meanwhile wait
+    # and share the loaded encoder rather than loading their own copy.
+    with lock:
+        if key not in _MODEL_CACHE:
+            _MODEL_CACHE[key] = load_encoder(model_name, options.backend)
+    return _MODEL_CACHE[key]
+
+
+def warm_up_embeddings(
+    model: str = "all-mpnet-base-v2", options: EmbeddingOptions | None = None
+) -> threading.Thread:
+    """Load the encoder and run one encode on a background thread.
+
+    The first real request then neither loads the model nor pays for the
+    kernels and thread pools that are initialized on the first encode. When
+    encoding happens in the process pool, its workers are started and each
+    is sent one text instead, since they load their own copies of the model.
+    Failures are ignored; the first request will load the model instead.
+    """
+    options = options or get_embedding_options()
+
+    def run():
+        try:
+            if options.pooled:
+                get_embedding_pool().submit(
+                    ["warm up"] * options.processes, model, 1, options
+                ).result()
+            else:
+                _get_model(model, options).encode(["warm up"], convert_to_numpy=True)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run, name="memori-embeddings-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def format_embedding_for_db(
+    embedding: list[float], dialect: str, embeddings_format: str = "float32"
+) -> Any:
     """Format embedding for database storage.
 
     Args:
         embedding: List of floats representing the embedding vector
         dialect: Database dialect (postgresql, mysql, sqlite, mongodb)
+        embeddings_format: Storage precision (float32, float16 or int8)
 
     Returns:
         Formatted embedding optimized for the target database:
         - PostgreSQL/CockroachDB/MySQL/SQLite: Binary (BYTEA/BLOB) - compact & fast
         - MongoDB: Binary (BinData) - compact & fast
     """
-    binary_data = struct.pack(f"<{len(embedding)}f", *embedding)
+    from memori._search import encode_embedding
+
+    binary_data = encode_embedding(embedding, embeddings_format)
 
     if dialect == "mongodb":
         try:
@@ -52,31 +585,153 @@ def format_embedding_for_db(embedding: list[float], dialect: str) -> Any:
         return binary_data
 
 
-def embed_texts(
-    texts: str | list[str], model: str = "all-mpnet-base-v2"
-) -> list[list[float]]:
-    inputs = [texts] if isinstance(texts, str) else [t for t in texts if t]
+def _lookup_embeddings(
+    inputs: list[str], model: str, options: EmbeddingOptions
+) -> tuple[list[np.ndarray | None], dict[str, list[int]]]:
+    cache = get_embedding_cache()
+    cache_key = options.model_key(model)
+    embeddings = [cache.get_array(cache_key, t) for t in inputs]
+
+    misses: dict[str, list[int]] = {}
+    for i, embedding in enumerate(embeddings):
+        if embedding is None:
+            misses.setdefault(inputs[i], []).append(i)
+
+    return embeddings, misses
+
+
+def _stack_embeddings(embeddings: list[np.ndarray]) -> np.ndarray:
+    return np.stack(embeddings).astype(np.float32, copy=False)
+
+
+def _fill_embeddings(
+    embeddings: list[np.ndarray | None],
+    misses: dict[str, list[int]],
+    encoded,
+    model: str,
+    options: EmbeddingOptions,
+) -> np.ndarray:
+    cache = get_embedding_cache()
+    cache_key = options.model_key(model)
+    for text, row in zip(misses, encoded, strict=False):
+        cache.put(cache_key, text, row)
+        for i in misses[text]:
+            embeddings[i] = row
+
+    return _stack_embeddings(embeddings)  # type: ignore[arg-type]
+
+
+def _zero_embeddings(
+    embeddings: list[np.ndarray | None], dim: int = _DEFAULT_DIMENSION
+) -> np.ndarray:
+    zeros = np.zeros(dim, dtype=np.float32)
+    return _stack_embeddings([e if e is not None else zeros for e in embeddings])
+
+
+def _embedding_inputs(texts: str | list[str]) -> list[str]:
+    return [texts] if isinstance(texts, str) else [t for t in texts if t]
+
+
+def _no_embeddings() -> np.ndarray:
+    return np.empty((0, _DEFAULT_DIMENSION), dtype=np.float32)
+
+
+def embed_texts_array(
+    texts: str | list[str],
+    model: str = "all-mpnet-base-v2",
+    options: EmbeddingOptions | None = None,
+) -> np.ndarray:
+    """Embed texts as a 2D float32 array, one row per non-empty text.
+
+    Empty texts in a list are skipped. Texts that cannot be encoded, for
+    example because the model cannot be loaded, get rows of zeros. Options
+    default to the process-wide ones from get_embedding_options().
+    """
+    options = options or get_embedding_options()
+    inputs = _embedding_inputs(texts)
     if not inputs:
-        return []
+        return _no_embeddings()
+
+    embeddings, misses = _lookup_embeddings(inputs, model, options)
+    if not misses:
+        return _stack_embeddings(embeddings)  # type: ignore[arg-type]
+
+    if options.batched or options.pooled:
+        try:
+            if options.batched:
+                future = get_embedding_service().submit(list(misses), model, options)
+            else:
+                future = get_embedding_pool().submit(
+                    list(misses), model, options=options
+                )
+            encoded = future.result()
+        except (OSError, RuntimeError, ValueError):
+            return _zero_embeddings(embeddings)
+        return _fill_embeddings(embeddings, misses, encoded, model, options)
 
     try:
-        encoder = _get_model(model)
+        encoder = _get_model(model, options)
     except (OSError, RuntimeError, ValueError):
-        return [[0.0] * _DEFAULT_DIMENSION for _ in inputs]
+        return _zero_embeddings(embeddings)
 
     try:
-        embeddings = encoder.encode(inputs, convert_to_numpy=True)
-        return embeddings.tolist()
+        encoded = encoder.encode(list(misses), convert_to_numpy=True)
     except (RuntimeError, ValueError):
         try:
             dim = int(encoder.get_sentence_embedding_dimension())
         except (RuntimeError, ValueError, AttributeError):
             dim = _DEFAULT_DIMENSION
-        return [[0.0] * dim for _ in inputs]
+        return _zero_embeddings(embeddings, dim)
+
+    return _fill_embeddings(embeddings, misses, encoded, model, options)
+
+
+async def embed_texts_array_async(
+    texts: str | list[str],
+    model: str = "all-mpnet-base-v2",
+    options: EmbeddingOptions | None = None,
+) -> np.ndarray:
+    options = options or get_embedding_options()
+    if not options.batched and not options.pooled:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, embed_texts_array, texts, model, options
+        )
+
+    inputs = _embedding_inputs(texts)
+    if not inputs:
+        return _no_embeddings()
+
+    embeddings, misses = _lookup_embeddings(inputs, model, options)
+    if not misses:
+        return _stack_embeddings(embeddings)  # type: ignore[arg-type]
+
+    try:
+        if options.batched:
+            encoded = await get_embedding_service().submit_async(
+                list(misses), model, options
+            )
+        else:
+            encoded = await get_embedding_pool().submit_async(
+                list(misses), model, options=options
+            )
+    except (OSError, RuntimeError, ValueError):
+        return _zero_embeddings(embeddings)
+
+    return _fill_embeddings(embeddings, misses, encoded, model, options)
+
+
+def embed_texts(
+    texts: str | list[str],
+    model: str = "all-mpnet-base-v2",
+    options: EmbeddingOptions | None = None,
+) -> list[list[float]]:
+    return embed_texts_array(texts, model, options).tolist()
 
 
 async def embed_texts_async(
-    texts: str | list[str], model: str = "all-mpnet-base-v2"
+    texts: str | list[str],
+    model: str = "all-mpnet-base-v2",
+    options: EmbeddingOptions | None = None,
 ) -> list[list[float]]:
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, embed_texts, texts, model)
+    return (await embed_texts_array_async(texts, model, options)).tolist()
@@ -65,12 +65,14 @@ class InvokeAsync(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
-        self.handle_post_response(kwargs, start, raw_response)
+        await self.handle_post_response_async(kwargs, start, raw_response)
         return raw_response
 
 
@@ -78,8 +80,10 @@ class InvokeAsyncIterator(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
@@ -92,7 +96,7 @@ class InvokeAsyncIterator(BaseInvoke):
                 .configure_request(kwargs, start)
             )
         else:
-            self.handle_post_response(kwargs, start, raw_response)
+            await self.handle_post_response_async(kwargs, start, raw_response)
             return raw_response
 
 
@@ -100,8 +104,10 @@ class InvokeAsyncStream(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         stream = await self._method(**kwargs)
@@ -111,18 +117,20 @@ class InvokeAsyncStream(BaseInvoke):
             raw_response = merge_chunk(raw_response, chunk.__dict__)
             yield chunk
 
-        self.handle_post_response(kwargs, start, raw_response)
+        await self.handle_post_response_async(kwargs, start, raw_response)
 
 
 class InvokeStream(BaseInvoke):
     async def invoke(self, **kwargs):
         start = time.time()
 
-        kwargs = self.inject_conversation_messages(
-            self.inject_recalled_facts(self.configure_for_streaming_usage(kwargs))
+        kwargs = await self.inject_conversation_messages_async(
+            await self.inject_recalled_facts_async(
+                self.configure_for_streaming_usage(kwargs)
+            )
         )
 
         raw_response = await self._method(**kwargs)
 
-        self.handle_post_response(kwargs, start, raw_response)
+        await self.handle_post_response_async(kwargs, start, raw_response)
         return raw_response
@@ -8,6 +8,7 @@ r"""
                        memorilabs.ai
 """
 
+import asyncio
 import time
 
 from memori.llm._base import BaseIterator
@@ -30,16 +31,19 @@ class AsyncIterator(BaseIterator):
 
             return chunk
         except StopAsyncIteration:
-            MemoryManager(self.config).execute(
-                self.invoke._format_payload(
-                    self.config.framework.provider,
-                    self.config.llm.provider,
-                    self.config.llm.version,
-                    self._time_start,
-                    time.time(),
-                    self.invoke._format_kwargs(self._kwargs),
-                    self.invoke._format_response(self.raw_response),
-                )
+            payload = self.invoke._format_payload(
+                self.config.framework.provider,
+                self.config.llm.provider,
+                self.config.llm.version,
+                self._time_start,
+                time.time(),
+                self.invoke._format_kwargs(self._kwargs),
+                self.invoke._format_response(self.raw_response),
+            )
+            await asyncio.get_running_loop().run_in_executor(
+                self.config.thread_pool_executor,
+                MemoryManager(self.config).execute,
+                payload,
             )
             raise
 
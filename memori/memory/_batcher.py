@@ -0,0 +1,89 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                  perfectam memoriam
+                       memorilabs.ai
+"""
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Batch:
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+        self.queries: list[str] = []
+        self.results: dict[str, Any] = {}
+
+
+class RecallBatcher:
+    """Coalesces concurrent recalls against the same entity into one search.
+
+    The first caller for a key opens a batch and waits for the window so that
+    other callers can join it. It then runs the batch's distinct queries with
+    a single call, typically one model batch to embed them and one
+    multi-query search, and hands every caller its own results.
+    """
+
+    def __init__(self):
+        self.batches: dict[Hashable, _Batch] = {}
+        self.lock = threading.Lock()
+
+    def search(
+        self,
+        key: Hashable,
+        query: str,
+        secs_window: float,
+        execute: Callable[[list[str]], list[Any]],
+    ) -> Any:
+        """Search for query as part of the batch open for key.
+
+        Args:
+            key: Batches are shared by callers with equal keys
+            query: Query text
+            secs_window: How long the first caller waits for others to join
+            execute: Runs a list of queries, returning one result per query
+
+        Returns:
+            The result of execute for query
+        """
+        with self.lock:
+            batch = self.batches.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = self.batches[key] = _Batch()
+            batch.queries.append(query)
+
+        if not leader:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            return batch.results[query]
+
+        time.sleep(secs_window)
+        with self.lock:
+            del self.batches[key]
+
+        try:
+            queries = list(dict.fromkeys(batch.queries))
+            batch.results = dict(zip(queries, execute(queries), strict=True))
+        except BaseException as e:
+            batch.error = e
+            raise
+        finally:
+            batch.done.set()
+
+        return batch.results[query]
+
+
+_recall_batcher = RecallBatcher()
+
+
+def get_recall_batcher() -> RecallBatcher:
+    return _recall_batcher
@@ -29,7 +29,8 @@ class Writer:
 
         for attempt in range(max_retries):
             try:
-                self._execute_transaction(payload)
+                with self.config.storage.lock:
+                    self._execute_transaction(payload)
                 return self
             except OperationalError as e:
                 if "restart transaction" in str(e) and attempt < max_retries - 1:
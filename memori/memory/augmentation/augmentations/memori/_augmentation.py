@@ -8,12 +8,21 @@ r"""
                        memorilabs.ai
 """
 
+import logging
+
+import numpy as np
+
 from memori._network import Api
-from memori.llm._embeddings import embed_texts_async
+from memori._search import parse_embedding
+from memori._shared import get_shared_matrix_store
+from memori._utils import generate_uniq
+from memori.llm._embeddings import EmbeddingOptions, embed_texts_array_async
 from memori.memory._struct import Memories
 from memori.memory.augmentation._base import AugmentationContext, BaseAugmentation
 from memori.memory.augmentation._registry import Registry
 
+logger = logging.getLogger(__name__)
+
 
 @Registry.register("advanced_augmentation")
 class AdvancedAugmentation(BaseAugmentation):
@@ -81,20 +90,24 @@ class AdvancedAugmentation(BaseAugmentation):
         if not api_response:
             return ctx
 
+        entity_id = driver.entity.create(ctx.payload.entity_id)
+
         if isinstance(api_response, Memories):
             memories = api_response
         else:
-            memories = await self._process_api_response(api_response)
+            memories = await self._process_api_response(api_response, driver, entity_id)
 
         ctx.data["memories"] = memories
 
-        await self._schedule_entity_writes(ctx, driver, memories)
+        await self._schedule_entity_writes(ctx, driver, memories, entity_id)
         self._schedule_process_writes(ctx, driver, memories)
         self._schedule_conversation_writes(ctx, memories)
 
         return ctx
 
-    async def _process_api_response(self, api_response) -> Memories:
+    async def _process_api_response(
+        self, api_response, driver=None, entity_id: int | None = None
+    ) -> Memories:
         if isinstance(api_response, Memories):
             return api_response
 
@@ -110,18 +123,81 @@ class AdvancedAugmentation(BaseAugmentation):
             ]
 
         if facts:
-            fact_embeddings = await embed_texts_async(facts)
+            fact_embeddings = await self._embed_facts(facts, driver, entity_id)
             api_response["entity"]["fact_embeddings"] = fact_embeddings
 
         return Memories().configure_from_advanced_augmentation(api_response)
 
+    async def _embed_facts(
+        self, facts: list[str], driver=None, entity_id: int | None = None
+    ) -> list[np.ndarray]:
+        """Embed facts, reusing the embeddings of facts the entity already has.
+
+        Facts are matched on the same uniq that EntityFact.create upserts on,
+        so only text the entity has never stored reaches the model.
+        """
+        uniqs = [generate_uniq([fact]) for fact in facts]
+        known = self._get_stored_embeddings(driver, entity_id, uniqs)
+
+        unseen = list(
+            dict.fromkeys(
+                fact
+                for fact, uniq in zip(facts, uniqs, strict=True)
+                if uniq not in known
+            )
+        )
+        embedded = {}
+        if unseen:
+            embedded = dict(
+                zip(
+                    unseen,
+                    await embed_texts_array_async(
+                        unseen, options=EmbeddingOptions().configure(self.config)
+                    ),
+                    strict=True,
+                )
+            )
+
+        return [
+            known[uniq] if uniq in known else embedded[fact]
+            for fact, uniq in zip(facts, uniqs, strict=True)
+        ]
+
+    def _get_stored_embeddings(
+        self, driver, entity_id: int | None, uniqs: list[str]
+    ) -> dict[str, np.ndarray]:
+        if driver is None or not entity_id:
+            return {}
+
+        # A failed lookup only costs re-embedding the facts, so it is logged
+        # rather than raised; the transaction is rolled back so that the
+        # connection stays usable.
+        adapter = driver.entity_fact.conn
+        try:
+            rows = driver.entity_fact.get_embeddings_by_uniq(entity_id, uniqs)
+        except adapter.get_errors() as e:
+            adapter.rollback()
+            logger.warning(f"Could not read stored fact embeddings: {e}")
+            return {}
+
+        return {
+            row["uniq"]: parse_embedding(row["content_embedding"])
+            for row in rows
+            if row["content_embedding"] is not None
+        }
+
     async def _schedule_entity_writes(
-        self, ctx: AugmentationContext, driver, memories: Memories
+        self,
+        ctx: AugmentationContext,
+        driver,
+        memories: Memories,
+        entity_id: int | None = None,
     ):
         if not ctx.payload.entity_id:
             return
 
-        entity_id = driver.entity.create(ctx.payload.entity_id)
+        if entity_id is None:
+            entity_id = driver.entity.create(ctx.payload.entity_id)
         if not entity_id:
             return
 
@@ -137,18 +213,26 @@ class AdvancedAugmentation(BaseAugmentation):
             ]
 
             if facts_from_triples:
-                embeddings_from_triples = await embed_texts_async(facts_from_triples)
+                embeddings_from_triples = await self._embed_facts(
+                    facts_from_triples, driver, entity_id
+                )
                 facts_to_write = (facts_to_write or []) + facts_from_triples
                 embeddings_to_write = (
                     embeddings_to_write or []
                 ) + embeddings_from_triples
 
         if facts_to_write and embeddings_to_write:
+            # Registers the store, so that the write retires the entity's
+            # shared matrices in its directory.
+            if self.config.recall_shared_matrix_dir is not None:
+                get_shared_matrix_store(self.config)
+
             ctx.add_write(
                 "entity_fact.create",
                 entity_id,
                 facts_to_write,
                 embeddings_to_write,
+                embeddings_format=self.config.embeddings_format,
             )
 
         if memories.entity.semantic_triples:
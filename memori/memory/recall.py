@@ -8,50 +8,292 @@ r"""
                       memorilabs.ai
 """
 
+import asyncio
+import inspect
 import time
 
+import numpy as np
 from sqlalchemy.exc import OperationalError
 
 from memori._config import Config
-from memori._search import search_entity_facts
-from memori.llm._embeddings import embed_texts
+from memori._index import IndexOptions, get_index_cache
+from memori._search import search_entity_facts, search_entity_facts_many
+from memori._shared import get_shared_matrix_store
+from memori._snapshot import get_snapshot_store
+from memori.llm._embeddings import EmbeddingOptions, embed_texts_array
+from memori.memory._batcher import get_recall_batcher
 
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 0.05
 
 
+class LockedDriver:
+    """Driver whose calls each hold the storage lock.
+
+    The connection is shared with the writer, which may run on another thread.
+    Only the database calls are serialized, so the search work between them,
+    such as building indexes and ranking, does not hold up writes.
+    """
+
+    def __init__(self, driver, lock) -> None:
+        self.driver = driver
+        self.lock = lock
+
+    def __getattr__(self, name):
+        attr = getattr(self.driver, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self.lock:
+                result = attr(*args, **kwargs)
+            if inspect.isgenerator(result):
+                return self._iter(result)
+            return result
+
+        return call
+
+    def _iter(self, generator):
+        while True:
+            with self.lock:
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+            yield item
+
+
 class Recall:
     def __init__(self, config: Config) -> None:
         self.config = config
 
     def search_facts(
-        self, query: str, limit: int | None = None, entity_id: int | None = None
+        self,
+        query: str,
+        limit: int | None = None,
+        entity_id: int | None = None,
+        include_embeddings: bool = False,
     ) -> list[dict]:
         if self.config.storage is None or self.config.storage.driver is None:
             return []
 
-        if entity_id is None:
-            if self.config.entity_id is None:
-                return []
-            entity_id = self.config.storage.driver.entity.create(self.config.entity_id)
+        if limit is None:
+            limit = self.config.recall_facts_limit
+
+        if self.config.recall_batch_secs_window is not None:
+            return self._search_facts_batched(
+                query, limit, entity_id, include_embeddings
+            )
 
+        entity_id = self._resolve_entity_id(entity_id)
         if entity_id is None:
             return []
 
+        query_embedding = self._embed(query)[0]
+
+        return self._search_with_retry(
+            search_entity_facts,
+            entity_id,
+            query_embedding,
+            limit,
+            query_text=query,
+            include_embeddings=include_embeddings,
+        )
+
+    async def search_facts_async(
+        self,
+        query: str,
+        limit: int | None = None,
+        entity_id: int | None = None,
+        include_embeddings: bool = False,
+    ) -> list[dict]:
+        if self.config.storage is None or self.config.storage.driver is None:
+            return []
+
+        if entity_id is None and self.config.entity_id is None:
+            return []
+
+        if limit is None:
+            limit = self.config.recall_facts_limit
+
+        loop = asyncio.get_running_loop()
+        if self.config.recall_batch_secs_window is not None:
+            return await loop.run_in_executor(
+                self.config.thread_pool_executor,
+                self._search_facts_batched,
+                query,
+                limit,
+                entity_id,
+                include_embeddings,
+            )
+
+        query_embeddings = await loop.run_in_executor(
+            self.config.thread_pool_executor, self._embed, query
+        )
+
+        return await loop.run_in_executor(
+            self.config.thread_pool_executor,
+            self._search_facts_embedded,
+            query,
+            query_embeddings[0],
+            limit,
+            entity_id,
+            include_embeddings,
+        )
+
+    def search_facts_many(
+        self,
+        queries: list[str],
+        limit: int | None = None,
+        entity_id: int | None = None,
+    ) -> list[list[dict]]:
+        if self.config.storage is None or self.config.storage.driver is None:
+            return [[] for _ in queries]
+
+        entity_id = self._resolve_entity_id(entity_id)
+        if entity_id is None:
+            return [[] for _ in queries]
+
         if limit is None:
             limit = self.config.recall_facts_limit
 
-        query_embedding = embed_texts(query)[0]
+        positions = [i for i, query in enumerate(queries) if query]
+        if not positions:
+            return [[] for _ in queries]
+
+        query_embeddings = self._embed([queries[i] for i in positions])
+
+        facts_many = self._search_with_retry(
+            search_entity_facts_many,
+            entity_id,
+            query_embeddings,
+            limit,
+            query_texts=[queries[i] for i in positions],
+        )
+
+        results: list[list[dict]] = [[] for _ in queries]
+        for i, facts in zip(positions, facts_many, strict=False):
+            results[i] = facts
+
+        return results
+
+    def _search_facts_batched(
+        self,
+        query: str,
+        limit: int,
+        entity_id: int | None,
+        include_embeddings: bool = False,
+    ) -> list[dict]:
+        entity_id = self._resolve_entity_id(entity_id)
+        if entity_id is None:
+            return []
+
+        return get_recall_batcher().search(
+            (self.config, entity_id, limit, include_embeddings),
+            query,
+            self.config.recall_batch_secs_window,
+            lambda queries: self._search_facts_many_embedded(
+                queries, limit, entity_id, include_embeddings
+            ),
+        )
+
+    def _search_facts_many_embedded(
+        self,
+        queries: list[str],
+        limit: int,
+        entity_id: int,
+        include_embeddings: bool = False,
+    ) -> list[list[dict]]:
+        query_embeddings = self._embed(queries)
+
+        return self._search_with_retry(
+            search_entity_facts_many,
+            entity_id,
+            query_embeddings,
+            limit,
+            query_texts=queries,
+            include_embeddings=include_embeddings,
+        )
+
+    def _search_facts_embedded(
+        self,
+        query: str,
+        query_embedding: list[float],
+        limit: int,
+        entity_id: int | None,
+        include_embeddings: bool = False,
+    ) -> list[dict]:
+        entity_id = self._resolve_entity_id(entity_id)
+        if entity_id is None:
+            return []
+
+        return self._search_with_retry(
+            search_entity_facts,
+            entity_id,
+            query_embedding,
+            limit,
+            query_text=query,
+            include_embeddings=include_embeddings,
+        )
+
+    def _embed(self, texts: str | list[str]) -> np.ndarray:
+        # Options are read from this config on every call, so other Memori
+        # instances in the process cannot change how its queries are encoded.
+        return embed_texts_array(
+            texts, options=EmbeddingOptions().configure(self.config)
+        )
+
+    def _resolve_entity_id(self, entity_id: int | None) -> int | None:
+        if entity_id is None:
+            if self.config.entity_id is None:
+                return None
+            with self.config.storage.lock:
+                entity_id = self.config.storage.driver.entity.create(
+                    self.config.entity_id
+                )
+
+        return entity_id
+
+    def _search_with_retry(self, search, entity_id: int, query, limit: int, **kwargs):
+        index_cache = None
+        if self.config.recall_index_cache_max_bytes > 0:
+            index_cache = get_index_cache(self.config)
+
+        shared_store = None
+        if self.config.recall_shared_matrix_dir is not None:
+            shared_store = get_shared_matrix_store(self.config)
+
+        # Snapshots keep facts in id order rather than by frequency and
+        # recency, so they are not used when rank weighting is on.
+        snapshot_store = None
+        if (
+            self.config.recall_snapshot_dir is not None
+            and self.config.recall_rank_weight == 0
+        ):
+            snapshot_store = get_snapshot_store(self.config)
 
         facts = []
         for attempt in range(MAX_RETRIES):
             try:
-                facts = search_entity_facts(
-                    self.config.storage.driver.entity_fact,
+                facts = search(
+                    LockedDriver(
+                        self.config.storage.driver.entity_fact,
+                        self.config.storage.lock,
+                    ),
                     entity_id,
-                    query_embedding,
+                    query,
                     limit,
                     self.config.recall_embeddings_limit,
+                    index_cache=index_cache,
+                    index_options=IndexOptions().configure(self.config),
+                    include_content=self.config.recall_embeddings_include_content,
+                    scan_chunk_size=self.config.recall_scan_chunk_size,
+                    signature_candidates=self.config.recall_signature_candidates,
+                    shared_store=shared_store,
+                    snapshot_store=snapshot_store,
+                    lexical_weight=self.config.recall_lexical_weight,
+                    lexical_limit=self.config.recall_lexical_limit,
+                    **kwargs,
                 )
                 break
             except OperationalError as e:
@@ -8,12 +8,31 @@ r"""
                        memorilabs.ai
 """
 
+import os
+from collections.abc import Callable
+
+_DATABASE_KEY_QUERIES = {
+    "cockroachdb": "SELECT crdb_internal.cluster_id()::STRING, current_database()",
+    "mysql": "SELECT @@hostname, @@port, DATABASE()",
+    "oracle": """
+        SELECT sys_context('USERENV', 'SERVER_HOST'),
+               sys_context('USERENV', 'DB_UNIQUE_NAME'),
+               sys_context('USERENV', 'CURRENT_SCHEMA')
+          FROM dual
+    """,
+    "postgresql": (
+        "SELECT inet_server_addr()::text, current_setting('port'), current_database()"
+    ),
+}
+
 
 class BaseStorageAdapter:
     def __init__(self, conn):
         if not callable(conn):
             raise TypeError("conn must be a callable")
         self.conn = conn()
+        self.database_key: str | None = None
+        self.commit_callbacks: list[Callable[[], object]] = []
 
     def close(self):
         if self.conn is not None:
@@ -25,6 +44,11 @@ class BaseStorageAdapter:
         raise NotImplementedError
 
     def execute(self, operation, *args, **kwargs):
+        """Execute an operation.
+
+        Adapters accept a binary keyword argument; when True and the underlying
+        driver supports it, results are requested in binary format.
+        """
         raise NotImplementedError
 
     def flush(self):
@@ -33,9 +57,76 @@ class BaseStorageAdapter:
     def get_dialect(self):
         raise NotImplementedError
 
+    def get_errors(self) -> tuple[type[Exception], ...]:
+        """Exception types that a failed operation on the connection raises."""
+        raise NotImplementedError
+
+    def on_commit(self, callback: Callable[[], object]):
+        """Run callback once the current transaction is committed.
+
+        State that a process derives from the database, such as cached
+        indexes, is only updated once the writes it reflects are committed; on
+        a rollback the callbacks are discarded.
+        """
+        self.commit_callbacks.append(callback)
+        return self
+
+    def _run_commit_callbacks(self):
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _discard_commit_callbacks(self):
+        self.commit_callbacks = []
+
+    def get_database_key(self) -> str:
+        """Identify the database behind the connection, without credentials.
+
+        What a process keeps per entity, such as cached indexes, is keyed by
+        it together with the entity id, so that databases whose entities
+        share ids are kept apart. It is read from the server once per adapter.
+        """
+        if self.database_key is None:
+            self.database_key = self._read_database_key()
+        return self.database_key
+
     def rollback(self):
         raise NotImplementedError
 
+    def _read_database_key(self) -> str:
+        dialect = self.get_dialect()
+
+        # The key may be read in the middle of the caller's transaction, which
+        # a failed statement aborts on PostgreSQL and CockroachDB; the query
+        # runs in a savepoint so that only it is rolled back. Outside of a
+        # transaction the savepoint cannot be set, and nothing needs keeping.
+        savepoint = False
+        if dialect in ("cockroachdb", "postgresql"):
+            try:
+                self.execute("SAVEPOINT memori_database_key")
+                savepoint = True
+            except Exception:  # nosec B110
+                pass
+
+        try:
+            if dialect == "sqlite":
+                rows = self.execute("PRAGMA database_list").fetchall()
+                path = next((row[2] for row in rows if row[1] == "main"), "")
+                if path:
+                    return f"sqlite:{os.path.realpath(path)}"
+            elif dialect in _DATABASE_KEY_QUERIES:
+                row = self.execute(_DATABASE_KEY_QUERIES[dialect]).fetchone()
+                if savepoint:
+                    self.execute("RELEASE SAVEPOINT memori_database_key")
+                return f"{dialect}:" + "/".join(str(value) for value in row)
+        except Exception:
+            # The key only needs to be unique; when the server cannot tell,
+            # fall back to the connection, which is unique within the process.
+            if savepoint:
+                self.execute("ROLLBACK TO SAVEPOINT memori_database_key")
+
+        return f"{dialect}:{id(self.conn)}"
+
 
 class BaseConversation:
     def __init__(self, conn: BaseStorageAdapter):
@@ -87,15 +178,164 @@ class BaseEntityFact:
     def __init__(self, conn: BaseStorageAdapter):
         self.conn = conn
 
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embeddings_format: str = "float32",
+    ):
         raise NotImplementedError
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def get_embeddings(
+        self, entity_id: int, limit: int | None = 1000, include_content: bool = False
+    ):
         raise NotImplementedError
 
+    def get_embeddings_after(self, entity_id: int, after_id, limit: int):
+        raise NotImplementedError
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        raise NotImplementedError
+
+    def get_embedding_stats(self, entity_id: int, until_id):
+        """Count and greatest id of an entity's facts with an id up to until_id.
+
+        Returns:
+            Dict with keys count and max_id, or None when not supported
+        """
+        return None
+
+    def get_embedding_matrix(self, entity_id: int, limit: int | None = 1000):
+        from memori._search import parse_embeddings
+
+        rows = self.get_embeddings(entity_id, limit)
+        return parse_embeddings(
+            [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+        )
+
+    def get_embedding_matrix_with_content(
+        self, entity_id: int, limit: int | None = 1000
+    ):
+        from memori._search import parse_embeddings
+
+        rows = self.get_embeddings(entity_id, limit, include_content=True)
+        ids, matrix = parse_embeddings(
+            [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+        )
+        return ids, matrix, {row["id"]: row["content"] for row in rows}
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         raise NotImplementedError
 
+    def get_ids_by_uniq(self, entity_id: int, uniqs: list[str]):
+        raise NotImplementedError
+
+    def cache_key(self, entity_id) -> tuple:
+        """Key of an entity in the index cache and the shared and snapshot stores."""
+        return (self.conn.get_database_key(), entity_id)
+
+    def get_embeddings_by_uniq(self, entity_id: int, uniqs: list[str]):
+        raise NotImplementedError
+
+    def iter_embedding_matrices(
+        self, entity_id: int, chunk_size: int = 1000, after_id=None
+    ):
+        """Yield (ids, matrix) chunks of an entity's embeddings in id order.
+
+        When after_id is given, only facts with a greater id are yielded.
+        """
+        from memori._search import parse_embeddings
+
+        while True:
+            rows = self.get_embeddings_after(entity_id, after_id, chunk_size)
+            if not rows:
+                return
+
+            yield parse_embeddings(
+                [row["id"] for row in rows], [row["content_embedding"] for row in rows]
+            )
+
+            if len(rows) < chunk_size:
+                return
+
+            after_id = rows[-1]["id"]
+
+    def get_signatures(self, entity_id: int, limit: int | None = 1000):
+        return None
+
+    def search_lexical(self, entity_id: int, query_text: str, limit: int):
+        return None
+
+    def search_similar(self, entity_id: int, query_embedding: list[float], limit: int):
+        return None
+
+    def _add_to_index_cache(
+        self,
+        entity_id: int,
+        uniqs: list[str],
+        fact_embeddings: list | None,
+        facts: list | None = None,
+        deferred: bool = False,
+    ):
+        """Add new facts to the entity's cached indexes and retire its shared
+        matrices, in every index cache and shared matrix store of the process.
+
+        Drivers whose create leaves the transaction to the caller pass
+        deferred, so that the process-wide state is only updated once the
+        facts are committed.
+        """
+        from memori._index import get_index_caches
+        from memori._shared import get_shared_matrix_stores
+
+        shared_stores = [store for store in get_shared_matrix_stores() if store.enabled]
+        index_caches = [cache for cache in get_index_caches() if cache.entries]
+        if not shared_stores and not index_caches:
+            return self
+
+        key = self.cache_key(entity_id)
+        cached = []
+        if fact_embeddings:
+            cached = [cache for cache in index_caches if cache.contains(key)]
+
+        ids = []
+        embeddings = []
+        contents = []
+        missing = False
+        if cached:
+            id_by_uniq = {
+                row["uniq"]: row["id"] for row in self.get_ids_by_uniq(entity_id, uniqs)
+            }
+            for i, (uniq, embedding) in enumerate(
+                zip(uniqs, fact_embeddings or [], strict=False)
+            ):
+                if uniq in id_by_uniq:
+                    ids.append(id_by_uniq[uniq])
+                    embeddings.append(embedding)
+                    contents.append(facts[i] if facts is not None else None)
+                else:
+                    missing = True
+
+        def update():
+            for shared_store in shared_stores:
+                shared_store.invalidate(key)
+            for index_cache in cached:
+                if missing:
+                    # Facts whose ids could not be read would be missing from
+                    # the cached index; it is reloaded from the database.
+                    index_cache.invalidate(key)
+                else:
+                    index_cache.add(
+                        key, ids, embeddings, contents if facts is not None else None
+                    )
+
+        if deferred:
+            self.conn.on_commit(update)
+        else:
+            update()
+
+        return self
+
 
 class BaseProcess:
     def __init__(self, conn: BaseStorageAdapter):
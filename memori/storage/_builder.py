@@ -88,7 +88,42 @@ class Builder:
 
         return self
 
-    def execute(self):
+    def create_optional_data_structures(self, name: str):
+        if self.config.storage is None or self.config.storage.adapter is None:
+            return self
+
+        if self.config.storage.driver is None:
+            raise RuntimeError("Driver not initialized")
+
+        dialect = self.config.storage.adapter.get_dialect()
+
+        optional_migrations = self._get_optional_migrations(dialect)
+        if name not in optional_migrations:
+            raise NotImplementedError(
+                f"Optional migration {name} is not available for dialect: {dialect}."
+            )
+
+        self.cli.notice(f"Building optional {name}...")
+
+        for migration in optional_migrations[name]:
+            self.cli.notice(migration["description"], 1)
+            if "method" in migration:
+                target = self.config.storage.driver
+                for attr in migration["method"].split("."):
+                    target = getattr(target, attr)
+                target()
+            else:
+                self.config.storage.adapter.execute(
+                    migration.get("operations") or migration.get("operation")
+                )
+            self.config.storage.adapter.commit()
+
+        self.cli.notice(f"Optional {name} built successfully!")
+        self.cli.newline()
+
+        return self
+
+    def execute(self, optional: list[str] | None = None):
         if self.config.storage is None or self.config.storage.adapter is None:
             return self
 
@@ -97,6 +132,8 @@ class Builder:
 
         if dialect in supported_dialects:
             self.create_data_structures()
+            for name in optional or []:
+                self.create_optional_data_structures(name)
         else:
             raise NotImplementedError(
                 f"Unsupported dialect: {dialect}. "
@@ -115,6 +152,13 @@ class Builder:
 
         return None
 
+    def _get_optional_migrations(self, dialect):
+        if dialect in self.registry._drivers:
+            driver_class = self.registry._drivers[dialect]
+            return getattr(driver_class, "optional_migrations", {})
+
+        return {}
+
     def _requires_rollback(self, dialect):
         if dialect in self.registry._drivers:
             driver_class = self.registry._drivers[dialect]
@@ -8,6 +8,8 @@ r"""
                        memorilabs.ai
 """
 
+import threading
+
 from memori._config import Config
 from memori.storage._builder import Builder
 from memori.storage._connection import connection_context
@@ -20,16 +22,17 @@ class Manager:
         self.config = config
         self.conn_factory = None
         self.driver = None
+        self.lock = threading.Lock()
 
     @property
     def conn(self):
         return connection_context(self.conn_factory)
 
-    def build(self) -> "Manager":
+    def build(self, optional: list[str] | None = None) -> "Manager":
         if self.conn_factory is None:
             return self
 
-        Builder(self.config).execute()
+        Builder(self.config).execute(optional)
 
         return self
 
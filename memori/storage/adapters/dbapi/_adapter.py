@@ -8,6 +8,8 @@ r"""
                        memorilabs.ai
 """
 
+import sys
+
 from memori.storage._base import BaseStorageAdapter
 from memori.storage._registry import Registry
 
@@ -68,12 +70,16 @@ def is_dbapi_connection(conn):
 class Adapter(BaseStorageAdapter):
     def commit(self):
         self.conn.commit()
+        self._run_commit_callbacks()
         return self
 
-    def execute(self, operation, binds=()):
+    def execute(self, operation, binds=(), binary=False):
         cursor = self.conn.cursor()
         try:
-            cursor.execute(operation, binds)
+            if binary and self._supports_binary():
+                cursor.execute(operation, binds, binary=True)
+            else:
+                cursor.execute(operation, binds)
             return CursorWrapper(cursor)
         except Exception:
             cursor.close()
@@ -97,6 +103,20 @@ class Adapter(BaseStorageAdapter):
             f"Unable to determine dialect from connection module: {module_name}"
         )
 
+    def get_errors(self):
+        # PEP 249 drivers raise subclasses of the Error their module exports.
+        module = sys.modules.get(type(self.conn).__module__.split(".")[0])
+        error = getattr(module, "Error", None)
+        if isinstance(error, type) and issubclass(error, Exception):
+            return (error,)
+        return ()
+
     def rollback(self):
         self.conn.rollback()
+        self._discard_commit_callbacks()
         return self
+
+    def _supports_binary(self):
+        # psycopg (3) can return results in binary format, which avoids the
+        # hex encoding of BYTEA columns; psycopg2 cannot.
+        return type(self.conn).__module__.split(".")[0] == "psycopg"
@@ -58,9 +58,10 @@ def is_django_connection(conn):
 class Adapter(BaseStorageAdapter):
     def commit(self):
         self.conn.commit()
+        self._run_commit_callbacks()
         return self
 
-    def execute(self, operation, binds=()):
+    def execute(self, operation, binds=(), binary=False):
         cursor = self.conn.cursor()
         try:
             cursor.execute(operation, binds)
@@ -84,6 +85,12 @@ class Adapter(BaseStorageAdapter):
             return dialect_mapping[vendor]
         raise ValueError(f"Unable to determine dialect from Django vendor: {vendor}")
 
+    def get_errors(self):
+        from django.db import Error
+
+        return (Error,)
+
     def rollback(self):
         self.conn.rollback()
+        self._discard_commit_callbacks()
         return self
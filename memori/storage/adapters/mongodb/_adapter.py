@@ -48,7 +48,7 @@ class Adapter(BaseStorageAdapter):
 
     def commit(self):
         """MongoDB doesn't require explicit commits for single operations."""
-        pass
+        self._run_commit_callbacks()
 
     def flush(self):
         """MongoDB doesn't require explicit flushes for single operations."""
@@ -56,7 +56,7 @@ class Adapter(BaseStorageAdapter):
 
     def rollback(self):
         """MongoDB doesn't require explicit rollbacks for single operations."""
-        pass
+        self._discard_commit_callbacks()
 
     def close(self):
         """MongoDB client connection should not be closed per-operation.
@@ -69,6 +69,21 @@ class Adapter(BaseStorageAdapter):
     def get_dialect(self):
         return "mongodb"
 
+    def get_errors(self):
+        from pymongo.errors import PyMongoError
+
+        return (PyMongoError,)
+
+    def _read_database_key(self):
+        if hasattr(self.conn, "get_default_database"):
+            db = self.conn.get_default_database()
+        else:
+            db = self.conn
+
+        # Entity ids are ObjectIds, unique across databases; the name keeps
+        # keys readable.
+        return f"mongodb:{getattr(db, 'name', id(db))}"
+
     def _execute_operation(self, db, op):
         """Execute a single MongoDB operation from a dict.
 
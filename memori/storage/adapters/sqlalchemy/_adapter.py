@@ -18,9 +18,10 @@ from memori.storage._registry import Registry
 class Adapter(BaseStorageAdapter):
     def commit(self):
         self.conn.commit()
+        self._run_commit_callbacks()
         return self
 
-    def execute(self, operation, binds=()):
+    def execute(self, operation, binds=(), binary=False):
         return self.conn.connection().exec_driver_sql(operation, binds)
 
     def flush(self):
@@ -30,6 +31,12 @@ class Adapter(BaseStorageAdapter):
     def get_dialect(self):
         return self.conn.get_bind().dialect.name
 
+    def get_errors(self):
+        from sqlalchemy.exc import SQLAlchemyError
+
+        return (SQLAlchemyError,)
+
     def rollback(self):
         self.conn.rollback()
+        self._discard_commit_callbacks()
         return self
@@ -26,7 +26,7 @@ from memori.storage._base import (
     BaseStorageAdapter,
 )
 from memori.storage._registry import Registry
-from memori.storage.migrations._mongodb import migrations
+from memori.storage.migrations._mongodb import migrations, optional_migrations
 
 
 class Conversation(BaseConversation):
@@ -161,21 +161,38 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._content_signature: bool | None = None
+        self._fulltext: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embeddings_format: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
+        from memori._search import compute_signature
         from memori._utils import generate_uniq
         from memori.llm._embeddings import format_embedding_for_db
 
+        has_content_signature = self.has_content_signature()
+        uniqs = []
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
                 if fact_embeddings and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, "mongodb")
+            embedding_formatted = format_embedding_for_db(
+                embedding, "mongodb", embeddings_format
+            )
             uniq = generate_uniq([fact])
+            uniqs.append(uniq)
 
             # Check if fact already exists
             existing = self.conn.execute(
@@ -185,7 +202,8 @@ class EntityFact(BaseEntityFact):
             )
 
             if existing:
-                # Update existing fact
+                # Update existing fact; like its embedding, its signature is
+                # kept as it was first written.
                 self.conn.execute(
                     "memori_entity_fact",
                     "update_one",
@@ -208,27 +226,146 @@ class EntityFact(BaseEntityFact):
                     "date_created": datetime.now(timezone.utc),
                     "date_updated": None,
                 }
+                if has_content_signature:
+                    fact_doc["content_signature"] = compute_signature(embedding)
 
                 self.conn.execute("memori_entity_fact", "insert_one", fact_doc)
 
+        self._add_to_index_cache(entity_id, uniqs, fact_embeddings, facts)
+
+        return self
+
+    def backfill_signatures(self, batch_size: int = 1000):
+        from memori._search import compute_signature, parse_embedding
+
+        last_id = None
+        while True:
+            # Signatures of facts written without an embedding are empty.
+            query: dict = {"content_signature": {"$in": [None, b""]}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            rows = list(
+                self.conn.execute(
+                    "memori_entity_fact",
+                    "find",
+                    query,
+                    {"_id": 1, "content_embedding": 1},
+                    sort=[("_id", 1)],
+                    limit=batch_size,
+                )
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                self.conn.execute(
+                    "memori_entity_fact",
+                    "update_one",
+                    {"_id": row["_id"]},
+                    {
+                        "$set": {
+                            "content_signature": compute_signature(
+                                parse_embedding(row["content_embedding"])
+                            )
+                        }
+                    },
+                )
+
+            last_id = rows[-1]["_id"]
+
+        return self
+
+    def add_content_signature(self):
+        self.conn.execute(
+            "memori_entity_fact",
+            "create_index",
+            [("entity_id", 1), ("content_signature", 1)],
+            name="idx_memori_entity_fact_content_signature",
+        )
+        self._content_signature = True
+
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def has_content_signature(self) -> bool:
+        if self._content_signature is None:
+            self._content_signature = "idx_memori_entity_fact_content_signature" in (
+                self.conn.execute("memori_entity_fact", "index_information") or {}
+            )
+
+        return self._content_signature
+
+    def has_fulltext(self) -> bool:
+        if self._fulltext is None:
+            self._fulltext = "idx_memori_entity_fact_content_text" in (
+                self.conn.execute("memori_entity_fact", "index_information") or {}
+            )
+
+        return self._fulltext
+
+    def get_embeddings(
+        self, entity_id: int, limit: int | None = 1000, include_content: bool = False
+    ):
+        projection = {"_id": 1, "content_embedding": 1}
+        if include_content:
+            projection["content"] = 1
+
         results = self.conn.execute(
             "memori_entity_fact",
             "find",
             {"entity_id": entity_id},
-            {"_id": 1, "content_embedding": 1},
+            projection,
+            sort=[("num_times", -1), ("date_last_time", -1)],
+            limit=limit or 0,
         )
 
         embeddings = []
         for result in list(results)[:limit]:
-            embeddings.append(
-                {"id": result["_id"], "content_embedding": result["content_embedding"]}
-            )
+            embedding = {
+                "id": result["_id"],
+                "content_embedding": result["content_embedding"],
+            }
+            if include_content:
+                embedding["content"] = result["content"]
+            embeddings.append(embedding)
 
         return embeddings
 
+    def get_embeddings_after(self, entity_id: int, after_id, limit: int):
+        query: dict = {"entity_id": entity_id}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            query,
+            {"_id": 1, "content_embedding": 1},
+            sort=[("_id", 1)],
+            limit=limit,
+        )
+
+        return [
+            {"id": result["_id"], "content_embedding": result["content_embedding"]}
+            for result in results
+        ]
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"_id": {"$in": fact_ids}},
+            {"_id": 1, "content_embedding": 1},
+        )
+
+        return [
+            {"id": result["_id"], "content_embedding": result["content_embedding"]}
+            for result in results
+        ]
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -246,6 +383,81 @@ class EntityFact(BaseEntityFact):
 
         return facts
 
+    def get_ids_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id, "uniq": {"$in": uniqs}},
+            {"_id": 1, "uniq": 1},
+        )
+
+        return [{"id": result["_id"], "uniq": result["uniq"]} for result in results]
+
+    def get_embeddings_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id, "uniq": {"$in": uniqs}},
+            {"uniq": 1, "content_embedding": 1},
+        )
+
+        return [
+            {"uniq": result["uniq"], "content_embedding": result["content_embedding"]}
+            for result in results
+        ]
+
+    def get_signatures(self, entity_id: int, limit: int | None = 1000):
+        if not self.has_content_signature():
+            return None
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id},
+            {"_id": 1, "content_signature": 1},
+            sort=[("num_times", -1), ("date_last_time", -1)],
+            limit=limit or 0,
+        )
+
+        return [
+            {"id": result["_id"], "content_signature": result.get("content_signature")}
+            for result in results
+        ]
+
+    def search_lexical(self, entity_id: int, query_text: str, limit: int):
+        from memori._search import lexical_terms
+
+        if not self.has_fulltext():
+            return None
+
+        terms = lexical_terms(query_text)
+        if not terms:
+            return []
+
+        results = self.conn.execute(
+            "memori_entity_fact",
+            "find",
+            {"entity_id": entity_id, "$text": {"$search": " ".join(terms)}},
+            {"_id": 1, "content": 1, "score": {"$meta": "textScore"}},
+            sort=[("score", {"$meta": "textScore"})],
+            limit=limit,
+        )
+
+        return [
+            {
+                "id": result["_id"],
+                "content": result["content"],
+                "score": result["score"],
+            }
+            for result in results
+        ]
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -489,11 +701,15 @@ class Driver:
 
     Attributes:
         migrations: Database schema migrations for MongoDB.
+        optional_migrations: Opt-in migrations by name; "signature" adds sign-bit
+            signatures for a Hamming prefilter and "fulltext" adds a text index
+            for hybrid recall.
         requires_rollback_on_error: MongoDB does not abort transactions on query
             errors by default, so no rollback is needed to continue executing queries.
     """
 
     migrations = migrations
+    optional_migrations = optional_migrations
     requires_rollback_on_error = False
 
     def __init__(self, conn: BaseStorageAdapter):
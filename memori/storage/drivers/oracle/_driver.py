@@ -25,7 +25,7 @@ from memori.storage._base import (
     BaseStorageAdapter,
 )
 from memori.storage._registry import Registry
-from memori.storage.migrations._oracle import migrations
+from memori.storage.migrations._oracle import migrations, optional_migrations
 
 
 class Conversation(BaseConversation):
@@ -216,52 +216,167 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._content_signature: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embeddings_format: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
+        from memori._search import compute_signature
         from memori._utils import generate_uniq
         from memori.llm._embeddings import format_embedding_for_db
 
         dialect = self.conn.get_dialect()
-
+        if self.has_content_signature():
+            signature_source = ", :6 AS content_signature"
+            signature_update = """,
+                               content_signature = COALESCE(
+                                   dst.content_signature, src.content_signature
+                               )"""
+            signature_column = ", content_signature"
+            signature_value = ", src.content_signature"
+        else:
+            signature_source = signature_update = ""
+            signature_column = signature_value = ""
+
+        uniqs = []
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
                 if fact_embeddings and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, dialect)
+            embedding_formatted = format_embedding_for_db(
+                embedding, dialect, embeddings_format
+            )
             uniq = generate_uniq([fact])
+            uniqs.append(uniq)
+
+            binds: tuple = (
+                str(uuid4()),
+                entity_id,
+                fact,
+                embedding_formatted,
+                uniq,
+            )
+            if signature_column:
+                binds += (compute_signature(embedding),)
 
             self.conn.execute(
-                """
+                f"""
                 MERGE INTO memori_entity_fact dst
                 USING (SELECT :1 AS uuid, :2 AS entity_id, :3 AS content,
-                              :4 AS content_embedding, :5 AS uniq FROM DUAL) src
+                              :4 AS content_embedding, :5 AS uniq{signature_source}
+                         FROM DUAL) src
                 ON (dst.entity_id = src.entity_id AND dst.uniq = src.uniq)
                 WHEN MATCHED THEN
                     UPDATE SET num_times = dst.num_times + 1,
-                               date_last_time = SYSTIMESTAMP
+                               date_last_time = SYSTIMESTAMP{signature_update}
                 WHEN NOT MATCHED THEN
                     INSERT (uuid, entity_id, content, content_embedding,
-                            num_times, date_last_time, uniq)
+                            num_times, date_last_time, uniq{signature_column})
                     VALUES (src.uuid, src.entity_id, src.content, src.content_embedding,
-                            1, SYSTIMESTAMP, src.uniq)
+                            1, SYSTIMESTAMP, src.uniq{signature_value})
                 """,
-                (
-                    str(uuid4()),
-                    entity_id,
-                    fact,
-                    embedding_formatted,
-                    uniq,
-                ),
+                binds,
             )
 
         self.conn.commit()
+
+        self._add_to_index_cache(entity_id, uniqs, fact_embeddings, facts)
+
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def backfill_signatures(self, batch_size: int = 1000):
+        from memori._search import compute_signature, parse_embedding
+
+        last_id = 0
+        while True:
+            rows = (
+                self.conn.execute(
+                    """
+                    SELECT id,
+                           content_embedding
+                      FROM memori_entity_fact
+                     WHERE id > :1
+                       AND content_signature IS NULL
+                     ORDER BY id
+                     FETCH FIRST :2 ROWS ONLY
+                    """,
+                    (last_id, batch_size),
+                )
+                .mappings()
+                .fetchall()
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                self.conn.execute(
+                    """
+                    UPDATE memori_entity_fact
+                       SET content_signature = :1
+                     WHERE id = :2
+                    """,
+                    (
+                        compute_signature(parse_embedding(row["content_embedding"])),
+                        row["id"],
+                    ),
+                )
+
+            self.conn.commit()
+            last_id = rows[-1]["id"]
+
+        return self
+
+    def has_content_signature(self) -> bool:
+        if self._content_signature is None:
+            self._content_signature = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM user_tab_columns
+                     WHERE table_name = 'MEMORI_ENTITY_FACT'
+                       AND column_name = 'CONTENT_SIGNATURE'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._content_signature
+
+    def _embeddings_query(
+        self, entity_id: int, limit: int | None, include_content: bool = False
+    ):
+        limit_clause = "" if limit is None else "FETCH FIRST :2 ROWS ONLY"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+        content_column = ", content" if include_content else ""
+
+        query = f"""
+            SELECT id,
+                   content_embedding{content_column}
+              FROM memori_entity_fact
+             WHERE entity_id = :1
+             ORDER BY num_times DESC, date_last_time DESC
+             {limit_clause}
+        """
+        return query, binds
+
+    def get_embeddings(
+        self, entity_id: int, limit: int | None = 1000, include_content: bool = False
+    ):
+        query, binds = self._embeddings_query(entity_id, limit, include_content)
+        return self.conn.execute(query, binds).mappings().fetchall()
+
+    def get_embeddings_after(self, entity_id: int, after_id: int | None, limit: int):
         return (
             self.conn.execute(
                 """
@@ -269,14 +384,53 @@ class EntityFact(BaseEntityFact):
                        content_embedding
                   FROM memori_entity_fact
                  WHERE entity_id = :1
-                   AND ROWNUM <= :2
+                   AND id > :2
+                 ORDER BY id
+                 FETCH FIRST :3 ROWS ONLY
                 """,
-                (entity_id, limit),
+                (entity_id, after_id or 0, limit),
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embedding_stats(self, entity_id: int, until_id: int):
+        return (
+            self.conn.execute(
+                """
+                SELECT COUNT(*) AS count,
+                       MAX(id) AS max_id
+                  FROM memori_entity_fact
+                 WHERE entity_id = :1
+                   AND id <= :2
+                """,
+                (entity_id, until_id),
+            )
+            .mappings()
+            .fetchone()
+        )
+
+    def get_embedding_matrix(self, entity_id: int, limit: int | None = 1000):
+        from memori._search import parse_embeddings
+
+        query, binds = self._embeddings_query(entity_id, limit)
+        rows = self.conn.execute(query, binds).fetchall()
+        return parse_embeddings([row[0] for row in rows], [row[1] for row in rows])
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+
+        placeholders = ",".join([f":{i + 1}" for i in range(len(fact_ids))])
+        query = f"""
+            SELECT id,
+                   content_embedding
+              FROM memori_entity_fact
+             WHERE id IN ({placeholders})
+        """
+
+        return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -292,6 +446,53 @@ class EntityFact(BaseEntityFact):
 
         return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
 
+    def get_ids_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        placeholders = ",".join([f":{i + 2}" for i in range(len(uniqs))])
+        query = f"""
+            SELECT id,
+                   uniq
+              FROM memori_entity_fact
+             WHERE entity_id = :1
+               AND uniq IN ({placeholders})
+        """
+
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def get_embeddings_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+
+        placeholders = ",".join([f":{i + 2}" for i in range(len(uniqs))])
+        query = f"""
+            SELECT uniq,
+                   content_embedding
+              FROM memori_entity_fact
+             WHERE entity_id = :1
+               AND uniq IN ({placeholders})
+        """
+
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def get_signatures(self, entity_id: int, limit: int | None = 1000):
+        if not self.has_content_signature():
+            return None
+
+        limit_clause = "" if limit is None else "FETCH FIRST :2 ROWS ONLY"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+
+        query = f"""
+            SELECT id,
+                   content_signature
+              FROM memori_entity_fact
+             WHERE entity_id = :1
+             ORDER BY num_times DESC, date_last_time DESC
+             {limit_clause}
+        """
+        return self.conn.execute(query, binds).mappings().fetchall()
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -575,11 +776,14 @@ class Driver:
 
     Attributes:
         migrations: Database schema migrations for Oracle.
+        optional_migrations: Opt-in migrations by name; "signature" adds sign-bit
+            signatures for a Hamming prefilter.
         requires_rollback_on_error: Oracle aborts transactions when a query
             fails and requires an explicit ROLLBACK before executing new queries.
     """
 
     migrations = migrations
+    optional_migrations = optional_migrations
     requires_rollback_on_error = True
 
     def __init__(self, conn: BaseStorageAdapter):
@@ -25,7 +25,16 @@ from memori.storage._base import (
     BaseStorageAdapter,
 )
 from memori.storage._registry import Registry
-from memori.storage.migrations._postgresql import migrations
+from memori.storage.migrations._postgresql import migrations, optional_migrations
+
+EMBEDDING_VECTOR_DIMENSIONS = 768
+
+
+def _format_vector(embedding) -> str | None:
+    if embedding is None or len(embedding) != EMBEDDING_VECTOR_DIMENSIONS:
+        return None
+
+    return "[" + ",".join(str(float(value)) for value in embedding) + "]"
 
 
 class Conversation(BaseConversation):
@@ -215,26 +224,76 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._content_signature: bool | None = None
+        self._embedding_vector: bool | None = None
+        self._fulltext: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embeddings_format: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
+        from memori._search import compute_signature
         from memori._utils import generate_uniq
         from memori.llm._embeddings import format_embedding_for_db
 
         dialect = self.conn.get_dialect()
-
+        if self.has_content_signature():
+            signature_column = ", content_signature"
+            signature_value = ", %s"
+            signature_update = """,
+                    content_signature = COALESCE(
+                        memori_entity_fact.content_signature,
+                        EXCLUDED.content_signature
+                    )"""
+        else:
+            signature_column = signature_value = signature_update = ""
+
+        if self.has_embedding_vector():
+            vector_column = ", content_embedding_vector"
+            vector_value = ", %s::vector"
+            vector_update = """,
+                    content_embedding_vector = COALESCE(
+                        memori_entity_fact.content_embedding_vector,
+                        EXCLUDED.content_embedding_vector
+                    )"""
+        else:
+            vector_column = vector_value = vector_update = ""
+
+        uniqs = []
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
                 if fact_embeddings and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, dialect)
+            embedding_formatted = format_embedding_for_db(
+                embedding, dialect, embeddings_format
+            )
             uniq = generate_uniq([fact])
+            uniqs.append(uniq)
+
+            binds: tuple = (
+                str(uuid4()),
+                entity_id,
+                fact,
+                embedding_formatted,
+                uniq,
+            )
+            if signature_column:
+                binds += (compute_signature(embedding),)
+            if vector_column:
+                binds += (_format_vector(embedding),)
 
             self.conn.execute(
-                """
+                f"""
                 INSERT INTO memori_entity_fact(
                     uuid,
                     entity_id,
@@ -242,7 +301,7 @@ class EntityFact(BaseEntityFact):
                     content_embedding,
                     num_times,
                     date_last_time,
-                    uniq
+                    uniq{signature_column}{vector_column}
                 ) VALUES (
                     %s,
                     %s,
@@ -250,24 +309,180 @@ class EntityFact(BaseEntityFact):
                     %s,
                     1,
                     CURRENT_TIMESTAMP,
-                    %s
+                    %s{signature_value}{vector_value}
                 )
                 ON CONFLICT (entity_id, uniq) DO UPDATE SET
                     num_times = memori_entity_fact.num_times + 1,
-                    date_last_time = CURRENT_TIMESTAMP
-                """,
-                (
-                    str(uuid4()),
-                    entity_id,
-                    fact,
-                    embedding_formatted,
-                    uniq,
-                ),
+                    date_last_time = CURRENT_TIMESTAMP{signature_update}{vector_update}
+                """,  # nosec B608: Safe - only interpolating fixed column SQL, actual values parameterized
+                binds,
             )
 
+        # The caller commits the transaction.
+        self._add_to_index_cache(
+            entity_id, uniqs, fact_embeddings, facts, deferred=True
+        )
+
+        return self
+
+    def backfill_signatures(self, batch_size: int = 1000):
+        from memori._search import compute_signature, parse_embedding
+
+        last_id = 0
+        while True:
+            rows = (
+                self.conn.execute(
+                    """
+                    SELECT id,
+                           content_embedding
+                      FROM memori_entity_fact
+                     WHERE id > %s
+                       AND content_signature IS NULL
+                     ORDER BY id
+                     LIMIT %s
+                    """,
+                    (last_id, batch_size),
+                )
+                .mappings()
+                .fetchall()
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                self.conn.execute(
+                    """
+                    UPDATE memori_entity_fact
+                       SET content_signature = %s
+                     WHERE id = %s
+                    """,
+                    (
+                        compute_signature(parse_embedding(row["content_embedding"])),
+                        row["id"],
+                    ),
+                )
+
+            self.conn.commit()
+            last_id = rows[-1]["id"]
+
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def backfill_embedding_vectors(self, batch_size: int = 1000):
+        from memori._search import parse_embedding
+
+        last_id = 0
+        while True:
+            rows = (
+                self.conn.execute(
+                    """
+                    SELECT id,
+                           content_embedding
+                      FROM memori_entity_fact
+                     WHERE id > %s
+                       AND content_embedding_vector IS NULL
+                     ORDER BY id
+                     LIMIT %s
+                    """,
+                    (last_id, batch_size),
+                )
+                .mappings()
+                .fetchall()
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                vector = _format_vector(parse_embedding(row["content_embedding"]))
+                if vector is not None:
+                    self.conn.execute(
+                        """
+                        UPDATE memori_entity_fact
+                           SET content_embedding_vector = %s::vector
+                         WHERE id = %s
+                        """,
+                        (vector, row["id"]),
+                    )
+
+            self.conn.commit()
+            last_id = rows[-1]["id"]
+
+        return self
+
+    def has_content_signature(self) -> bool:
+        if self._content_signature is None:
+            self._content_signature = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM information_schema.columns
+                     WHERE table_schema = current_schema()
+                       AND table_name = 'memori_entity_fact'
+                       AND column_name = 'content_signature'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._content_signature
+
+    def has_embedding_vector(self) -> bool:
+        if self._embedding_vector is None:
+            self._embedding_vector = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM information_schema.columns
+                     WHERE table_schema = current_schema()
+                       AND table_name = 'memori_entity_fact'
+                       AND column_name = 'content_embedding_vector'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._embedding_vector
+
+    def has_fulltext(self) -> bool:
+        if self._fulltext is None:
+            self._fulltext = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM information_schema.columns
+                     WHERE table_schema = current_schema()
+                       AND table_name = 'memori_entity_fact'
+                       AND column_name = 'content_tsv'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._fulltext
+
+    def _embeddings_query(
+        self, entity_id: int, limit: int | None, include_content: bool = False
+    ):
+        limit_clause = "" if limit is None else "LIMIT %s"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+        content_column = ", content" if include_content else ""
+
+        query = f"""
+                SELECT id,
+                       content_embedding{content_column}
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                 ORDER BY num_times DESC, date_last_time DESC
+                 {limit_clause}
+                """  # nosec B608: Safe - only interpolating fixed column and LIMIT clauses, actual values parameterized
+        return query, binds
+
+    def get_embeddings(
+        self, entity_id: int, limit: int | None = 1000, include_content: bool = False
+    ):
+        query, binds = self._embeddings_query(entity_id, limit, include_content)
+        return self.conn.execute(query, binds).mappings().fetchall()
+
+    def get_embeddings_after(self, entity_id: int, after_id: int | None, limit: int):
         return (
             self.conn.execute(
                 """
@@ -275,14 +490,54 @@ class EntityFact(BaseEntityFact):
                        content_embedding
                   FROM memori_entity_fact
                  WHERE entity_id = %s
+                   AND id > %s
+                 ORDER BY id
                  LIMIT %s
                 """,
-                (entity_id, limit),
+                (entity_id, after_id or 0, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def get_embedding_stats(self, entity_id: int, until_id: int):
+        return (
+            self.conn.execute(
+                """
+                SELECT COUNT(*) AS count,
+                       MAX(id) AS max_id
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND id <= %s
+                """,
+                (entity_id, until_id),
+            )
+            .mappings()
+            .fetchone()
+        )
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        return (
+            self.conn.execute(
+                """
+                SELECT id,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE id = ANY(%s)
+                """,
+                (fact_ids,),
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embedding_matrix(self, entity_id: int, limit: int | None = 1000):
+        from memori._search import parse_embeddings
+
+        query, binds = self._embeddings_query(entity_id, limit)
+        rows = self.conn.execute(query, binds, binary=True).fetchall()
+        return parse_embeddings([row[0] for row in rows], [row[1] for row in rows])
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         return (
             self.conn.execute(
@@ -298,6 +553,152 @@ class EntityFact(BaseEntityFact):
             .fetchall()
         )
 
+    def get_ids_by_uniq(self, entity_id: int, uniqs: list[str]):
+        return (
+            self.conn.execute(
+                """
+                SELECT id,
+                       uniq
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND uniq = ANY(%s)
+                """,
+                (entity_id, uniqs),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def get_embeddings_by_uniq(self, entity_id: int, uniqs: list[str]):
+        return (
+            self.conn.execute(
+                """
+                SELECT uniq,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND uniq = ANY(%s)
+                """,
+                (entity_id, uniqs),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def get_signatures(self, entity_id: int, limit: int | None = 1000):
+        if not self.has_content_signature():
+            return None
+
+        limit_clause = "" if limit is None else "LIMIT %s"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+
+        return (
+            self.conn.execute(
+                f"""
+                SELECT id,
+                       content_signature
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                 ORDER BY num_times DESC, date_last_time DESC
+                 {limit_clause}
+                """,  # nosec B608: Safe - only interpolating LIMIT clause, actual values parameterized
+                binds,
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def search_lexical(self, entity_id: int, query_text: str, limit: int):
+        from memori._search import lexical_terms
+
+        if not self.has_fulltext():
+            return None
+
+        terms = lexical_terms(query_text)
+        if not terms:
+            return []
+
+        return (
+            self.conn.execute(
+                """
+                SELECT id,
+                       content,
+                       ts_rank(content_tsv, query) AS score
+                  FROM memori_entity_fact,
+                       to_tsquery('simple', %s) AS query
+                 WHERE entity_id = %s
+                   AND content_tsv @@ query
+                 ORDER BY score DESC
+                 LIMIT %s
+                """,
+                (" | ".join(terms), entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
+    def search_similar(self, entity_id: int, query_embedding: list[float], limit: int):
+        query_vector = _format_vector(query_embedding)
+        if query_vector is None or not self.has_embedding_vector():
+            return None
+
+        # The HNSW index yields its ef_search nearest facts across all
+        # entities before the entity filter applies, so for an entity with a
+        # small share of the table it returns fewer than limit rows although
+        # the entity has more. Those searches are repeated exactly, ordered by
+        # an expression the index cannot serve, over just the entity's facts;
+        # entities that simply have fewer facts than limit are not.
+        rows = self._search_similar(
+            entity_id, query_vector, limit, "content_embedding_vector <=> %s::vector"
+        )
+        if len(rows) < limit and self._has_more_vectors(entity_id, len(rows)):
+            rows = self._search_similar(
+                entity_id,
+                query_vector,
+                limit,
+                "(content_embedding_vector <=> %s::vector) + 0",
+            )
+
+        return rows
+
+    def _has_more_vectors(self, entity_id: int, num_rows: int) -> bool:
+        # Counting stops one past num_rows, so large entities are not scanned.
+        row = self.conn.execute(
+            """
+            SELECT COUNT(*)
+              FROM (SELECT 1
+                      FROM memori_entity_fact
+                     WHERE entity_id = %s
+                       AND content_embedding_vector IS NOT NULL
+                     LIMIT %s) AS facts
+            """,
+            (entity_id, num_rows + 1),
+        ).fetchone()
+
+        return row[0] > num_rows
+
+    def _search_similar(
+        self, entity_id: int, query_vector: str, limit: int, order_by: str
+    ):
+        return (
+            self.conn.execute(
+                f"""
+                SELECT id,
+                       content,
+                       content_embedding,
+                       1 - (content_embedding_vector <=> %s::vector) AS similarity
+                  FROM memori_entity_fact
+                 WHERE entity_id = %s
+                   AND content_embedding_vector IS NOT NULL
+                 ORDER BY {order_by}
+                 LIMIT %s
+                """,  # nosec B608: Safe - only interpolating a fixed ORDER BY expression, actual values parameterized
+                (query_vector, entity_id, query_vector, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -618,11 +1019,16 @@ class Driver:
 
     Attributes:
         migrations: Database schema migrations for PostgreSQL-compatible databases.
+        optional_migrations: Opt-in migrations by name; "pgvector" adds a vector
+            column and HNSW index so recall can rank facts on the server, and
+            "signature" adds sign-bit signatures for a Hamming prefilter and
+            "fulltext" adds a tsvector column and GIN index for hybrid recall.
         requires_rollback_on_error: PostgreSQL aborts transactions when a query
             fails and requires an explicit ROLLBACK before executing new queries.
     """
 
     migrations = migrations
+    optional_migrations = optional_migrations
     requires_rollback_on_error = True
 
     def __init__(self, conn: BaseStorageAdapter):
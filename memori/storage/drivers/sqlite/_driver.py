@@ -25,7 +25,7 @@ from memori.storage._base import (
     BaseStorageAdapter,
 )
 from memori.storage._registry import Registry
-from memori.storage.migrations._sqlite import migrations
+from memori.storage.migrations._sqlite import migrations, optional_migrations
 
 
 class Conversation(BaseConversation):
@@ -214,24 +214,62 @@ class Entity(BaseEntity):
 
 
 class EntityFact(BaseEntityFact):
-    def create(self, entity_id: int, facts: list, fact_embeddings: list | None = None):
+    def __init__(self, conn: BaseStorageAdapter):
+        super().__init__(conn)
+        self._content_signature: bool | None = None
+        self._fulltext: bool | None = None
+
+    def create(
+        self,
+        entity_id: int,
+        facts: list,
+        fact_embeddings: list | None = None,
+        embeddings_format: str = "float32",
+    ):
         if facts is None or len(facts) == 0:
             return self
 
+        from memori._search import compute_signature
         from memori._utils import generate_uniq
         from memori.llm._embeddings import format_embedding_for_db
 
+        if self.has_content_signature():
+            signature_column = ", content_signature"
+            signature_value = ", ?"
+            signature_update = """,
+                    content_signature = COALESCE(
+                        content_signature,
+                        excluded.content_signature
+                    )"""
+        else:
+            signature_column = signature_value = signature_update = ""
+
+        uniqs = []
         for i, fact in enumerate(facts):
             embedding = (
                 fact_embeddings[i]
                 if fact_embeddings and i < len(fact_embeddings)
                 else []
             )
-            embedding_formatted = format_embedding_for_db(embedding, "sqlite")
+            embedding_formatted = format_embedding_for_db(
+                embedding, "sqlite", embeddings_format
+            )
             uniq = generate_uniq([fact])
+            uniqs.append(uniq)
+
+            binds: tuple = (
+                str(uuid4()),
+                entity_id,
+                fact,
+                embedding_formatted,
+                1,
+                uniq,
+            )
+            if signature_column:
+                binds += (compute_signature(embedding),)
 
             self.conn.execute(
-                """
+                f"""
                 INSERT INTO memori_entity_fact(
                     uuid,
                     entity_id,
@@ -239,7 +277,7 @@ class EntityFact(BaseEntityFact):
                     content_embedding,
                     num_times,
                     date_last_time,
-                    uniq
+                    uniq{signature_column}
                 ) VALUES (
                     ?,
                     ?,
@@ -247,27 +285,132 @@ class EntityFact(BaseEntityFact):
                     ?,
                     ?,
                     datetime('now'),
-                    ?
+                    ?{signature_value}
                 )
                 ON CONFLICT(entity_id, uniq) DO UPDATE SET
                     num_times = num_times + 1,
-                    date_last_time = datetime('now')
-                """,
-                (
-                    str(uuid4()),
-                    entity_id,
-                    fact,
-                    embedding_formatted,
-                    1,
-                    uniq,
-                ),
+                    date_last_time = datetime('now'){signature_update}
+                """,  # nosec B608: Safe - only interpolating fixed column SQL, actual values parameterized
+                binds,
             )
 
         self.conn.commit()
 
+        self._add_to_index_cache(entity_id, uniqs, fact_embeddings, facts)
+
         return self
 
-    def get_embeddings(self, entity_id: int, limit: int = 1000):
+    def add_content_signature(self):
+        # SQLite cannot add a column only if it is missing, and optional
+        # migrations are not versioned, so check first.
+        if not self.has_content_signature():
+            self.conn.execute(
+                """
+                ALTER TABLE memori_entity_fact
+                  ADD COLUMN content_signature BLOB DEFAULT NULL
+                """
+            )
+            self._content_signature = True
+
+        return self
+
+    def backfill_signatures(self, batch_size: int = 1000):
+        from memori._search import compute_signature, parse_embedding
+
+        last_id = 0
+        while True:
+            rows = (
+                self.conn.execute(
+                    """
+                    SELECT id,
+                           content_embedding
+                      FROM memori_entity_fact
+                     WHERE id > ?
+                       AND content_signature IS NULL
+                     ORDER BY id
+                     LIMIT ?
+                    """,
+                    (last_id, batch_size),
+                )
+                .mappings()
+                .fetchall()
+            )
+            if not rows:
+                break
+
+            for row in rows:
+                self.conn.execute(
+                    """
+                    UPDATE memori_entity_fact
+                       SET content_signature = ?
+                     WHERE id = ?
+                    """,
+                    (
+                        compute_signature(parse_embedding(row["content_embedding"])),
+                        row["id"],
+                    ),
+                )
+
+            self.conn.commit()
+            last_id = rows[-1]["id"]
+
+        return self
+
+    def has_content_signature(self) -> bool:
+        if self._content_signature is None:
+            self._content_signature = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM pragma_table_info('memori_entity_fact')
+                     WHERE name = 'content_signature'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._content_signature
+
+    def has_fulltext(self) -> bool:
+        if self._fulltext is None:
+            self._fulltext = (
+                self.conn.execute(
+                    """
+                    SELECT 1
+                      FROM sqlite_master
+                     WHERE type = 'table'
+                       AND name = 'memori_entity_fact_fts'
+                    """
+                ).fetchone()
+                is not None
+            )
+
+        return self._fulltext
+
+    def _embeddings_query(
+        self, entity_id: int, limit: int | None, include_content: bool = False
+    ):
+        limit_clause = "" if limit is None else "LIMIT ?"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+        content_column = ", content" if include_content else ""
+
+        query = f"""
+                SELECT id,
+                       content_embedding{content_column}
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                 ORDER BY num_times DESC, date_last_time DESC
+                 {limit_clause}
+                """  # nosec B608: Safe - only interpolating fixed column and LIMIT clauses, actual values parameterized
+        return query, binds
+
+    def get_embeddings(
+        self, entity_id: int, limit: int | None = 1000, include_content: bool = False
+    ):
+        query, binds = self._embeddings_query(entity_id, limit, include_content)
+        return self.conn.execute(query, binds).mappings().fetchall()
+
+    def get_embeddings_after(self, entity_id: int, after_id: int | None, limit: int):
         return (
             self.conn.execute(
                 """
@@ -275,14 +418,52 @@ class EntityFact(BaseEntityFact):
                        content_embedding
                   FROM memori_entity_fact
                  WHERE entity_id = ?
+                   AND id > ?
+                 ORDER BY id
                  LIMIT ?
                 """,
-                (entity_id, limit),
+                (entity_id, after_id or 0, limit),
             )
             .mappings()
             .fetchall()
         )
 
+    def get_embedding_stats(self, entity_id: int, until_id: int):
+        return (
+            self.conn.execute(
+                """
+                SELECT COUNT(*) AS count,
+                       MAX(id) AS max_id
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                   AND id <= ?
+                """,
+                (entity_id, until_id),
+            )
+            .mappings()
+            .fetchone()
+        )
+
+    def get_embedding_matrix(self, entity_id: int, limit: int | None = 1000):
+        from memori._search import parse_embeddings
+
+        query, binds = self._embeddings_query(entity_id, limit)
+        rows = self.conn.execute(query, binds).fetchall()
+        return parse_embeddings([row[0] for row in rows], [row[1] for row in rows])
+
+    def get_embeddings_by_ids(self, fact_ids: list[int]):
+        if not fact_ids:
+            return []
+        placeholders = ",".join(["?"] * len(fact_ids))
+
+        query = f"""
+                SELECT id,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE id IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
+
     def get_facts_by_ids(self, fact_ids: list[int]):
         if not fact_ids:
             return []
@@ -296,6 +477,81 @@ class EntityFact(BaseEntityFact):
                 """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
         return self.conn.execute(query, tuple(fact_ids)).mappings().fetchall()
 
+    def get_ids_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+        placeholders = ",".join(["?"] * len(uniqs))
+
+        query = f"""
+                SELECT id,
+                       uniq
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def get_embeddings_by_uniq(self, entity_id: int, uniqs: list[str]):
+        if not uniqs:
+            return []
+        placeholders = ",".join(["?"] * len(uniqs))
+
+        query = f"""
+                SELECT uniq,
+                       content_embedding
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                   AND uniq IN ({placeholders})
+                """  # nosec B608: Safe - only interpolating placeholder count, actual values parameterized
+        return self.conn.execute(query, (entity_id, *uniqs)).mappings().fetchall()
+
+    def get_signatures(self, entity_id: int, limit: int | None = 1000):
+        if not self.has_content_signature():
+            return None
+
+        limit_clause = "" if limit is None else "LIMIT ?"
+        binds = (entity_id,) if limit is None else (entity_id, limit)
+
+        query = f"""
+                SELECT id,
+                       content_signature
+                  FROM memori_entity_fact
+                 WHERE entity_id = ?
+                 ORDER BY num_times DESC, date_last_time DESC
+                 {limit_clause}
+                """  # nosec B608: Safe - only interpolating LIMIT clause, actual values parameterized
+        return self.conn.execute(query, binds).mappings().fetchall()
+
+    def search_lexical(self, entity_id: int, query_text: str, limit: int):
+        from memori._search import lexical_terms
+
+        if not self.has_fulltext():
+            return None
+
+        terms = lexical_terms(query_text)
+        if not terms:
+            return []
+
+        return (
+            self.conn.execute(
+                """
+                SELECT f.id,
+                       f.content,
+                       -bm25(memori_entity_fact_fts) AS score
+                  FROM memori_entity_fact_fts
+                  JOIN memori_entity_fact f
+                    ON f.id = memori_entity_fact_fts.rowid
+                 WHERE memori_entity_fact_fts MATCH ?
+                   AND f.entity_id = ?
+                 ORDER BY score DESC
+                 LIMIT ?
+                """,
+                (" OR ".join(f'"{term}"' for term in terms), entity_id, limit),
+            )
+            .mappings()
+            .fetchall()
+        )
+
 
 class KnowledgeGraph(BaseKnowledgeGraph):
     def create(self, entity_id: int, semantic_triples: list):
@@ -570,11 +826,15 @@ class Driver:
 
     Attributes:
         migrations: Database schema migrations for SQLite.
+        optional_migrations: Opt-in migrations by name; "signature" adds sign-bit
+            signatures for a Hamming prefilter and "fulltext" adds an FTS5 table
+            for hybrid recall.
         requires_rollback_on_error: SQLite does not abort transactions on query
             errors, so no rollback is needed to continue executing queries.
     """
 
     migrations = migrations
+    optional_migrations = optional_migrations
     requires_rollback_on_error = False
 
     def __init__(self, conn: BaseStorageAdapter):
@@ -273,3 +273,30 @@ migrations = {
         },
     ]
 }
+
+
+optional_migrations = {
+    "signature": [
+        {
+            "description": "create index idx_memori_entity_fact_content_signature",
+            "method": "entity_fact.add_content_signature",
+        },
+        {
+            "description": "backfill memori_entity_fact.content_signature",
+            "method": "entity_fact.backfill_signatures",
+        },
+    ],
+    "fulltext": [
+        {
+            "description": "create index idx_memori_entity_fact_content_text",
+            "operations": [
+                {
+                    "collection": "memori_entity_fact",
+                    "method": "create_index",
+                    "args": [[("content", "text")]],
+                    "kwargs": {"name": "idx_memori_entity_fact_content_text"},
+                },
+            ],
+        },
+    ],
+}
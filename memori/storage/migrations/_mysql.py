@@ -276,3 +276,23 @@ migrations = {
         },
     ]
 }
+
+
+optional_migrations = {
+    "signature": [
+        {
+            "description": "add column memori_entity_fact.content_signature",
+            "method": "entity_fact.add_content_signature",
+        },
+        {
+            "description": "backfill memori_entity_fact.content_signature",
+            "method": "entity_fact.backfill_signatures",
+        },
+    ],
+    "fulltext": [
+        {
+            "description": "create index idx_memori_entity_fact_content_fulltext",
+            "method": "entity_fact.add_fulltext",
+        },
+    ],
+}
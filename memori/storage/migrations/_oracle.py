@@ -361,3 +361,29 @@ migrations = {
         },
     ]
 }
+
+
+optional_migrations = {
+    "signature": [
+        {
+            "description": "add column memori_entity_fact.content_signature",
+            "operation": """
+                BEGIN
+                    EXECUTE IMMEDIATE '
+                        ALTER TABLE memori_entity_fact
+                          ADD (content_signature RAW(256) DEFAULT NULL)
+                    ';
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        IF SQLCODE = -1430 THEN NULL;
+                        ELSE RAISE;
+                        END IF;
+                END;
+            """,
+        },
+        {
+            "description": "backfill memori_entity_fact.content_signature",
+            "method": "entity_fact.backfill_signatures",
+        },
+    ]
+}
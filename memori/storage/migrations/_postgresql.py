@@ -266,3 +266,62 @@ migrations = {
         },
     ]
 }
+
+optional_migrations = {
+    "signature": [
+        {
+            "description": "add column memori_entity_fact.content_signature",
+            "operation": """
+                ALTER TABLE memori_entity_fact
+                  ADD COLUMN IF NOT EXISTS content_signature BYTEA DEFAULT NULL
+            """,
+        },
+        {
+            "description": "backfill memori_entity_fact.content_signature",
+            "method": "entity_fact.backfill_signatures",
+        },
+    ],
+    "pgvector": [
+        {
+            "description": "create extension vector",
+            "operation": "CREATE EXTENSION IF NOT EXISTS vector",
+        },
+        {
+            "description": "add column memori_entity_fact.content_embedding_vector",
+            "operation": """
+                ALTER TABLE memori_entity_fact
+                  ADD COLUMN IF NOT EXISTS content_embedding_vector VECTOR(768) DEFAULT NULL
+            """,
+        },
+        {
+            "description": "create index idx_memori_entity_fact_embedding_vector",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_embedding_vector
+                    ON memori_entity_fact
+                 USING hnsw (content_embedding_vector vector_cosine_ops)
+            """,
+        },
+        {
+            "description": "backfill memori_entity_fact.content_embedding_vector",
+            "method": "entity_fact.backfill_embedding_vectors",
+        },
+    ],
+    "fulltext": [
+        {
+            "description": "add column memori_entity_fact.content_tsv",
+            "operation": """
+                ALTER TABLE memori_entity_fact
+                  ADD COLUMN IF NOT EXISTS content_tsv TSVECTOR
+                      GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED
+            """,
+        },
+        {
+            "description": "create index idx_memori_entity_fact_content_tsv",
+            "operation": """
+                CREATE INDEX IF NOT EXISTS idx_memori_entity_fact_content_tsv
+                    ON memori_entity_fact
+                 USING GIN (content_tsv)
+            """,
+        },
+    ],
+}
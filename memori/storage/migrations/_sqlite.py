@@ -276,3 +276,72 @@ migrations = {
         },
     ]
 }
+
+
+optional_migrations = {
+    "signature": [
+        {
+            "description": "add column memori_entity_fact.content_signature",
+            "method": "entity_fact.add_content_signature",
+        },
+        {
+            "description": "backfill memori_entity_fact.content_signature",
+            "method": "entity_fact.backfill_signatures",
+        },
+    ],
+    "fulltext": [
+        {
+            "description": "create virtual table memori_entity_fact_fts",
+            "operation": """
+                CREATE VIRTUAL TABLE IF NOT EXISTS memori_entity_fact_fts
+                 USING fts5(
+                    content,
+                    content='memori_entity_fact',
+                    content_rowid='id'
+                 )
+            """,
+        },
+        {
+            "description": "create trigger tr_memori_entity_fact_fts_insert",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS tr_memori_entity_fact_fts_insert
+                 AFTER INSERT ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts(rowid, content)
+                    VALUES (new.id, new.content);
+                END
+            """,
+        },
+        {
+            "description": "create trigger tr_memori_entity_fact_fts_delete",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS tr_memori_entity_fact_fts_delete
+                 AFTER DELETE ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts(memori_entity_fact_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END
+            """,
+        },
+        {
+            "description": "create trigger tr_memori_entity_fact_fts_update",
+            "operation": """
+                CREATE TRIGGER IF NOT EXISTS tr_memori_entity_fact_fts_update
+                 AFTER UPDATE OF content ON memori_entity_fact
+                BEGIN
+                    INSERT INTO memori_entity_fact_fts(memori_entity_fact_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                    INSERT INTO memori_entity_fact_fts(rowid, content)
+                    VALUES (new.id, new.content);
+                END
+            """,
+        },
+        {
+            "description": "populate memori_entity_fact_fts",
+            "operation": """
+                INSERT INTO memori_entity_fact_fts(memori_entity_fact_fts)
+                VALUES ('rebuild')
+            """,
+        },
+    ],
+}
@@ -1,5 +1,8 @@
 import json
-from unittest.mock import Mock, patch
+import threading
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import numpy as np
 
 from memori._config import Config
 from memori.llm._base import BaseInvoke, BaseLlmAdaptor
@@ -212,6 +215,27 @@ def test_handle_post_response_without_augmentation():
         mock_manager_instance.execute.assert_called_once()
 
 
+async def test_handle_post_response_async_runs_off_event_loop():
+    config = Config()
+    invoke = BaseInvoke(config, "test_method")
+    invoke.set_client("test_provider", "test_title", "1.0.0")
+
+    kwargs = {"messages": [{"role": "user", "content": "Hello"}]}
+    raw_response = {"choices": [{"message": {"content": "Hi"}}]}
+    loop_thread = threading.get_ident()
+    threads = []
+
+    with patch("memori.memory._manager.Manager") as mock_memory_manager:
+        mock_memory_manager.return_value.execute.side_effect = lambda payload: (
+            threads.append(threading.get_ident())
+        )
+
+        await invoke.handle_post_response_async(kwargs, 1234567890.0, raw_response)
+
+    assert len(threads) == 1
+    assert threads[0] != loop_thread
+
+
 def test_handle_post_response_with_augmentation_no_conversation():
     config = Config()
     config.augmentation = Mock()
@@ -315,6 +339,7 @@ def test_inject_recalled_facts_no_storage():
 def test_inject_recalled_facts_no_entity_id():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.entity_id = None
     invoke = BaseInvoke(config, "test_method")
 
@@ -327,6 +352,7 @@ def test_inject_recalled_facts_no_entity_id():
 def test_inject_recalled_facts_entity_create_returns_none():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = None
     config.entity_id = "test-entity"
@@ -341,6 +367,7 @@ def test_inject_recalled_facts_entity_create_returns_none():
 def test_inject_recalled_facts_no_user_query():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -355,6 +382,7 @@ def test_inject_recalled_facts_no_user_query():
 def test_inject_recalled_facts_no_facts_found():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -373,6 +401,7 @@ def test_inject_recalled_facts_no_facts_found():
 def test_inject_recalled_facts_no_relevant_facts():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -393,6 +422,7 @@ def test_inject_recalled_facts_no_relevant_facts():
 def test_inject_recalled_facts_success():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -417,6 +447,7 @@ def test_inject_recalled_facts_success():
 def test_inject_recalled_facts_filters_by_relevance():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -439,6 +470,7 @@ def test_inject_recalled_facts_filters_by_relevance():
 def test_inject_recalled_facts_extends_existing_system_message():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -470,6 +502,7 @@ def test_inject_recalled_facts_extends_existing_system_message():
 def test_inject_recalled_facts_creates_system_message_when_none_exists():
     config = Config()
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.entity.create.return_value = 1
     config.entity_id = "test-entity"
@@ -492,6 +525,194 @@ def test_inject_recalled_facts_creates_system_message_when_none_exists():
     assert "Relevant context about the user" in result["messages"][0]["content"]
 
 
+def test_inject_recalled_facts_token_budget():
+    config = Config()
+    config.storage = Mock()
+    config.storage.lock = threading.Lock()
+    config.storage.driver = Mock()
+    config.storage.driver.entity.create.return_value = 1
+    config.entity_id = "test-entity"
+    config.recall_context_max_tokens = 1000
+    config.recall_context_max_tokens_by_model = {"gpt-4o-mini": 42}
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "What do I like?"}],
+    }
+
+    with patch("memori.memory.recall.Recall") as mock_recall:
+        mock_recall.return_value.search_facts.return_value = [
+            {"id": 1, "content": "User likes pizza", "similarity": 0.9},
+            {"id": 2, "content": "User likes coding", "similarity": 0.85},
+        ]
+        result = invoke.inject_recalled_facts(kwargs)
+
+    content = result["messages"][0]["content"]
+    assert "User likes pizza" in content
+    assert "User likes coding" not in content
+    assert 0 < config.cache.recall_context_tokens <= 42
+
+
+def test_inject_recalled_facts_token_budget_by_provider():
+    config = Config()
+    config.llm.provider = OPENAI_LLM_PROVIDER
+    config.recall_context_max_tokens_by_model = {OPENAI_LLM_PROVIDER: 10}
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}]}
+
+    assert invoke._recall_context_max_tokens(kwargs) == 10
+    config.llm.provider = None
+    assert invoke._recall_context_max_tokens(kwargs) is None
+
+
+def test_inject_recalled_facts_removes_near_duplicates():
+    config = Config()
+    config.storage = Mock()
+    config.storage.lock = threading.Lock()
+    config.storage.driver = Mock()
+    config.storage.driver.entity.create.return_value = 1
+    config.entity_id = "test-entity"
+    config.recall_context_dedup_threshold = 0.95
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "What do I like?"}]}
+
+    with patch("memori.memory.recall.Recall") as mock_recall:
+        mock_recall.return_value.search_facts.return_value = [
+            {
+                "id": 1,
+                "content": "User likes pizza",
+                "similarity": 0.9,
+                "embedding": np.array([1.0, 0.0], dtype=np.float32),
+            },
+            {
+                "id": 2,
+                "content": "User loves pizza",
+                "similarity": 0.85,
+                "embedding": np.array([0.99, 0.01], dtype=np.float32),
+            },
+            {"id": 3, "content": "Irrelevant fact", "similarity": 0.05},
+        ]
+        result = invoke.inject_recalled_facts(kwargs)
+
+    content = result["messages"][0]["content"]
+    assert "User likes pizza" in content
+    assert "User loves pizza" not in content
+    mock_recall.return_value.search_facts.assert_called_once_with(
+        "What do I like?", entity_id=1, include_embeddings=True
+    )
+    config.storage.driver.entity_fact.get_embeddings_by_ids.assert_not_called()
+
+
+def test_inject_recalled_facts_fetches_missing_embeddings():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.storage.lock = threading.Lock()
+    config.storage.driver.entity.create.return_value = 1
+    config.storage.driver.entity_fact.get_embeddings_by_ids.return_value = [
+        {"id": 2, "content_embedding": [0.99, 0.01]},
+    ]
+    config.entity_id = "test-entity"
+    config.recall_context_dedup_threshold = 0.95
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "What do I like?"}]}
+
+    with patch("memori.memory.recall.Recall") as mock_recall:
+        mock_recall.return_value.search_facts.return_value = [
+            {
+                "id": 1,
+                "content": "User likes pizza",
+                "similarity": 0.9,
+                "embedding": np.array([1.0, 0.0], dtype=np.float32),
+            },
+            {"id": 2, "content": "User loves pizza", "similarity": 0.85},
+        ]
+        result = invoke.inject_recalled_facts(kwargs)
+
+    content = result["messages"][0]["content"]
+    assert "User likes pizza" in content
+    assert "User loves pizza" not in content
+    config.storage.driver.entity_fact.get_embeddings_by_ids.assert_called_once_with([2])
+
+
+def test_inject_recalled_facts_resets_context_tokens():
+    config = Config()
+    config.storage = Mock()
+    config.storage.lock = threading.Lock()
+    config.storage.driver = Mock()
+    config.entity_id = "test-entity"
+    config.cache.recall_context_tokens = 42
+    invoke = BaseInvoke(config, "test_method")
+
+    result = invoke.inject_recalled_facts({"messages": []})
+
+    assert result == {"messages": []}
+    assert config.cache.recall_context_tokens == 0
+
+
+async def test_inject_recalled_facts_async_no_entity_id():
+    config = Config()
+    config.storage = MagicMock()
+    config.entity_id = None
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "Hello"}]}
+
+    with patch("memori.memory.recall.Recall") as mock_recall:
+        result = await invoke.inject_recalled_facts_async(kwargs)
+
+    assert result == kwargs
+    mock_recall.assert_not_called()
+
+
+async def test_inject_recalled_facts_async_success():
+    config = Config()
+    config.storage = MagicMock()
+    config.entity_id = "test-entity"
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "What do I like?"}]}
+
+    with patch("memori.memory.recall.Recall") as mock_recall:
+        mock_recall.return_value.search_facts_async = AsyncMock(
+            return_value=[{"content": "User likes pizza", "similarity": 0.9}]
+        )
+        result = await invoke.inject_recalled_facts_async(kwargs)
+
+    mock_recall.return_value.search_facts_async.assert_awaited_once_with(
+        "What do I like?", include_embeddings=False
+    )
+    assert len(result["messages"]) == 2
+    assert result["messages"][0]["role"] == "system"
+    assert "User likes pizza" in result["messages"][0]["content"]
+    config.storage.driver.entity.create.assert_not_called()
+
+
+async def test_inject_conversation_messages_async_openai_success():
+    config = Config()
+    config.cache.conversation_id = 123
+    config.llm.provider = OPENAI_LLM_PROVIDER
+    config.storage = MagicMock()
+    config.storage.driver.conversation.messages.read.return_value = [
+        {"role": "user", "content": "Previous question"},
+        {"role": "assistant", "content": "Previous answer"},
+    ]
+    invoke = BaseInvoke(config, "test_method")
+
+    kwargs = {"messages": [{"role": "user", "content": "New question"}]}
+    result = await invoke.inject_conversation_messages_async(kwargs)
+
+    config.storage.driver.conversation.messages.read.assert_called_once_with(123)
+    config.storage.lock.__enter__.assert_called_once()
+    assert len(result["messages"]) == 3
+    assert result["messages"][2]["content"] == "New question"
+    assert invoke._injected_message_count == 2
+
+
 def test_inject_conversation_messages_no_conversation_id():
     config = Config()
     config.cache.conversation_id = None
@@ -519,6 +740,7 @@ def test_inject_conversation_messages_no_messages():
     config = Config()
     config.cache.conversation_id = 123
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.conversation.messages.read.return_value = []
     invoke = BaseInvoke(config, "test_method")
@@ -535,6 +757,7 @@ def test_inject_conversation_messages_openai_success():
     config.cache.conversation_id = 123
     config.llm.provider = OPENAI_LLM_PROVIDER
     config.storage = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver = Mock()
     config.storage.driver.conversation.messages.read.return_value = [
         {"role": "user", "content": "Previous question"},
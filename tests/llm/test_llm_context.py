@@ -0,0 +1,68 @@
+import numpy as np
+
+from memori.llm._context import (
+    estimate_tokens,
+    format_recall_context,
+    pack_facts,
+)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_format_recall_context():
+    context = format_recall_context([{"content": "User likes pizza"}])
+
+    assert context.startswith("\n\n<memori_context>\n")
+    assert "- User likes pizza" in context
+    assert context.endswith("</memori_context>")
+
+
+def test_pack_facts_without_budget():
+    facts = [
+        {"id": 1, "content": "User likes coding", "similarity": 0.5},
+        {"id": 2, "content": "User likes pizza", "similarity": 0.9},
+    ]
+
+    assert [fact["id"] for fact in pack_facts(facts)] == [2, 1]
+
+
+def test_pack_facts_within_budget():
+    facts = [
+        {"id": 1, "content": "x" * 200, "similarity": 0.9},
+        {"id": 2, "content": "User likes pizza", "similarity": 0.8},
+        {"id": 3, "content": "User likes coding", "similarity": 0.7},
+    ]
+    overhead = estimate_tokens(format_recall_context([]))
+
+    picked = pack_facts(facts, max_tokens=overhead + 10)
+
+    assert [fact["id"] for fact in picked] == [2, 3]
+    assert estimate_tokens(format_recall_context(picked)) <= overhead + 10
+
+
+def test_pack_facts_budget_too_small():
+    facts = [{"id": 1, "content": "User likes pizza", "similarity": 0.9}]
+
+    assert pack_facts(facts, max_tokens=5) == []
+
+
+def test_pack_facts_removes_near_duplicates():
+    facts = [
+        {"id": 1, "content": "User likes pizza", "similarity": 0.9},
+        {"id": 2, "content": "User loves pizza", "similarity": 0.8},
+        {"id": 3, "content": "User lives in Paris", "similarity": 0.7},
+    ]
+    embeddings = {
+        1: np.array([1.0, 0.0], dtype=np.float32),
+        2: np.array([2.0, 0.1], dtype=np.float32),
+        3: np.array([0.0, 1.0], dtype=np.float32),
+    }
+
+    picked = pack_facts(facts, embeddings=embeddings, dedup_threshold=0.95)
+
+    assert [fact["id"] for fact in picked] == [1, 3]
+    assert len(pack_facts(facts, embeddings=embeddings)) == 3
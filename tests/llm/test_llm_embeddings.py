@@ -8,20 +8,48 @@ r"""
                       memorilabs.ai
 """
 
+import json
 import struct
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import numpy as np
 import pytest
 
+from memori._config import Config
+from memori.llm import _embeddings
 from memori.llm._embeddings import (
+    EmbeddingCache,
+    EmbeddingOptions,
+    _encode_in_pool_worker,
     _get_model,
+    _read_pool_result,
     embed_texts,
+    embed_texts_array,
     embed_texts_async,
     format_embedding_for_db,
+    get_embedding_cache,
+    get_embedding_options,
+    get_embedding_pool,
+    get_embedding_service,
+    load_encoder,
+    register_embedding_backend,
+    warm_up_embeddings,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_embedding_cache():
+    get_embedding_cache().clear()
+    yield
+    get_embedding_cache().clear()
+
+
 def test_format_embedding_for_db_mysql():
     embedding = [1.0, 2.0, 3.0]
     result = format_embedding_for_db(embedding, "mysql")
@@ -54,6 +82,15 @@ def test_format_embedding_for_db_sqlite():
     assert list(unpacked) == pytest.approx(embedding)
 
 
+def test_format_embedding_for_db_float16():
+    from memori._search import parse_embedding
+
+    result = format_embedding_for_db([1.0, 2.0, 3.0], "sqlite", "float16")
+    assert isinstance(result, bytes)
+    assert len(result) == 8 + 3 * 2
+    assert parse_embedding(result).tolist() == [1.0, 2.0, 3.0]
+
+
 def test_format_embedding_for_db_mongodb(mocker):
     embedding = [1.0, 2.0, 3.0]
     # Mock bson.Binary to test MongoDB path
@@ -106,7 +143,7 @@ def test_format_embedding_for_db_high_dimensional():
 
 
 def test_get_model_caches_model():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model = Mock()
         mock_transformer.return_value = mock_model
 
@@ -118,7 +155,7 @@ def test_get_model_caches_model():
 
 
 def test_get_model_different_models():
-    with patch("memori.llm._embeddings.SentenceTransformer") as mock_transformer:
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
         mock_model_1 = Mock()
         mock_model_2 = Mock()
         mock_transformer.side_effect = [mock_model_1, mock_model_2]
@@ -200,7 +237,7 @@ def test_embed_texts_custom_model():
 
         result = embed_texts("test", model="custom-model")
 
-        mock_get_model.assert_called_once_with("custom-model")
+        mock_get_model.assert_called_once_with("custom-model", get_embedding_options())
         assert len(result) == 1
 
 
@@ -265,7 +302,7 @@ def test_embed_texts_model_load_value_error():
 
 @pytest.mark.asyncio
 async def test_embed_texts_async_single_string():
-    mock_result = [[0.1, 0.2, 0.3]]
+    mock_result = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -281,7 +318,7 @@ async def test_embed_texts_async_single_string():
 
 @pytest.mark.asyncio
 async def test_embed_texts_async_list():
-    mock_result = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+    mock_result = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -298,7 +335,7 @@ async def test_embed_texts_async_list():
 
 @pytest.mark.asyncio
 async def test_embed_texts_async_custom_model():
-    mock_result = [[0.1, 0.2, 0.3]]
+    mock_result = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
 
     async def mock_run_in_executor(executor, func, *args):
         return mock_result
@@ -310,3 +347,591 @@ async def test_embed_texts_async_custom_model():
 
         assert len(result) == 1
         assert result[0] == pytest.approx([0.1, 0.2, 0.3])
+
+
+def test_embed_texts_uses_cache():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [
+            np.array([[0.1, 0.2, 0.3]]),
+            np.array([[0.4, 0.5, 0.6]]),
+        ]
+        mock_get_model.return_value = mock_model
+
+        first = embed_texts("Hello  world")
+        second = embed_texts(["hello", " Hello world "])
+
+        assert first[0] == pytest.approx([0.1, 0.2, 0.3])
+        assert second[0] == pytest.approx([0.4, 0.5, 0.6])
+        assert second[1] == pytest.approx([0.1, 0.2, 0.3])
+        assert mock_model.encode.call_args_list[1][0][0] == ["hello"]
+
+    assert get_embedding_cache().hits == 1
+    assert get_embedding_cache().misses == 2
+
+
+def test_embed_texts_cache_keyed_by_model():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.side_effect = [
+            np.array([[0.1, 0.2, 0.3]]),
+            np.array([[0.4, 0.5, 0.6]]),
+        ]
+        mock_get_model.return_value = mock_model
+
+        embed_texts("Hello", model="model-1")
+        result = embed_texts("Hello", model="model-2")
+
+        assert result[0] == pytest.approx([0.4, 0.5, 0.6])
+        assert mock_model.encode.call_count == 2
+
+
+def test_embed_texts_encodes_duplicates_once():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_model = Mock()
+        mock_model.encode.return_value = np.array([[0.1, 0.2, 0.3]])
+        mock_get_model.return_value = mock_model
+
+        result = embed_texts(["Hello", "Hello"])
+
+        assert len(result) == 2
+        mock_model.encode.assert_called_once_with(["Hello"], convert_to_numpy=True)
+
+
+def test_embed_texts_does_not_cache_failures():
+    with patch("memori.llm._embeddings._get_model") as mock_get_model:
+        mock_get_model.side_effect = OSError("Model not found")
+
+        embed_texts("Hello")
+
+    assert len(get_embedding_cache().entries) == 0
+
+
+def test_embedding_cache_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("model", "a", [1.0])
+    cache.put("model", "b", [2.0])
+    cache.get("model", "a")
+    cache.put("model", "c", [3.0])
+
+    assert cache.get("model", "a") == [1.0]
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "c") == [3.0]
+
+
+def test_embedding_cache_disabled():
+    cache = EmbeddingCache(max_entries=0)
+    cache.put("model", "a", [1.0])
+
+    assert cache.get("model", "a") is None
+    assert cache.misses == 1
+
+
+def test_embedding_cache_get_array_is_read_only():
+    cache = EmbeddingCache()
+    cache.put("model", "a", [1.0, 2.0])
+
+    embedding = cache.get_array("model", "a")
+
+    assert embedding.dtype == np.float32
+    assert not embedding.flags.writeable
+    assert cache.hits == 1
+
+
+def test_embed_texts_array():
+    mock_model = Mock()
+    mock_model.encode.return_value = np.array(
+        [[0.5, 0.25], [1.0, 2.0]], dtype=np.float32
+    )
+
+    with patch("memori.llm._embeddings._get_model", return_value=mock_model):
+        result = embed_texts_array(["Hello", "", "World", "Hello"])
+
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.float32
+    assert result.tolist() == [[0.5, 0.25], [1.0, 2.0], [0.5, 0.25]]
+    mock_model.encode.assert_called_once_with(["Hello", "World"], convert_to_numpy=True)
+
+
+def test_embed_texts_array_empty():
+    result = embed_texts_array([])
+
+    assert result.shape == (0, 768)
+    assert embed_texts([]) == []
+
+
+def test_embed_texts_array_zeros_on_failure():
+    with patch("memori.llm._embeddings._get_model", side_effect=OSError("offline")):
+        result = embed_texts_array(["Hello"])
+
+    assert result.dtype == np.float32
+    assert result.shape == (1, 768)
+    assert not result.any()
+
+
+@pytest.fixture
+def embedding_options():
+    options = get_embedding_options()
+    yield options
+    options.backend = "sentence-transformers"
+    options.batch_max_size = None
+    options.batch_secs_max_wait = 0.005
+    options.process_threads = None
+    options.processes = None
+    get_embedding_pool().shutdown()
+    _embeddings._MODEL_CACHE.clear()
+
+
+def test_embedding_options_configure(embedding_options):
+    config = Config()
+    config.embeddings_backend = "onnx-int8"
+
+    assert embedding_options.configure(config) is embedding_options
+    assert embedding_options.backend == "onnx-int8"
+    assert embedding_options.model_key("m") == "onnx-int8:m"
+
+    config.embeddings_backend = "sentence-transformers"
+    assert embedding_options.configure(config).model_key("m") == "m"
+
+
+def test_embedding_options_rejects_unknown_backend(embedding_options):
+    config = Config()
+    config.embeddings_backend = "tensorrt"
+
+    with pytest.raises(ValueError, match="Unsupported embeddings backend"):
+        embedding_options.configure(config)
+
+    assert embedding_options.backend == "sentence-transformers"
+
+
+def test_load_encoder_onnx():
+    with patch("sentence_transformers.SentenceTransformer") as mock_transformer:
+        load_encoder("test-model", "onnx")
+        mock_transformer.assert_called_once_with("test-model", backend="onnx")
+
+
+def test_load_encoder_onnx_int8():
+    with (
+        patch("sentence_transformers.SentenceTransformer") as mock_transformer,
+        patch("memori.llm._embeddings.platform.machine", return_value="aarch64"),
+    ):
+        load_encoder("test-model", "onnx-int8")
+        mock_transformer.assert_called_once_with(
+            "test-model",
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_qint8_arm64.onnx"},
+        )
+
+
+def test_load_encoder_unknown_backend():
+    with pytest.raises(ValueError):
+        load_encoder("test-model", "tensorrt")
+
+
+def test_register_embedding_backend(embedding_options):
+    encoder = Mock()
+    encoder.encode.return_value = np.array([[0.5, 0.5]], dtype=np.float32)
+
+    @register_embedding_backend("test-backend")
+    def load(model_name):
+        return encoder
+
+    embedding_options.backend = "test-backend"
+
+    assert _get_model("test-model") is encoder
+    assert embed_texts("Hello", model="test-model") == [[0.5, 0.5]]
+    assert get_embedding_cache().get("test-backend:test-model", "Hello") == [
+        0.5,
+        0.5,
+    ]
+    _embeddings._BACKENDS.pop("test-backend")
+
+
+@pytest.fixture
+def embedding_service(embedding_options):
+    embedding_options.batch_max_size = 8
+    embedding_options.batch_secs_max_wait = 0.05
+    return get_embedding_service()
+
+
+def _length_encoder():
+    encoder = Mock()
+    encoder.encode.side_effect = lambda texts, **kwargs: np.array(
+        [[float(len(text)), 1.0] for text in texts], dtype=np.float32
+    )
+    return encoder
+
+
+def test_embedding_options_configure_batching(embedding_options):
+    config = Config()
+    config.embeddings_batch_max_size = 64
+    config.embeddings_batch_secs_max_wait = 0.01
+
+    embedding_options.configure(config)
+
+    assert embedding_options.batch_max_size == 64
+    assert embedding_options.batch_secs_max_wait == 0.01
+    assert embedding_options.batched
+
+
+def test_embedding_service_disabled_by_default():
+    assert not get_embedding_options().batched
+
+
+def test_embedding_service_coalesces_callers(embedding_service):
+    encoder = _length_encoder()
+
+    with patch("memori.llm._embeddings._get_model", return_value=encoder):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(embed_texts, texts, "test-model")
+                for texts in (["ccc", "a"], ["bb"], ["a"])
+            ]
+            results = [future.result() for future in futures]
+
+    assert results == [[[3.0, 1.0], [1.0, 1.0]], [[2.0, 1.0]], [[1.0, 1.0]]]
+    encoder.encode.assert_called_once_with(
+        ["a", "bb", "ccc"], batch_size=8, convert_to_numpy=True
+    )
+
+
+def test_embedding_service_encode_failure(embedding_service):
+    encoder = Mock()
+    encoder.encode.side_effect = RuntimeError("Encoding failed")
+
+    with patch("memori.llm._embeddings._get_model", return_value=encoder):
+        result = embed_texts(["Hello"], model="test-model")
+
+    assert result == [[0.0] * 768]
+
+
+async def test_embed_texts_async_embedding_service(embedding_service):
+    encoder = _length_encoder()
+
+    with patch("memori.llm._embeddings._get_model", return_value=encoder):
+        result = await embed_texts_async(["Hello", "Hi"], model="test-model")
+        cached = await embed_texts_async("Hello", model="test-model")
+
+    assert result == [[5.0, 1.0], [2.0, 1.0]]
+    assert cached == [[5.0, 1.0]]
+    encoder.encode.assert_called_once()
+
+
+def test_get_model_loads_once_under_concurrency(embedding_options):
+    started = threading.Barrier(8)
+
+    def load(model_name, backend):
+        time.sleep(0.05)
+        return Mock()
+
+    def get():
+        started.wait()
+        return _get_model("test-model")
+
+    with patch("memori.llm._embeddings.load_encoder", side_effect=load) as mock_load:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(lambda _: get(), range(8)))
+
+    mock_load.assert_called_once_with("test-model", "sentence-transformers")
+    assert all(model is models[0] for model in models)
+
+
+def test_warm_up_embeddings(embedding_options):
+    encoder = Mock()
+
+    with patch("memori.llm._embeddings.load_encoder", return_value=encoder):
+        thread = warm_up_embeddings("test-model")
+        thread.join(timeout=5)
+
+        assert thread.daemon
+        encoder.encode.assert_called_once_with(["warm up"], convert_to_numpy=True)
+        assert _get_model("test-model") is encoder
+
+
+def test_warm_up_embeddings_ignores_failures(embedding_options):
+    with patch(
+        "memori.llm._embeddings.load_encoder", side_effect=OSError("offline")
+    ) as mock_load:
+        thread = warm_up_embeddings("test-model")
+        thread.join(timeout=5)
+
+        mock_load.assert_called_once()
+        assert not thread.is_alive()
+
+
+@pytest.fixture
+def embedding_pool(embedding_options):
+    embedding_options.processes = 2
+
+    def executor(max_workers, mp_context, initializer, initargs):
+        return ThreadPoolExecutor(
+            max_workers, initializer=initializer, initargs=initargs
+        )
+
+    with patch("memori.llm._embeddings.ProcessPoolExecutor", side_effect=executor):
+        yield get_embedding_pool()
+
+
+def test_warm_up_embeddings_embedding_pool(embedding_pool):
+    encoder = _length_encoder()
+
+    with (
+        patch("memori.llm._embeddings.load_encoder", return_value=encoder),
+        patch(
+            "memori.llm._embeddings._get_model", wraps=_embeddings._get_model
+        ) as mock_get_model,
+        patch.object(
+            embedding_pool, "_submit_chunk", wraps=embedding_pool._submit_chunk
+        ) as mock_submit_chunk,
+    ):
+        thread = warm_up_embeddings("test-model")
+        thread.join(timeout=5)
+
+    assert mock_submit_chunk.call_count == 2
+    assert all(
+        call.args[:3] == (["warm up"], "test-model", 1)
+        for call in mock_submit_chunk.call_args_list
+    )
+    assert mock_get_model.call_count == 2
+    assert encoder.encode.call_count == 2
+
+
+def test_embedding_options_configure_processes(embedding_options):
+    config = Config()
+    config.embeddings_processes = 4
+    config.embeddings_process_threads = 2
+
+    embedding_options.configure(config)
+
+    assert embedding_options.processes == 4
+    assert embedding_options.process_threads == 2
+    assert embedding_options.pooled
+
+
+def test_embedding_pool_disabled_by_default(embedding_options):
+    assert not embedding_options.pooled
+
+
+def test_encode_in_pool_worker_round_trips_shared_memory():
+    with patch("memori.llm._embeddings._get_model", return_value=_length_encoder()):
+        name, shape = _encode_in_pool_worker(["a", "bbb"], "test-model", 16)
+
+    result = _read_pool_result(name, shape)
+
+    assert result.dtype == np.float32
+    assert result.tolist() == [[1.0, 1.0], [3.0, 1.0]]
+
+
+def test_embed_texts_embedding_pool(embedding_pool):
+    encoder = _length_encoder()
+
+    with patch("memori.llm._embeddings.load_encoder", return_value=encoder):
+        result = embed_texts(["Hello", "Hi", "Hello"], model="test-model")
+        cached = embed_texts("Hi", model="test-model")
+
+    assert result == [[5.0, 1.0], [2.0, 1.0], [5.0, 1.0]]
+    assert cached == [[2.0, 1.0]]
+    encoder.encode.assert_called_once_with(
+        ["Hello", "Hi"], batch_size=32, convert_to_numpy=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_async_embedding_pool(embedding_pool):
+    encoder = _length_encoder()
+
+    with patch("memori.llm._embeddings.load_encoder", return_value=encoder):
+        result = await embed_texts_async(["Hello", "Hi"], model="test-model")
+
+    assert result == [[5.0, 1.0], [2.0, 1.0]]
+
+
+def test_embed_texts_embedding_pool_error_returns_zeros(embedding_pool):
+    with patch("memori.llm._embeddings.load_encoder", side_effect=OSError("offline")):
+        result = embed_texts(["Hello"], model="test-model")
+
+    assert result == [[0.0] * 768]
+
+
+def test_embedding_pool_keeps_a_pool_per_options(embedding_pool, embedding_options):
+    with patch("memori.llm._embeddings.load_encoder", return_value=_length_encoder()):
+        embedding_pool.submit(["a"], "test-model").result()
+        executor = embedding_pool.executors[(2, None)]
+
+        embedding_pool.submit(["a"], "test-model").result()
+        assert embedding_pool.executors == {(2, None): executor}
+
+        options = EmbeddingOptions()
+        options.processes = 3
+        embedding_pool.submit(["a"], "test-model", options=options).result()
+        assert embedding_pool.executors[(2, None)] is executor
+        assert embedding_pool.executors[(3, None)] is not executor
+
+
+def test_embedding_service_uses_embedding_pool(embedding_pool, embedding_options):
+    embedding_options.batch_max_size = 8
+    encoder = _length_encoder()
+
+    with patch("memori.llm._embeddings.load_encoder", return_value=encoder):
+        result = embed_texts(["Hello", "Hi"], model="test-model")
+
+    assert result == [[5.0, 1.0], [2.0, 1.0]]
+    encoder.encode.assert_called_once_with(
+        ["Hi", "Hello"], batch_size=8, convert_to_numpy=True
+    )
+
+
+def test_embedding_pool_splits_large_calls_across_workers(embedding_pool):
+    encoder = _length_encoder()
+    texts = [str(i) * (i % 5 + 1) for i in range(40)]
+
+    with patch("memori.llm._embeddings.load_encoder", return_value=encoder):
+        result = embedding_pool.submit(texts, "test-model", 8).result()
+
+    assert result.tolist() == [[float(len(text)), 1.0] for text in texts]
+    assert [len(call.args[0]) for call in encoder.encode.call_args_list] == [
+        20,
+        20,
+    ]
+
+
+def test_embedding_service_encodes_models_in_parallel(
+    embedding_pool, embedding_options
+):
+    started = []
+    release = threading.Event()
+
+    def load(model_name, *args):
+        def encode(texts, **kwargs):
+            started.append(model_name)
+            release.wait(5)
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+        return Mock(encode=Mock(side_effect=encode))
+
+    batch = [
+        (["a"], "model-a", embedding_options, Future()),
+        (["b"], "model-b", embedding_options, Future()),
+    ]
+    with patch("memori.llm._embeddings.load_encoder", side_effect=load):
+        worker = threading.Thread(
+            target=get_embedding_service()._encode_batch, args=(batch,)
+        )
+        worker.start()
+        deadline = time.monotonic() + 5
+        while len(started) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        worker.join(5)
+
+    assert sorted(started) == ["model-a", "model-b"]
+    assert [future.result(5).shape for *_, future in batch] == [(1, 2), (1, 2)]
+
+
+_REAL_POOL_SCRIPT = """
+import json
+import os
+import time
+
+import numpy as np
+
+from memori._config import Config
+from memori.llm import _embeddings
+
+
+class Encoder:
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        time.sleep(1)
+        return np.array(
+            [[float(len(text)), float(os.getpid())] for text in texts],
+            dtype=np.float32,
+        )
+
+
+_embeddings.register_embedding_backend("test-pool")(lambda model_name: Encoder())
+
+if __name__ == "__main__":
+    config = Config()
+    config.embeddings_backend = "test-pool"
+    config.embeddings_processes = 2
+    _embeddings.get_embedding_options().configure(config)
+    texts = ["x" * (i % 7 + 1) for i in range(64)]
+    try:
+        result = _embeddings.get_embedding_pool().submit(texts, "test-model").result()
+    finally:
+        _embeddings.get_embedding_pool().shutdown()
+    print(json.dumps({
+        "parent": os.getpid(),
+        "lengths": [row[0] for row in result.tolist()],
+        "expected": [float(len(text)) for text in texts],
+        "workers": sorted({int(row[1]) for row in result.tolist()}),
+    }))
+"""
+
+
+def test_embedding_pool_real_processes(tmp_path):
+    script = tmp_path / "pool_check.py"
+    script.write_text(textwrap.dedent(_REAL_POOL_SCRIPT))
+
+    completed = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert result["lengths"] == result["expected"]
+    assert len(result["workers"]) == 2
+    assert result["parent"] not in result["workers"]
+
+
+def test_embed_texts_options_are_independent(embedding_options):
+    encoders = {}
+
+    def load(model_name, backend):
+        encoders[backend] = _length_encoder()
+        return encoders[backend]
+
+    onnx = EmbeddingOptions()
+    onnx.backend = "onnx"
+
+    with patch("memori.llm._embeddings.load_encoder", side_effect=load):
+        embed_texts("Hello", model="test-model", options=onnx)
+        embed_texts("Hello", model="test-model")
+
+    assert embedding_options.backend == "sentence-transformers"
+    assert sorted(encoders) == ["onnx", "sentence-transformers"]
+    for encoder in encoders.values():
+        encoder.encode.assert_called_once()
+
+
+def test_embedding_service_batches_options_separately(embedding_service):
+    encoders = {}
+
+    def load(model_name, backend):
+        encoders[backend] = _length_encoder()
+        return encoders[backend]
+
+    onnx = EmbeddingOptions()
+    onnx.backend = "onnx"
+    onnx.batch_max_size = 8
+    batch = [
+        (["a"], "test-model", get_embedding_options(), Future()),
+        (["bb"], "test-model", onnx, Future()),
+    ]
+
+    with patch("memori.llm._embeddings.load_encoder", side_effect=load):
+        embedding_service._encode_batch(batch)
+
+    assert [future.result().tolist() for *_, future in batch] == [
+        [[1.0, 1.0]],
+        [[2.0, 1.0]],
+    ]
+    encoders["sentence-transformers"].encode.assert_called_once_with(
+        ["a"], batch_size=8, convert_to_numpy=True
+    )
+    encoders["onnx"].encode.assert_called_once_with(
+        ["bb"], batch_size=8, convert_to_numpy=True
+    )
@@ -1,5 +1,7 @@
-from unittest.mock import Mock, patch
+import sqlite3
+from unittest.mock import ANY, Mock, patch
 
+import numpy as np
 import pytest
 
 from memori._config import Config
@@ -149,7 +151,7 @@ async def test_process_api_response_dict_to_memories(augmentation):
     }
 
     with patch(
-        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_async"
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
     ) as mock_embed:
         mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
 
@@ -191,7 +193,7 @@ async def test_process_api_response_triples_to_facts(augmentation):
     }
 
     with patch(
-        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_async"
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
     ) as mock_embed:
         mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
 
@@ -214,6 +216,7 @@ async def test_schedule_entity_writes(augmentation, driver, augmentation_input):
 
     assert len(ctx.writes) == 1
     assert ctx.writes[0]["method_path"] == "entity_fact.create"
+    assert ctx.writes[0]["kwargs"] == {"embeddings_format": "float32"}
 
 
 @pytest.mark.asyncio
@@ -277,3 +280,89 @@ async def test_schedule_writes_skips_if_no_data(
     augmentation._schedule_conversation_writes(ctx, memories)
 
     assert len(ctx.writes) == 0
+
+
+@pytest.mark.asyncio
+async def test_embed_facts_reuses_stored_embeddings(augmentation, driver):
+    import struct
+
+    from memori._utils import generate_uniq
+
+    driver.entity_fact.get_embeddings_by_uniq.return_value = [
+        {
+            "uniq": generate_uniq(["User likes pizza"]),
+            "content_embedding": struct.pack("<2f", 0.5, 0.25),
+        }
+    ]
+
+    with patch(
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
+    ) as mock_embed:
+        mock_embed.return_value = [[0.3, 0.4]]
+
+        result = await augmentation._embed_facts(
+            ["User likes pizza", "User is from NYC", "User is from NYC"], driver, 1
+        )
+
+        mock_embed.assert_called_once_with(["User is from NYC"], options=ANY)
+        assert np.array(result).tolist() == [[0.5, 0.25], [0.3, 0.4], [0.3, 0.4]]
+        driver.entity_fact.get_embeddings_by_uniq.assert_called_once_with(
+            1,
+            [
+                generate_uniq(["User likes pizza"]),
+                generate_uniq(["User is from NYC"]),
+                generate_uniq(["User is from NYC"]),
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_embed_facts_all_known_skips_model(augmentation, driver):
+    import struct
+
+    from memori._utils import generate_uniq
+
+    driver.entity_fact.get_embeddings_by_uniq.return_value = [
+        {
+            "uniq": generate_uniq(["User likes pizza"]),
+            "content_embedding": struct.pack("<2f", 0.5, 0.25),
+        }
+    ]
+
+    with patch(
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
+    ) as mock_embed:
+        result = await augmentation._embed_facts(["user likes Pizza!"], driver, 1)
+
+        mock_embed.assert_not_called()
+        assert np.array(result).tolist() == [[0.5, 0.25]]
+
+
+@pytest.mark.asyncio
+async def test_embed_facts_lookup_failure_falls_back_to_model(augmentation, driver):
+    driver.entity_fact.conn.get_errors.return_value = (sqlite3.Error,)
+    driver.entity_fact.get_embeddings_by_uniq.side_effect = sqlite3.OperationalError(
+        "database is locked"
+    )
+
+    with patch(
+        "memori.memory.augmentation.augmentations.memori._augmentation.embed_texts_array_async"
+    ) as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2]]
+
+        result = await augmentation._embed_facts(["User likes pizza"], driver, 1)
+
+        mock_embed.assert_called_once_with(["User likes pizza"], options=ANY)
+        assert np.array(result).tolist() == [[0.1, 0.2]]
+    driver.entity_fact.conn.rollback.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_facts_lookup_unexpected_error_raises(augmentation, driver):
+    driver.entity_fact.conn.get_errors.return_value = (sqlite3.Error,)
+    driver.entity_fact.get_embeddings_by_uniq.side_effect = KeyError("uniq")
+
+    with pytest.raises(KeyError):
+        await augmentation._embed_facts(["User likes pizza"], driver, 1)
+
+    driver.entity_fact.conn.rollback.assert_not_called()
@@ -0,0 +1,70 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from memori.memory._batcher import RecallBatcher, get_recall_batcher
+
+
+def test_recall_batcher_single_caller():
+    batcher = RecallBatcher()
+    calls = []
+
+    def execute(queries):
+        calls.append(queries)
+        return [query.upper() for query in queries]
+
+    assert batcher.search("key", "abc", 0, execute) == "ABC"
+    assert calls == [["abc"]]
+    assert batcher.batches == {}
+
+
+def test_recall_batcher_coalesces_by_key():
+    batcher = RecallBatcher()
+    calls = []
+
+    def execute(queries):
+        calls.append(sorted(queries))
+        return [query.upper() for query in queries]
+
+    requests = [("a", "x"), ("a", "y"), ("b", "z"), ("a", "x")]
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        futures = [
+            executor.submit(batcher.search, key, query, 0.1, execute)
+            for key, query in requests
+        ]
+        results = [future.result() for future in futures]
+
+    assert results == ["X", "Y", "Z", "X"]
+    assert sorted(calls) == [["x", "y"], ["z"]]
+
+
+def test_recall_batcher_propagates_errors():
+    batcher = RecallBatcher()
+
+    def execute(queries):
+        raise RuntimeError("search failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(batcher.search, "key", query, 0.1, execute)
+            for query in ("a", "b")
+        ]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="search failed"):
+                future.result()
+
+    assert batcher.batches == {}
+
+
+def test_get_recall_batcher():
+    assert get_recall_batcher() is get_recall_batcher()
@@ -8,13 +8,21 @@ r"""
                       memorilabs.ai
 """
 
-from unittest.mock import Mock, patch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pytest
 from sqlalchemy.exc import OperationalError
 
 from memori._config import Config
-from memori.memory.recall import MAX_RETRIES, RETRY_BACKOFF_BASE, Recall
+from memori.llm._embeddings import get_embedding_options
+from memori.memory.recall import (
+    MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    LockedDriver,
+    Recall,
+)
 
 
 def test_recall_init():
@@ -60,6 +68,7 @@ def test_search_facts_entity_create_returns_none():
     config = Config()
     config.storage = Mock()
     config.storage.driver = Mock()
+    config.storage.lock = threading.Lock()
     config.storage.driver.entity.create.return_value = None
     config.entity_id = "test-entity"
     recall = Recall(config)
@@ -77,7 +86,7 @@ def test_search_facts_uses_provided_entity_id():
     config.entity_id = None
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -99,7 +108,7 @@ def test_search_facts_success():
     config.entity_id = "test-entity"
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -114,13 +123,27 @@ def test_search_facts_success():
             assert result[0]["content"] == "User likes pizza"
             assert result[1]["content"] == "User lives in NYC"
 
-            mock_embed.assert_called_once_with("What do I like?")
+            mock_embed.assert_called_once_with("What do I like?", options=ANY)
             mock_search.assert_called_once_with(
-                config.storage.driver.entity_fact,
+                ANY,
                 1,
                 [0.1, 0.2, 0.3],
                 5,
                 1000,
+                index_cache=None,
+                index_options=ANY,
+                include_content=False,
+                scan_chunk_size=None,
+                signature_candidates=None,
+                shared_store=None,
+                snapshot_store=None,
+                lexical_weight=0.0,
+                lexical_limit=20,
+                query_text="What do I like?",
+                include_embeddings=False,
+            )
+            assert mock_search.call_args[0][0].driver is (
+                config.storage.driver.entity_fact
             )
 
 
@@ -130,7 +153,7 @@ def test_search_facts_with_custom_limit():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -149,7 +172,7 @@ def test_search_facts_retry_on_operational_error():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -175,7 +198,7 @@ def test_search_facts_retry_multiple_times():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -205,7 +228,7 @@ def test_search_facts_raises_after_max_retries():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -226,7 +249,7 @@ def test_search_facts_raises_on_non_restart_error():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -246,7 +269,7 @@ def test_search_facts_returns_empty_on_no_results():
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -257,13 +280,33 @@ def test_search_facts_returns_empty_on_no_results():
             assert result == []
 
 
+def test_search_facts_uses_its_own_embedding_options():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.embeddings_batch_max_size = 16
+    recall = Recall(config)
+
+    other = Config()
+    other.embeddings_batch_max_size = 64
+    Recall(other)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2]]
+        with patch("memori.memory.recall.search_entity_facts", return_value=[]):
+            recall.search_facts("query", entity_id=1)
+
+    assert mock_embed.call_args.kwargs["options"].batch_max_size == 16
+    assert get_embedding_options().batch_max_size is None
+
+
 def test_search_facts_embeds_query_correctly():
     config = Config()
     config.storage = Mock()
     config.storage.driver = Mock()
     recall = Recall(config)
 
-    with patch("memori.memory.recall.embed_texts") as mock_embed:
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
         mock_embed.return_value = [[0.1, 0.2, 0.3, 0.4, 0.5]]
 
         with patch("memori.memory.recall.search_entity_facts") as mock_search:
@@ -271,11 +314,238 @@ def test_search_facts_embeds_query_correctly():
 
             recall.search_facts("My test query", entity_id=1)
 
-            mock_embed.assert_called_once_with("My test query")
+            mock_embed.assert_called_once_with("My test query", options=ANY)
             mock_search.assert_called_once()
             assert mock_search.call_args[0][2] == [0.1, 0.2, 0.3, 0.4, 0.5]
 
 
+def test_search_facts_many():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.return_value = [
+                [{"content": "fact 1", "similarity": 0.9}],
+                [{"content": "fact 2", "similarity": 0.8}],
+            ]
+
+            result = recall.search_facts_many(
+                ["first", "", "second"], limit=3, entity_id=1
+            )
+
+            assert result == [
+                [{"content": "fact 1", "similarity": 0.9}],
+                [],
+                [{"content": "fact 2", "similarity": 0.8}],
+            ]
+
+            mock_embed.assert_called_once_with(["first", "second"], options=ANY)
+            mock_search.assert_called_once_with(
+                ANY,
+                1,
+                [[0.1, 0.2], [0.3, 0.4]],
+                3,
+                1000,
+                index_cache=None,
+                index_options=ANY,
+                include_content=False,
+                scan_chunk_size=None,
+                signature_candidates=None,
+                shared_store=None,
+                snapshot_store=None,
+                lexical_weight=0.0,
+                lexical_limit=20,
+                query_texts=["first", "second"],
+            )
+            assert mock_search.call_args[0][0].driver is (
+                config.storage.driver.entity_fact
+            )
+
+
+def test_search_facts_many_no_entity_id_in_config():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    config.entity_id = None
+    recall = Recall(config)
+
+    assert recall.search_facts_many(["first", "second"]) == [[], []]
+
+
+def test_search_facts_many_retry_on_operational_error():
+    config = Config()
+    config.storage = Mock()
+    config.storage.driver = Mock()
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.side_effect = [
+                OperationalError(
+                    "statement", "params", Exception("restart transaction")
+                ),
+                [[{"content": "fact", "similarity": 0.9}]],
+            ]
+
+            with patch("memori.memory.recall.time.sleep"):
+                result = recall.search_facts_many(["test query"], entity_id=1)
+
+            assert result == [[{"content": "fact", "similarity": 0.9}]]
+            assert mock_search.call_count == 2
+
+
+async def test_search_facts_async():
+    config = Config()
+    config.storage = MagicMock()
+    config.storage.driver.entity.create.return_value = 7
+    config.entity_id = "test-entity"
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2, 0.3]]
+
+        with patch("memori.memory.recall.search_entity_facts") as mock_search:
+            mock_search.return_value = [{"content": "fact", "similarity": 0.9}]
+
+            result = await recall.search_facts_async("test query", limit=3)
+
+            assert result == [{"content": "fact", "similarity": 0.9}]
+            mock_embed.assert_called_once_with("test query", options=ANY)
+            config.storage.driver.entity.create.assert_called_once_with("test-entity")
+            mock_search.assert_called_once_with(
+                ANY,
+                7,
+                [0.1, 0.2, 0.3],
+                3,
+                1000,
+                index_cache=None,
+                index_options=ANY,
+                include_content=False,
+                scan_chunk_size=None,
+                signature_candidates=None,
+                shared_store=None,
+                snapshot_store=None,
+                lexical_weight=0.0,
+                lexical_limit=20,
+                query_text="test query",
+                include_embeddings=False,
+            )
+            assert mock_search.call_args[0][0].driver is (
+                config.storage.driver.entity_fact
+            )
+            config.storage.lock.__enter__.assert_called_once()
+
+
+async def test_search_facts_async_no_entity_id_in_config():
+    config = Config()
+    config.storage = MagicMock()
+    config.entity_id = None
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        assert await recall.search_facts_async("test query") == []
+
+        mock_embed.assert_not_called()
+
+
+async def test_search_facts_async_entity_create_returns_none():
+    config = Config()
+    config.storage = MagicMock()
+    config.storage.driver.entity.create.return_value = None
+    config.entity_id = "test-entity"
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1, 0.2, 0.3]]
+
+        with patch("memori.memory.recall.search_entity_facts") as mock_search:
+            assert await recall.search_facts_async("test query") == []
+
+            mock_search.assert_not_called()
+
+
+def test_search_facts_batched():
+    config = Config()
+    config.storage = MagicMock()
+    config.recall_batch_secs_window = 0.05
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1], [0.2]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.return_value = [
+                [{"content": "first", "similarity": 0.9}],
+                [{"content": "second", "similarity": 0.8}],
+            ]
+
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(recall.search_facts, query, 5, 42)
+                    for query in ("first", "second", "first")
+                ]
+                results = [future.result() for future in futures]
+
+            assert results == [
+                [{"content": "first", "similarity": 0.9}],
+                [{"content": "second", "similarity": 0.8}],
+                [{"content": "first", "similarity": 0.9}],
+            ]
+            mock_embed.assert_called_once_with(["first", "second"], options=ANY)
+            mock_search.assert_called_once()
+            assert mock_search.call_args[0][1:4] == (42, [[0.1], [0.2]], 5)
+            assert mock_search.call_args[1]["query_texts"] == ["first", "second"]
+
+
+async def test_search_facts_async_batched():
+    config = Config()
+    config.storage = MagicMock()
+    config.storage.driver.entity.create.return_value = 7
+    config.entity_id = "test-entity"
+    config.recall_batch_secs_window = 0.001
+    recall = Recall(config)
+
+    with patch("memori.memory.recall.embed_texts_array") as mock_embed:
+        mock_embed.return_value = [[0.1]]
+
+        with patch("memori.memory.recall.search_entity_facts_many") as mock_search:
+            mock_search.return_value = [[{"content": "fact", "similarity": 0.9}]]
+
+            result = await recall.search_facts_async("test query", limit=3)
+
+            assert result == [{"content": "fact", "similarity": 0.9}]
+            mock_embed.assert_called_once_with(["test query"], options=ANY)
+            assert mock_search.call_args[0][1] == 7
+
+
 def test_constants():
     assert MAX_RETRIES == 3
     assert RETRY_BACKOFF_BASE == 0.05
+
+
+def test_locked_driver_holds_lock_for_each_call():
+    lock = threading.Lock()
+    driver = MagicMock()
+    driver.get_embeddings.side_effect = lambda entity_id, limit: lock.locked()
+
+    def iter_embedding_matrices(entity_id, chunk_size, after_id=None):
+        yield lock.locked()
+        yield lock.locked()
+
+    driver.iter_embedding_matrices.side_effect = iter_embedding_matrices
+    locked = LockedDriver(driver, lock)
+
+    assert locked.get_embeddings(42, 1000) is True
+    assert not lock.locked()
+
+    seen = []
+    for held in locked.iter_embedding_matrices(42, 1000):
+        seen.append((held, lock.locked()))
+    assert seen == [(True, False), (True, False)]
@@ -1,3 +1,5 @@
+import sqlite3
+
 import pytest
 
 from memori.storage._registry import Registry
@@ -104,6 +106,56 @@ def test_rollback_psycopg2(mock_psycopg2_conn):
     assert result is adapter
 
 
+def test_commit_runs_commit_callbacks_psycopg2(mock_psycopg2_conn, mocker):
+    adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
+    callback = mocker.Mock()
+    adapter.on_commit(callback)
+
+    callback.assert_not_called()
+    adapter.commit()
+    adapter.commit()
+
+    callback.assert_called_once()
+
+
+def test_rollback_discards_commit_callbacks_psycopg2(mock_psycopg2_conn, mocker):
+    adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
+    callback = mocker.Mock()
+    adapter.on_commit(callback)
+
+    adapter.rollback()
+    adapter.commit()
+
+    callback.assert_not_called()
+
+
+def test_get_database_key_psycopg2(mock_psycopg2_conn):
+    mock_cursor = mock_psycopg2_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = ("10.0.0.1/32", "5432", "memori")
+    adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
+
+    assert adapter.get_database_key() == "postgresql:10.0.0.1/32/5432/memori"
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert statements[0] == "SAVEPOINT memori_database_key"
+    assert statements[-1] == "RELEASE SAVEPOINT memori_database_key"
+
+
+def test_get_database_key_failure_keeps_transaction_psycopg2(mock_psycopg2_conn):
+    mock_cursor = mock_psycopg2_conn.cursor.return_value
+
+    def execute(operation, binds):
+        if "inet_server_addr" in operation:
+            raise RuntimeError("permission denied")
+
+    mock_cursor.execute.side_effect = execute
+    adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
+
+    assert adapter.get_database_key() == f"postgresql:{id(mock_psycopg2_conn)}"
+    mock_psycopg2_conn.rollback.assert_not_called()
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert statements[-1] == "ROLLBACK TO SAVEPOINT memori_database_key"
+
+
 def test_commit_pymysql(mock_pymysql_conn):
     adapter = DBAPIAdapter(lambda: mock_pymysql_conn)
     result = adapter.commit()
@@ -162,6 +214,41 @@ def test_rollback_sqlite3(mock_sqlite3_conn):
     assert result is adapter
 
 
+def test_get_errors_sqlite3():
+    conn = sqlite3.connect(":memory:")
+    adapter = DBAPIAdapter(lambda: conn)
+
+    assert adapter.get_errors() == (sqlite3.Error,)
+
+
+def test_get_errors_unknown_driver(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    type(mock_conn).__module__ = "unknown_driver"
+
+    assert DBAPIAdapter(lambda: mock_conn).get_errors() == ()
+
+
+def test_execute_binary_psycopg(mocker):
+    mock_conn = mocker.Mock(spec=["cursor", "commit", "rollback"])
+    type(mock_conn).__module__ = "psycopg"
+    mock_cursor = mocker.MagicMock()
+    mock_conn.cursor = mocker.MagicMock(return_value=mock_cursor)
+
+    adapter = DBAPIAdapter(lambda: mock_conn)
+    adapter.execute("SELECT 1", (1,), binary=True)
+
+    mock_cursor.execute.assert_called_once_with("SELECT 1", (1,), binary=True)
+
+
+def test_execute_binary_ignored_psycopg2(mock_psycopg2_conn):
+    adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
+    adapter.execute("SELECT 1", (1,), binary=True)
+
+    mock_psycopg2_conn.cursor.return_value.execute.assert_called_once_with(
+        "SELECT 1", (1,)
+    )
+
+
 def test_execute_closes_cursor_on_exception(mock_psycopg2_conn):
     adapter = DBAPIAdapter(lambda: mock_psycopg2_conn)
     mock_cursor = mock_psycopg2_conn.cursor.return_value
@@ -1,3 +1,6 @@
+from pymongo.errors import PyMongoError
+from sqlalchemy.exc import SQLAlchemyError
+
 from memori.storage.adapters.mongodb._adapter import Adapter as MongoAdapter
 from memori.storage.adapters.sqlalchemy._adapter import Adapter as SqlAlchemyAdapter
 
@@ -28,6 +31,11 @@ def test_rollback(session):
     adapter.rollback()
 
 
+def test_get_errors(session):
+    adapter = SqlAlchemyAdapter(lambda: session)
+    assert adapter.get_errors() == (SQLAlchemyError,)
+
+
 # PostgreSQL tests
 def test_commit_postgres(postgres_session):
     adapter = SqlAlchemyAdapter(lambda: postgres_session)
@@ -75,6 +83,11 @@ def test_mongodb_adapter_get_dialect(mongodb_conn):
     assert adapter.get_dialect() == "mongodb"
 
 
+def test_mongodb_adapter_get_errors(mongodb_conn):
+    adapter = MongoAdapter(lambda: mongodb_conn)
+    assert adapter.get_errors() == (PyMongoError,)
+
+
 def test_mongodb_adapter_execute_with_args(mongodb_conn):
     """Test MongoDB adapter execute method with various arguments."""
     adapter = MongoAdapter(lambda: mongodb_conn)
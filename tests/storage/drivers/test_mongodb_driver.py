@@ -462,16 +462,16 @@ def test_entity_fact_create_new_fact(mock_conn, mocker):
     result = entity_fact.create(entity_id=123, facts=facts, fact_embeddings=embeddings)
 
     assert result == entity_fact
-    assert mock_conn.execute.call_count == 2  # find_one, insert_one
+    assert mock_conn.execute.call_count == 3  # index_information, find_one, insert_one
 
     # Verify find_one query
-    find_call = mock_conn.execute.call_args_list[0]
+    find_call = mock_conn.execute.call_args_list[1]
     assert find_call[0][0] == "memori_entity_fact"
     assert find_call[0][1] == "find_one"
     assert find_call[0][2] == {"entity_id": 123, "uniq": "uniq123"}
 
     # Verify insert_one query
-    insert_call = mock_conn.execute.call_args_list[1]
+    insert_call = mock_conn.execute.call_args_list[2]
     assert insert_call[0][0] == "memori_entity_fact"
     assert insert_call[0][1] == "insert_one"
     doc = insert_call[0][2]
@@ -481,6 +481,7 @@ def test_entity_fact_create_new_fact(mock_conn, mocker):
     assert doc["content_embedding"] is not None
     assert doc["num_times"] == 1
     assert doc["uniq"] == "uniq123"
+    assert "content_signature" not in doc
     assert "uuid" in doc
     assert "date_created" in doc
     assert isinstance(doc["date_created"], datetime)
@@ -508,15 +509,15 @@ def test_entity_fact_create_existing_fact(mock_conn, mocker):
     result = entity_fact.create(entity_id=123, facts=facts, fact_embeddings=embeddings)
 
     assert result == entity_fact
-    assert mock_conn.execute.call_count == 2  # find_one, update_one
+    assert mock_conn.execute.call_count == 3  # index_information, find_one, update_one
 
     # Verify find_one query
-    find_call = mock_conn.execute.call_args_list[0]
+    find_call = mock_conn.execute.call_args_list[1]
     assert find_call[0][0] == "memori_entity_fact"
     assert find_call[0][1] == "find_one"
 
     # Verify update_one query
-    update_call = mock_conn.execute.call_args_list[1]
+    update_call = mock_conn.execute.call_args_list[2]
     assert update_call[0][0] == "memori_entity_fact"
     assert update_call[0][1] == "update_one"
     assert update_call[0][2] == {"_id": 999}
@@ -526,6 +527,7 @@ def test_entity_fact_create_existing_fact(mock_conn, mocker):
     assert "$set" in update_doc
     assert "date_last_time" in update_doc["$set"]
     assert isinstance(update_doc["$set"]["date_last_time"], datetime)
+    assert "content_signature" not in update_doc["$set"]
 
 
 def test_entity_fact_create_empty_facts(mock_conn):
@@ -552,7 +554,7 @@ def test_entity_fact_create_multiple_facts(mock_conn, mocker):
         side_effect=[mock_binary1, mock_binary2],
     )
 
-    mock_conn.execute.side_effect = [None, None, None, None]  # No existing facts
+    mock_conn.execute.side_effect = [None, None, None, None, None]  # No existing facts
 
     entity_fact = EntityFact(mock_conn)
     facts = ["Fact 1", "Fact 2"]
@@ -560,8 +562,8 @@ def test_entity_fact_create_multiple_facts(mock_conn, mocker):
 
     entity_fact.create(entity_id=123, facts=facts, fact_embeddings=embeddings)
 
-    # Should be 4 calls: find_one, insert_one for each fact
-    assert mock_conn.execute.call_count == 4
+    # Should be 5 calls: index_information, then find_one, insert_one for each fact
+    assert mock_conn.execute.call_count == 5
 
 
 def test_entity_fact_create_without_embeddings(mock_conn, mocker):
@@ -583,7 +585,7 @@ def test_entity_fact_create_without_embeddings(mock_conn, mocker):
     entity_fact.create(entity_id=123, facts=facts, fact_embeddings=None)
 
     # Verify embedding was formatted (as Mock object representing bson.Binary)
-    insert_call = mock_conn.execute.call_args_list[1]
+    insert_call = mock_conn.execute.call_args_list[2]
     doc = insert_call[0][2]
     assert doc["content_embedding"] is not None
 
@@ -611,6 +613,150 @@ def test_entity_fact_get_embeddings(mock_conn):
     assert find_call[0][1] == "find"
     assert find_call[0][2] == {"entity_id": 123}
     assert find_call[0][3] == {"_id": 1, "content_embedding": 1}
+    assert find_call[1] == {
+        "sort": [("num_times", -1), ("date_last_time", -1)],
+        "limit": 100,
+    }
+
+
+def test_entity_fact_get_embeddings_after(mock_conn):
+    """Test retrieving a page of embeddings after a given id."""
+    mock_conn.execute.return_value = [
+        {"_id": 3, "content_embedding": b"\x00\x01\x02\x03"},
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_after(entity_id=123, after_id=2, limit=10)
+
+    assert result == [{"id": 3, "content_embedding": b"\x00\x01\x02\x03"}]
+
+    find_call = mock_conn.execute.call_args_list[0]
+    assert find_call[0][2] == {"entity_id": 123, "_id": {"$gt": 2}}
+    assert find_call[1] == {"sort": [("_id", 1)], "limit": 10}
+
+
+def test_entity_fact_get_signatures(mock_conn):
+    """Test retrieving the signatures of an entity's most frequent facts."""
+    mock_conn.execute.side_effect = [
+        {"idx_memori_entity_fact_content_signature": {}},
+        [{"_id": 1, "content_signature": b"\x80"}, {"_id": 2}],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_signatures(entity_id=123, limit=10)
+
+    assert result == [
+        {"id": 1, "content_signature": b"\x80"},
+        {"id": 2, "content_signature": None},
+    ]
+
+    find_call = mock_conn.execute.call_args_list[1]
+    assert find_call[0][2] == {"entity_id": 123}
+    assert find_call[1] == {
+        "sort": [("num_times", -1), ("date_last_time", -1)],
+        "limit": 10,
+    }
+
+
+def test_entity_fact_get_signatures_without_index(mock_conn):
+    """Test that signatures are unavailable until the optional migration runs."""
+    mock_conn.execute.return_value = {}
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.get_signatures(entity_id=123) is None
+    assert mock_conn.execute.call_count == 1
+
+
+def test_entity_fact_create_writes_signature_when_enabled(mock_conn, mocker):
+    """Test that new facts get a signature once the optional migration ran."""
+    mocker.patch("memori._utils.generate_uniq", return_value="uniq123")
+    mock_conn.execute.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.add_content_signature()
+    entity_fact.create(entity_id=123, facts=["Fact"], fact_embeddings=[[1.0, -1.0]])
+
+    index_call = mock_conn.execute.call_args_list[0]
+    assert index_call[0][:2] == ("memori_entity_fact", "create_index")
+    assert index_call[1] == {"name": "idx_memori_entity_fact_content_signature"}
+    doc = mock_conn.execute.call_args_list[2][0][2]
+    assert doc["content_signature"] == b"\x80"
+
+
+def test_entity_fact_create_keeps_signature_of_existing_fact(mock_conn, mocker):
+    """Test that upserting a fact leaves the signature it was written with."""
+    mocker.patch("memori._utils.generate_uniq", return_value="uniq123")
+    mock_conn.execute.side_effect = [
+        {"idx_memori_entity_fact_content_signature": {}},
+        {"_id": 999, "content_signature": b"\x80"},
+        None,
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(entity_id=123, facts=["Fact"], fact_embeddings=None)
+
+    update_doc = mock_conn.execute.call_args_list[2][0][3]
+    assert "content_signature" not in update_doc["$set"]
+
+
+def test_entity_fact_backfill_signatures_includes_empty(mock_conn):
+    """Test that facts with empty signatures are backfilled too."""
+    mock_conn.execute.side_effect = [
+        [{"_id": 1, "content_embedding": [1.0, -1.0]}],
+        None,
+        [],
+    ]
+
+    EntityFact(mock_conn).backfill_signatures()
+
+    find_call = mock_conn.execute.call_args_list[0]
+    assert find_call[0][2] == {"content_signature": {"$in": [None, b""]}}
+    update_call = mock_conn.execute.call_args_list[1]
+    assert update_call[0][3] == {"$set": {"content_signature": b"\x80"}}
+
+
+def test_entity_fact_get_embeddings_by_uniq(mock_conn):
+    """Test retrieving the stored embeddings of an entity's facts by uniq."""
+    mock_conn.execute.return_value = [
+        {"_id": 1, "uniq": "abc", "content_embedding": b"\x00\x01\x02\x03"}
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_by_uniq(123, ["abc", "def"])
+
+    assert result == [{"uniq": "abc", "content_embedding": b"\x00\x01\x02\x03"}]
+
+    find_call = mock_conn.execute.call_args_list[0]
+    assert find_call[0][2] == {"entity_id": 123, "uniq": {"$in": ["abc", "def"]}}
+    assert find_call[0][3] == {"uniq": 1, "content_embedding": 1}
+    assert entity_fact.get_embeddings_by_uniq(123, []) == []
+
+
+def test_entity_fact_search_lexical(mock_conn):
+    """Test full-text search over an entity's facts with a text index."""
+    mock_conn.execute.side_effect = [
+        {"_id_": {}, "idx_memori_entity_fact_content_text": {}},
+        [{"_id": 3, "content": "User owns a red bicycle", "score": 1.5}],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_lexical(123, "Red bicycle?", 5)
+
+    assert result == [{"id": 3, "content": "User owns a red bicycle", "score": 1.5}]
+
+    find_call = mock_conn.execute.call_args_list[1]
+    assert find_call[0][2] == {"entity_id": 123, "$text": {"$search": "red bicycle"}}
+    assert find_call[1] == {"sort": [("score", {"$meta": "textScore"})], "limit": 5}
+
+
+def test_entity_fact_search_lexical_without_text_index(mock_conn):
+    """Test that full-text search is unavailable without a text index."""
+    mock_conn.execute.return_value = {"_id_": {}}
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_lexical(123, "bicycle", 5) is None
 
 
 def test_entity_fact_get_embeddings_with_limit(mock_conn):
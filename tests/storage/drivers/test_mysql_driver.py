@@ -7,6 +7,7 @@ from memori.storage.drivers.mysql._driver import (
     ConversationMessages,
     Driver,
     Entity,
+    EntityFact,
     Process,
     Schema,
     SchemaVersion,
@@ -321,3 +322,35 @@ def test_schema_initialization(mock_conn):
 
     assert isinstance(schema.version, SchemaVersion)
     assert schema.conn == mock_conn
+
+
+def test_entity_fact_add_content_signature_when_missing(mock_conn):
+    """Test that the signature column is only added when missing."""
+    mock_conn.execute.return_value.fetchone.side_effect = [None, (1,)]
+
+    EntityFact(mock_conn).add_content_signature()
+    EntityFact(mock_conn).add_content_signature()
+
+    alters = [
+        call[0][0]
+        for call in mock_conn.execute.call_args_list
+        if "alter table" in call[0][0].lower()
+    ]
+    assert len(alters) == 1
+    assert "add column content_signature" in alters[0].lower()
+
+
+def test_entity_fact_add_fulltext_when_missing(mock_conn):
+    """Test that the full-text index is only added when missing."""
+    mock_conn.execute.return_value.fetchone.side_effect = [None, (1,)]
+
+    EntityFact(mock_conn).add_fulltext()
+    EntityFact(mock_conn).add_fulltext()
+
+    alters = [
+        call[0][0]
+        for call in mock_conn.execute.call_args_list
+        if "alter table" in call[0][0].lower()
+    ]
+    assert len(alters) == 1
+    assert "add fulltext index" in alters[0].lower()
@@ -1,12 +1,14 @@
 from unittest.mock import MagicMock
 from uuid import UUID
 
+from memori._search import compute_signature
 from memori.storage.drivers.postgresql._driver import (
     Conversation,
     ConversationMessage,
     ConversationMessages,
     Driver,
     Entity,
+    EntityFact,
     Process,
     Schema,
     SchemaVersion,
@@ -325,3 +327,211 @@ def test_schema_initialization(mock_conn):
 
     assert isinstance(schema.version, SchemaVersion)
     assert schema.conn == mock_conn
+
+
+def test_entity_fact_get_embedding_matrix_requests_binary(mock_conn):
+    """Test that the embedding matrix is fetched in binary format."""
+    import struct
+
+    mock_conn.execute.return_value.fetchall.return_value = [
+        (1, struct.pack("<2f", 1.0, 0.0)),
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    ids, matrix = entity_fact.get_embedding_matrix(entity_id=123, limit=10)
+
+    assert ids == [1]
+    assert matrix.tolist() == [[1.0, 0.0]]
+
+    select_call = mock_conn.execute.call_args_list[0]
+    assert select_call[0][1] == (123, 10)
+    assert select_call[1] == {"binary": True}
+
+
+def test_entity_fact_create_without_embedding_vector(mock_conn):
+    """Test that facts are inserted without a vector when pgvector is not built."""
+    mock_conn.execute.return_value.fetchone.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(entity_id=123, facts=["fact"], fact_embeddings=[[0.1] * 768])
+
+    insert_call = mock_conn.execute.call_args_list[2]
+    assert "content_embedding_vector" not in insert_call[0][0]
+    assert "content_signature" not in insert_call[0][0]
+    assert len(insert_call[0][1]) == 5
+
+
+def test_entity_fact_create_with_embedding_vector(mock_conn):
+    """Test that facts are inserted with a vector once pgvector is built."""
+    mock_conn.execute.return_value.fetchone.return_value = (1,)
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(
+        entity_id=123, facts=["fact", "other"], fact_embeddings=[[0.5] * 768, [0.5]]
+    )
+
+    assert mock_conn.execute.call_args_list[1][0][0].count("information_schema") == 1
+
+    insert_call = mock_conn.execute.call_args_list[2]
+    assert "content_embedding_vector" in insert_call[0][0]
+    assert "%s::vector" in insert_call[0][0]
+    assert insert_call[0][1][5] == compute_signature([0.5] * 768)
+    assert insert_call[0][1][6] == "[" + ",".join(["0.5"] * 768) + "]"
+
+    insert_call = mock_conn.execute.call_args_list[3]
+    assert insert_call[0][1][6] is None
+
+
+def test_entity_fact_create_updates_cached_index_on_commit(mock_conn, mocker):
+    """Test that the cached index only sees new facts once they are committed."""
+    import numpy as np
+
+    from memori._index import EntityIndex, get_index_cache
+
+    mocker.patch("memori._utils.generate_uniq", return_value="uniq-fact")
+    mock_conn.execute.return_value.fetchone.return_value = None
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = [
+        {"id": 2, "uniq": "uniq-fact"}
+    ]
+
+    index_cache = get_index_cache()
+    mocker.patch.object(index_cache, "max_bytes", 1024)
+    key = (mock_conn.get_database_key(), 123)
+    index_cache.put(key, EntityIndex([1], np.asarray([[1.0, 0.0]], dtype=np.float32)))
+
+    try:
+        EntityFact(mock_conn).create(
+            entity_id=123, facts=["fact"], fact_embeddings=[[0.0, 1.0]]
+        )
+
+        assert index_cache.get(key).ids == [1]
+
+        callback = mock_conn.on_commit.call_args[0][0]
+        callback()
+
+        assert index_cache.get(key).ids == [1, 2]
+    finally:
+        index_cache.invalidate(key)
+
+
+def test_entity_fact_search_similar_without_embedding_vector(mock_conn):
+    """Test that search_similar defers to the caller when pgvector is not built."""
+    mock_conn.execute.return_value.fetchone.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_similar(123, [0.1] * 768, 5) is None
+    assert entity_fact.search_similar(123, [0.1] * 768, 5) is None
+    assert mock_conn.execute.call_count == 1
+
+
+def test_entity_fact_search_similar(mock_conn):
+    """Test that search_similar ranks facts on the server."""
+    mock_conn.execute.return_value.fetchone.return_value = (1,)
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = [
+        {"id": 1, "content": "fact", "similarity": 0.9}
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_similar(123, [0.5] * 768, 5)
+
+    assert result == [{"id": 1, "content": "fact", "similarity": 0.9}]
+
+    search_call = mock_conn.execute.call_args_list[1]
+    assert "ORDER BY content_embedding_vector <=> %s::vector" in search_call[0][0]
+    vector = "[" + ",".join(["0.5"] * 768) + "]"
+    assert search_call[0][1] == (vector, 123, vector, 5)
+
+    # The entity has no more facts than were returned, so none are missing.
+    count_call = mock_conn.execute.call_args_list[2]
+    assert "COUNT(*)" in count_call[0][0]
+    assert count_call[0][1] == (123, 2)
+    assert mock_conn.execute.call_count == 3
+
+
+def test_entity_fact_search_similar_many_entities(mock_conn):
+    """Test that facts the HNSW index filters away are found by an exact scan."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    facts = [
+        {"id": i, "entity_id": i % 50, "vector": rng.standard_normal(768)}
+        for i in range(1, 1001)
+    ]
+    query = rng.standard_normal(768)
+
+    def similarity(fact):
+        vector = fact["vector"]
+        return float(vector @ query / np.linalg.norm(vector) / np.linalg.norm(query))
+
+    def execute(sql, binds=()):
+        result = MagicMock()
+        result.fetchone.return_value = (1,)
+        if "COUNT(*)" in sql:
+            entity_id, limit = binds
+            count = sum(fact["entity_id"] == entity_id for fact in facts)
+            result.fetchone.return_value = (min(count, limit),)
+        if "ORDER BY" not in sql:
+            return result
+
+        _, entity_id, _, limit = binds
+        ranked = sorted(facts, key=similarity, reverse=True)
+        if "+ 0" not in sql:
+            # The index only hands its ef_search nearest facts to the filter.
+            ranked = ranked[:40]
+        result.mappings.return_value.fetchall.return_value = [
+            {"id": fact["id"], "content": "fact", "similarity": similarity(fact)}
+            for fact in ranked
+            if fact["entity_id"] == entity_id
+        ][:limit]
+        return result
+
+    mock_conn.execute.side_effect = execute
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_similar(7, query.tolist(), 5)
+
+    expected = sorted(
+        (fact for fact in facts if fact["entity_id"] == 7), key=similarity, reverse=True
+    )
+    assert [row["id"] for row in result] == [fact["id"] for fact in expected[:5]]
+    assert "+ 0" in mock_conn.execute.call_args_list[-1][0][0]
+
+
+def test_entity_fact_search_similar_dimension_mismatch(mock_conn):
+    """Test that search_similar skips queries the vector column cannot hold."""
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_similar(123, [0.5, 0.5], 5) is None
+    mock_conn.execute.assert_not_called()
+
+
+def test_entity_fact_backfill_embedding_vectors(mock_conn):
+    """Test that existing BYTEA embeddings are copied into the vector column."""
+    import struct
+
+    mock_conn.execute.return_value.mappings.return_value.fetchall.side_effect = [
+        [
+            {"id": 1, "content_embedding": struct.pack("<768f", *([0.5] * 768))},
+            {"id": 2, "content_embedding": b""},
+        ],
+        [],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.backfill_embedding_vectors(batch_size=2)
+
+    update_calls = [
+        call
+        for call in mock_conn.execute.call_args_list
+        if "UPDATE memori_entity_fact" in call[0][0]
+    ]
+    assert len(update_calls) == 1
+    assert update_calls[0][0][1] == ("[" + ",".join(["0.5"] * 768) + "]", 1)
+
+    select_calls = [
+        call for call in mock_conn.execute.call_args_list if "SELECT id" in call[0][0]
+    ]
+    assert select_calls[0][0][1] == (0, 2)
+    assert select_calls[1][0][1] == (2, 2)
+    mock_conn.commit.assert_called_once()
@@ -1,6 +1,7 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock
 from uuid import UUID
 
+from memori._search import compute_signature, parse_embedding
 from memori.storage.drivers.sqlite._driver import (
     Conversation,
     ConversationMessage,
@@ -335,6 +336,7 @@ def test_entity_fact_create(mock_conn, mocker):
         "memori.llm._embeddings.format_embedding_for_db",
         return_value=b"\x00\x01\x02\x03",  # Binary data
     )
+    mock_conn.execute.return_value.fetchone.return_value = None
 
     entity_fact = EntityFact(mock_conn)
     facts = ["User likes Python", "User works as engineer"]
@@ -343,11 +345,12 @@ def test_entity_fact_create(mock_conn, mocker):
     result = entity_fact.create(entity_id=123, facts=facts, fact_embeddings=embeddings)
 
     assert result == entity_fact
-    assert mock_conn.execute.call_count == 2
+    assert mock_conn.execute.call_count == 3
     assert mock_conn.commit.call_count == 1
 
     # Verify first INSERT query
-    first_insert = mock_conn.execute.call_args_list[0]
+    first_insert = mock_conn.execute.call_args_list[1]
+    assert "content_signature" not in first_insert[0][0]
     assert "insert into memori_entity_fact" in first_insert[0][0].lower()
     assert "on conflict(entity_id, uniq)" in first_insert[0][0].lower()
 
@@ -360,6 +363,24 @@ def test_entity_fact_create(mock_conn, mocker):
     assert params[5] == "uniq123"  # uniq
 
 
+def test_entity_fact_create_with_embeddings_format(mock_conn, mocker):
+    """Test creating entity facts with quantized embeddings."""
+    mocker.patch("memori._utils.generate_uniq", return_value="uniq123")
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.create(
+        entity_id=123,
+        facts=["User likes Python"],
+        fact_embeddings=[[0.5, -0.5]],
+        embeddings_format="int8",
+    )
+
+    params = mock_conn.execute.call_args_list[1][0][1]
+    assert len(params[3]) == 8 + 4 + 2
+    assert parse_embedding(params[3]).tolist() == [0.5, -0.5]
+    assert params[6] == compute_signature([0.5, -0.5])
+
+
 def test_entity_fact_create_empty_facts(mock_conn):
     """Test creating entity facts with empty list."""
     entity_fact = EntityFact(mock_conn)
@@ -376,16 +397,17 @@ def test_entity_fact_create_without_embeddings(mock_conn, mocker):
         "memori.llm._embeddings.format_embedding_for_db",
         return_value=b"",  # Empty binary data
     )
+    mock_conn.execute.return_value.fetchone.return_value = None
 
     entity_fact = EntityFact(mock_conn)
     facts = ["User likes Python"]
 
     entity_fact.create(entity_id=123, facts=facts, fact_embeddings=None)
 
-    assert mock_conn.execute.call_count == 1
+    assert mock_conn.execute.call_count == 2
 
     # Verify embedding was formatted as empty binary
-    insert_call = mock_conn.execute.call_args_list[0]
+    insert_call = mock_conn.execute.call_args_list[1]
     params = insert_call[0][1]
     assert params[3] == b""  # content_embedding (empty binary)
 
@@ -414,6 +436,7 @@ def test_entity_fact_get_embeddings(mock_conn, mock_multiple_results):
     assert "content_embedding" in select_call[0][0].lower()
     assert "from memori_entity_fact" in select_call[0][0].lower()
     assert "where entity_id = ?" in select_call[0][0].lower()
+    assert "order by num_times desc, date_last_time desc" in select_call[0][0].lower()
     assert "limit ?" in select_call[0][0].lower()
     assert select_call[0][1] == (123, 100)
 
@@ -430,6 +453,194 @@ def test_entity_fact_get_embeddings_default_limit(mock_conn, mock_empty_result):
     assert select_call[0][1] == (123, 1000)
 
 
+def test_entity_fact_get_embeddings_without_limit(mock_conn, mock_empty_result):
+    """Test retrieving all embeddings when no limit is given."""
+    mock_conn.execute.return_value = mock_empty_result
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.get_embeddings(entity_id=123, limit=None)
+
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "limit" not in select_call[0][0].lower()
+    assert select_call[0][1] == (123,)
+
+
+def test_entity_fact_get_embedding_matrix(mock_conn):
+    """Test retrieving embeddings as ids and one float32 matrix."""
+    import struct
+
+    mock_conn.execute.return_value.fetchall.return_value = [
+        (1, struct.pack("<2f", 1.0, 0.0)),
+        (2, struct.pack("<2f", 0.0, 1.0)),
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    ids, matrix = entity_fact.get_embedding_matrix(entity_id=123, limit=100)
+
+    assert ids == [1, 2]
+    assert matrix.shape == (2, 2)
+    assert matrix.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "content_embedding" in select_call[0][0].lower()
+    assert select_call[0][1] == (123, 100)
+    mock_conn.execute.return_value.mappings.assert_not_called()
+
+
+def test_entity_fact_get_embedding_matrix_empty(mock_conn):
+    """Test retrieving an embedding matrix for an entity without facts."""
+    mock_conn.execute.return_value.fetchall.return_value = []
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.get_embedding_matrix(entity_id=123) == ([], None)
+
+
+def test_entity_fact_iter_embedding_matrices(mock_conn):
+    """Test paging through an entity's embeddings by id in chunks."""
+    import struct
+
+    mock_conn.execute.return_value.mappings.return_value.fetchall.side_effect = [
+        [
+            {"id": 1, "content_embedding": struct.pack("<2f", 1.0, 0.0)},
+            {"id": 2, "content_embedding": struct.pack("<2f", 0.0, 1.0)},
+        ],
+        [{"id": 5, "content_embedding": struct.pack("<2f", 1.0, 1.0)}],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    chunks = list(entity_fact.iter_embedding_matrices(entity_id=123, chunk_size=2))
+
+    assert [ids for ids, _ in chunks] == [[1, 2], [5]]
+    assert chunks[1][1].tolist() == [[1.0, 1.0]]
+
+    first_call, second_call = mock_conn.execute.call_args_list
+    assert "and id > ?" in first_call[0][0].lower()
+    assert "order by id" in first_call[0][0].lower()
+    assert first_call[0][1] == (123, 0, 2)
+    assert second_call[0][1] == (123, 2, 2)
+
+
+def test_entity_fact_get_signatures(mock_conn):
+    """Test retrieving the signatures of an entity's most frequent facts."""
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = [
+        {"id": 1, "content_signature": b"\x80"}
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_signatures(entity_id=123, limit=100)
+
+    assert result == [{"id": 1, "content_signature": b"\x80"}]
+
+    assert "pragma_table_info" in mock_conn.execute.call_args_list[0][0][0]
+    select_call = mock_conn.execute.call_args_list[1]
+    assert "order by num_times desc, date_last_time desc" in select_call[0][0].lower()
+    assert select_call[0][1] == (123, 100)
+
+
+def test_entity_fact_get_signatures_without_column(mock_conn):
+    """Test that signatures are unavailable until the optional migration runs."""
+    mock_conn.execute.return_value.fetchone.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.get_signatures(entity_id=123) is None
+    assert entity_fact.get_signatures(entity_id=123) is None
+    assert mock_conn.execute.call_count == 1
+
+
+def test_entity_fact_backfill_signatures(mock_conn):
+    """Test that signatures are computed for existing facts in id order."""
+    import struct
+
+    mock_conn.execute.return_value.mappings.return_value.fetchall.side_effect = [
+        [{"id": 4, "content_embedding": struct.pack("<2f", 1.0, -1.0)}],
+        [],
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.backfill_signatures(batch_size=1)
+
+    select_call, update_call, next_select_call = mock_conn.execute.call_args_list
+    assert "content_signature is null" in select_call[0][0].lower()
+    assert select_call[0][1] == (0, 1)
+    assert update_call[0][1] == (compute_signature([1.0, -1.0]), 4)
+    assert next_select_call[0][1] == (4, 1)
+    mock_conn.commit.assert_called_once()
+
+
+def test_entity_fact_get_embeddings_by_ids(mock_conn, mock_multiple_results):
+    """Test retrieving embeddings by fact IDs."""
+    mock_conn.execute.return_value = mock_multiple_results(
+        [{"id": 1, "content_embedding": b"\x00\x01\x02\x03"}]
+    )
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_by_ids([1, 2])
+
+    assert result == [{"id": 1, "content_embedding": b"\x00\x01\x02\x03"}]
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "where id in (?,?)" in select_call[0][0].lower()
+    assert select_call[0][1] == (1, 2)
+    assert entity_fact.get_embeddings_by_ids([]) == []
+
+
+def test_entity_fact_get_embedding_stats(mock_conn, mock_single_result):
+    """Test counting an entity's facts up to an id."""
+    mock_conn.execute.return_value = mock_single_result({"count": 2, "max_id": 5})
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embedding_stats(123, 5)
+
+    assert result == {"count": 2, "max_id": 5}
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "count(*)" in select_call[0][0].lower()
+    assert select_call[0][1] == (123, 5)
+
+
+def test_entity_fact_get_embeddings_by_uniq(mock_conn, mock_multiple_results):
+    """Test retrieving the stored embeddings of an entity's facts by uniq."""
+    mock_conn.execute.return_value = mock_multiple_results(
+        [{"uniq": "abc", "content_embedding": b"\x00\x01\x02\x03"}]
+    )
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.get_embeddings_by_uniq(123, ["abc", "def"])
+
+    assert result == [{"uniq": "abc", "content_embedding": b"\x00\x01\x02\x03"}]
+    select_call = mock_conn.execute.call_args_list[0]
+    assert "uniq in (?,?)" in select_call[0][0].lower()
+    assert select_call[0][1] == (123, "abc", "def")
+    assert entity_fact.get_embeddings_by_uniq(123, []) == []
+
+
+def test_entity_fact_search_lexical(mock_conn):
+    """Test full-text search over an entity's facts with FTS5."""
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = [
+        {"id": 3, "content": "User owns a red bicycle", "score": 0.7}
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    result = entity_fact.search_lexical(123, "Red bicycle?", 5)
+
+    assert result == [{"id": 3, "content": "User owns a red bicycle", "score": 0.7}]
+
+    assert "sqlite_master" in mock_conn.execute.call_args_list[0][0][0]
+    search_call = mock_conn.execute.call_args_list[1]
+    assert "memori_entity_fact_fts match ?" in search_call[0][0].lower()
+    assert search_call[0][1] == ('"red" OR "bicycle"', 123, 5)
+    assert entity_fact.search_lexical(123, "?", 5) == []
+
+
+def test_entity_fact_search_lexical_without_fulltext(mock_conn):
+    """Test that full-text search is unavailable until the optional migration runs."""
+    mock_conn.execute.return_value.fetchone.return_value = None
+
+    entity_fact = EntityFact(mock_conn)
+
+    assert entity_fact.search_lexical(123, "bicycle", 5) is None
+
+
 def test_entity_fact_get_facts_by_ids(mock_conn, mock_multiple_results):
     """Test retrieving fact content by IDs."""
     mock_conn.execute.return_value = mock_multiple_results(
@@ -464,3 +675,98 @@ def test_entity_fact_get_facts_by_ids_empty(mock_conn):
 
     assert result == []
     assert mock_conn.execute.call_count == 0
+
+
+def test_entity_fact_create_adds_to_cached_index(mock_conn, mocker):
+    """Test that new facts are added to a cached entity index."""
+    import numpy as np
+
+    from memori._index import EntityIndex, get_index_cache
+
+    mocker.patch(
+        "memori._utils.generate_uniq", side_effect=lambda terms: f"uniq-{terms[0]}"
+    )
+    mock_result = Mock()
+    mock_result.mappings.return_value.fetchall.return_value = [
+        {"id": 1, "uniq": "uniq-User likes Python"},
+        {"id": 2, "uniq": "uniq-User works as engineer"},
+    ]
+    mock_result.fetchone.return_value = None
+    mock_conn.execute.return_value = mock_result
+
+    index_cache = get_index_cache()
+    mocker.patch.object(index_cache, "max_bytes", 1024)
+    key = (mock_conn.get_database_key(), 123)
+    index_cache.put(key, EntityIndex([1], np.asarray([[1.0, 0.0]], dtype=np.float32)))
+
+    try:
+        EntityFact(mock_conn).create(
+            entity_id=123,
+            facts=["User likes Python", "User works as engineer"],
+            fact_embeddings=[[1.0, 0.0], [0.0, 1.0]],
+        )
+
+        assert mock_conn.execute.call_count == 4
+        select_call = mock_conn.execute.call_args_list[3]
+        assert "uniq in (?,?)" in select_call[0][0].lower()
+        assert select_call[0][1] == (
+            123,
+            "uniq-User likes Python",
+            "uniq-User works as engineer",
+        )
+        assert index_cache.get(key).ids == [1, 2]
+        assert index_cache.get(key).contents == {
+            1: "User likes Python",
+            2: "User works as engineer",
+        }
+    finally:
+        index_cache.invalidate(key)
+
+
+def test_entity_fact_create_skips_uncached_index(mock_conn, mocker):
+    """Test that facts for uncached entities do not query ids."""
+    mocker.patch("memori._utils.generate_uniq", return_value="uniq123")
+    mock_conn.execute.return_value.fetchone.return_value = None
+
+    EntityFact(mock_conn).create(
+        entity_id=123, facts=["User likes Python"], fact_embeddings=[[1.0, 0.0]]
+    )
+
+    assert mock_conn.execute.call_count == 2
+
+
+def test_entity_fact_get_embeddings_include_content(mock_conn):
+    """Test fetching fact content together with the embeddings."""
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = []
+
+    entity_fact = EntityFact(mock_conn)
+    entity_fact.get_embeddings(entity_id=123, limit=10, include_content=True)
+
+    query = mock_conn.execute.call_args[0][0]
+    assert "content_embedding, content" in query
+    assert mock_conn.execute.call_args[0][1] == (123, 10)
+
+
+def test_entity_fact_get_embedding_matrix_with_content(mock_conn):
+    """Test that content is returned keyed by fact id with the matrix."""
+    import struct
+
+    mock_conn.execute.return_value.mappings.return_value.fetchall.return_value = [
+        {
+            "id": 1,
+            "content_embedding": struct.pack("<2f", 1.0, 0.0),
+            "content": "fact one",
+        },
+        {
+            "id": 2,
+            "content_embedding": struct.pack("<2f", 0.0, 1.0),
+            "content": "fact two",
+        },
+    ]
+
+    entity_fact = EntityFact(mock_conn)
+    ids, matrix, contents = entity_fact.get_embedding_matrix_with_content(123, 10)
+
+    assert ids == [1, 2]
+    assert matrix.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+    assert contents == {1: "fact one", 2: "fact two"}
@@ -170,3 +170,94 @@ def test_create_data_structures_no_migration_mapping(mock_config):
     assert "No migration mapping found for dialect: unknown_dialect" in str(
         exc_info.value
     )
+
+
+def test_get_optional_migrations(builder):
+    """Test optional migration lookup by dialect."""
+    assert "pgvector" in builder._get_optional_migrations("postgresql")
+    assert "pgvector" not in builder._get_optional_migrations("mysql")
+    assert "signature" in builder._get_optional_migrations("mysql")
+    assert builder._get_optional_migrations("unknown") == {}
+
+
+def test_create_optional_data_structures(mock_config):
+    """Test that optional migrations run operations and driver methods."""
+    mock_config.storage.adapter.get_dialect.return_value = "postgresql"
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+
+    builder.create_optional_data_structures("pgvector")
+
+    operations = [
+        call[0][0] for call in mock_config.storage.adapter.execute.call_args_list
+    ]
+    assert operations[0] == "CREATE EXTENSION IF NOT EXISTS vector"
+    assert any("VECTOR(768)" in operation for operation in operations)
+    assert any("USING hnsw" in operation for operation in operations)
+    mock_config.storage.driver.entity_fact.backfill_embedding_vectors.assert_called_once_with()
+
+
+def test_create_optional_data_structures_operations_list(mock_config):
+    """Test that optional migrations can run a list of MongoDB operations."""
+    mock_config.storage.adapter.get_dialect.return_value = "mongodb"
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+
+    builder.create_optional_data_structures("fulltext")
+
+    operations = mock_config.storage.adapter.execute.call_args_list[0][0][0]
+    assert operations[0]["collection"] == "memori_entity_fact"
+    assert operations[0]["args"] == [[("content", "text")]]
+
+
+def test_create_optional_data_structures_unsupported(mock_config):
+    """Test that unknown optional migrations raise NotImplementedError."""
+    mock_config.storage.adapter.get_dialect.return_value = "mysql"
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+
+    with pytest.raises(NotImplementedError) as exc_info:
+        builder.create_optional_data_structures("pgvector")
+
+    assert "Optional migration pgvector is not available" in str(exc_info.value)
+
+
+def test_build_with_optional(mock_config):
+    """Test that build runs requested optional migrations after the schema."""
+    mock_config.storage.adapter.get_dialect.return_value = "postgresql"
+
+    builder = Builder(mock_config)
+    builder.cli = MagicMock()
+    builder.create_optional_data_structures = MagicMock()
+
+    mock_config.storage.driver.schema.version.read.return_value = len(
+        PostgresqlDriver.migrations
+    )
+
+    builder.execute(["pgvector"])
+
+    builder.create_optional_data_structures.assert_called_once_with("pgvector")
+
+
+def test_build_with_optional_twice_sqlite(tmp_path):
+    """Test that optional migrations can run again on an existing database."""
+    import sqlite3
+
+    from memori import Memori
+
+    path = str(tmp_path / "memori.db")
+    mem = Memori(conn=lambda: sqlite3.connect(path, check_same_thread=False))
+
+    mem.config.storage.build(optional=["signature", "fulltext"])
+    mem.config.storage.build(optional=["signature", "fulltext"])
+
+    columns = [
+        row[1]
+        for row in mem.config.storage.adapter.execute(
+            "PRAGMA table_info(memori_entity_fact)"
+        ).fetchall()
+    ]
+    assert columns.count("content_signature") == 1
@@ -0,0 +1,27 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+from memori._benchmark import Manager, time_search
+from memori._config import Config
+
+
+def test_time_search():
+    cold, warm = time_search("numpy", 8, dimension=4, repeat=3)
+
+    assert cold > 0
+    assert warm > 0
+
+
+def test_benchmark_execute(capsys):
+    Manager(Config()).execute(sizes=(4, 8))
+
+    output = capsys.readouterr().out
+    assert "numpy cold" in output
+    assert "current recall_numpy_threshold: 4,096" in output
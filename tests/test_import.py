@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+
+IMPORT_SECS_BUDGET = 5.0
+IMPORT_MODULES_BUDGET = 1200
+LAZY_MODULES = ("faiss", "sentence_transformers", "torch", "transformers")
+
+_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import memori
+
+print(json.dumps({
+    "secs": time.perf_counter() - start,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _import_memori():
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_embedding_stack():
+    modules = set(_import_memori()["modules"])
+
+    assert [name for name in LAZY_MODULES if name in modules] == []
+
+
+def test_import_budget():
+    result = _import_memori()
+
+    assert result["secs"] < IMPORT_SECS_BUDGET
+    assert len(result["modules"]) < IMPORT_MODULES_BUDGET
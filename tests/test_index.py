@@ -0,0 +1,432 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import numpy as np
+import pytest
+
+from memori._config import Config
+from memori._index import (
+    EntityIndex,
+    IndexCache,
+    IndexOptions,
+    get_index_cache,
+    get_index_caches,
+)
+
+
+def _index(ids, rows):
+    return EntityIndex(ids, np.asarray(rows, dtype=np.float32))
+
+
+def _cache(max_bytes=1024 * 1024, secs_ttl=None):
+    cache = IndexCache()
+    cache.max_bytes = max_bytes
+    cache.secs_ttl = secs_ttl
+    return cache
+
+
+def test_entity_index_search():
+    index = _index([1, 2, 3], [[1.0, 0.0], [0.707, 0.707], [0.0, 1.0]])
+
+    result = index.search([1.0, 0.0], 2)
+
+    assert [fact_id for fact_id, _ in result] == [1, 2]
+    assert result[0][1] > result[1][1]
+
+
+def test_entity_index_search_dimension_mismatch():
+    index = _index([1], [[1.0, 0.0]])
+
+    assert index.search([1.0, 0.0, 0.0], 5) == []
+
+
+def test_entity_index_add_contents():
+    index = _index([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+    nbytes = index.nbytes
+
+    added = index.add_contents({1: "abc", 3: "unknown"})
+
+    assert added == 1
+    assert index.contents == {1: "abc"}
+    assert index.nbytes == nbytes + 3
+    assert index.add_contents({1: "abc"}) == 0
+
+
+def test_entity_index_search_many():
+    index = _index([1, 2, 3], [[1.0, 0.0], [0.707, 0.707], [0.0, 1.0]])
+    query_embeddings = np.asarray([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+
+    result = index.search_many(query_embeddings, 1)
+
+    assert [[fact_id for fact_id, _ in similar] for similar in result] == [[1], [3]]
+    assert query_embeddings.tolist() == [[1.0, 0.0], [0.0, 2.0]]
+
+
+def test_entity_index_search_many_rank_weight():
+    index = _index([1, 2, 3], [[0.0, 1.0], [0.6, 0.8], [0.8, 0.6]])
+
+    unweighted = index.search_many([[1.0, 0.0]], 2)
+    weighted = index.search_many([[1.0, 0.0]], 2, rank_weight=0.5)
+
+    assert [fact_id for fact_id, _ in unweighted[0]] == [3, 2]
+    assert [fact_id for fact_id, _ in weighted[0]] == [2, 3]
+    assert weighted[0][0][1] == pytest.approx(0.6, abs=1e-6)
+
+
+def test_entity_index_search_many_empty():
+    index = _index([1], [[1.0, 0.0]])
+
+    assert index.search_many([], 5) == []
+    assert index.search_many([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], 5) == [[], []]
+
+
+def test_entity_index_add_skips_existing_ids():
+    index = _index([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+
+    added = index.add([2, 3, 3], np.asarray([[0.0, 1.0], [1.0, 1.0], [1.0, 1.0]]))
+
+    assert added == 1
+    assert index.ids == [1, 2, 3]
+    assert index.index.ntotal == 3
+
+
+def test_entity_index_nbytes():
+    index = _index([1, 2], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+
+    assert index.nbytes == 2 * 3 * 4
+
+
+def _clustered_rows(num_rows=200, dim=16, seed=7):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((num_rows, dim)).astype(np.float32)
+
+
+def test_index_options_configure():
+    config = Config()
+    config.recall_ann_backend = "hnsw"
+    config.recall_ann_threshold = 500
+    config.recall_ann_hnsw_ef_search = 128
+    config.recall_ann_ivf_nprobe = 4
+    config.recall_numpy_threshold = 64
+    config.recall_rank_weight = 0.25
+    config.recall_index_cache_max_bytes = 1 << 30
+
+    options = IndexOptions().configure(config)
+
+    assert options.ann_backend == "hnsw"
+    assert options.ann_threshold == 500
+    assert options.hnsw_ef_search == 128
+    assert options.ivf_nprobe == 4
+    assert options.numpy_threshold == 64
+    assert options.rank_weight == 0.25
+
+
+def test_index_options_configure_warns_without_cache_budget():
+    config = Config()
+    config.recall_ann_backend = "hnsw"
+
+    with pytest.warns(RuntimeWarning, match="recall_index_cache_max_bytes"):
+        IndexOptions().configure(config)
+
+
+def test_index_options_backend_for_falls_back_when_uncached():
+    options = IndexOptions()
+    options.ann_backend = "hnsw"
+    options.ann_threshold = 100
+    nbytes = options.nbytes_for("hnsw", 1000, 768)
+
+    assert options.backend_for(1000, 768) == "hnsw"
+    assert options.backend_for(1000, 768, max_bytes=nbytes) == "hnsw"
+    assert options.backend_for(1000, 768, max_bytes=nbytes - 1) == "flat"
+    assert options.backend_for(1000, 768, max_bytes=0) == "flat"
+
+
+def test_index_options_nbytes_for_matches_built_index():
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.ann_threshold = 0
+
+    for backend in ("hnsw", "ivf"):
+        options.ann_backend = backend
+        index = EntityIndex(list(range(len(rows))), rows, options)
+        assert index.backend == backend
+        assert options.nbytes_for(backend, len(rows), rows.shape[1]) == index.nbytes
+
+
+def test_index_options_backend_for():
+    options = IndexOptions()
+    assert options.backend_for(4095) == "numpy"
+    assert options.backend_for(4096) == "flat"
+    assert options.backend_for(1_000_000) == "flat"
+
+    options.ann_backend = "ivf"
+    options.ann_threshold = 100
+    options.numpy_threshold = 10
+    assert options.backend_for(9) == "numpy"
+    assert options.backend_for(99) == "flat"
+    assert options.backend_for(100) == "ivf"
+
+
+def test_index_options_rejects_unknown_backend():
+    options = IndexOptions()
+    options.ann_backend = "annoy"
+    options.ann_threshold = 1
+
+    with pytest.raises(ValueError):
+        options.backend_for(10)
+
+
+@pytest.mark.parametrize("backend", ["hnsw", "ivf"])
+def test_entity_index_ann_backend(backend):
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.ann_backend = backend
+    options.ann_threshold = 100
+    options.ivf_nprobe = 1000
+
+    index = EntityIndex(list(range(len(rows))), rows, options)
+
+    assert index.backend == backend
+    assert index.search(rows[17], 1)[0][0] == 17
+    assert index.nbytes > len(rows) * rows.shape[1] * 4
+
+
+@pytest.mark.parametrize("backend", ["hnsw", "ivf"])
+def test_entity_index_ann_backend_add(backend):
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.ann_backend = backend
+    options.ann_threshold = 100
+    options.ivf_nprobe = 1000
+
+    index = EntityIndex(list(range(100)), rows[:100], options)
+    index.add([150], rows[150:151])
+
+    assert index.search(rows[150], 1)[0][0] == 150
+
+
+@pytest.mark.parametrize(
+    "backend,numpy_threshold", [("numpy", 4096), ("flat", 0), ("hnsw", 0), ("ivf", 0)]
+)
+def test_entity_index_vectors(backend, numpy_threshold):
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.ann_backend = backend if backend in ("hnsw", "ivf") else None
+    options.ann_threshold = 100
+    options.numpy_threshold = numpy_threshold
+
+    index = EntityIndex(list(range(100)), rows[:100], options)
+    index.add([150], rows[150:151])
+    vectors = index.vectors([3, 150, 999])
+
+    assert index.backend == backend
+    assert sorted(vectors) == [3, 150]
+    for fact_id in (3, 150):
+        np.testing.assert_allclose(
+            vectors[fact_id], rows[fact_id] / np.linalg.norm(rows[fact_id]), atol=1e-6
+        )
+
+
+def test_entity_index_below_threshold_uses_flat():
+    rows = _clustered_rows(num_rows=50)
+    options = IndexOptions()
+    options.ann_backend = "hnsw"
+    options.ann_threshold = 100
+    options.numpy_threshold = 10
+
+    index = EntityIndex(list(range(len(rows))), rows, options)
+
+    assert index.backend == "flat"
+
+
+@pytest.mark.parametrize("numpy_threshold", [0, 1000])
+def test_entity_index_numpy_backend_matches_flat(numpy_threshold):
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.numpy_threshold = numpy_threshold
+
+    flat_options = IndexOptions()
+    flat_options.numpy_threshold = 0
+
+    index = EntityIndex(list(range(len(rows))), rows.copy(), options)
+    index.add([500], _clustered_rows(num_rows=1, seed=11))
+
+    flat = EntityIndex(list(range(len(rows))), rows.copy(), flat_options)
+    flat.add([500], _clustered_rows(num_rows=1, seed=11))
+
+    assert index.backend == ("numpy" if numpy_threshold else "flat")
+    assert index.index.ntotal == 201
+    assert index.nbytes == flat.nbytes
+    for rank_weight in (0.0, 0.3):
+        result = index.search_many(rows[:3], 5, rank_weight)
+        expected = flat.search_many(rows[:3], 5, rank_weight)
+        assert [[fact_id for fact_id, _ in r] for r in result] == [
+            [fact_id for fact_id, _ in r] for r in expected
+        ]
+        assert [[s for _, s in r] for r in result] == [
+            [pytest.approx(s, abs=1e-5) for _, s in r] for r in expected
+        ]
+
+
+def test_entity_index_numpy_backend_rank_weight_matches_flat():
+    rows = _clustered_rows()
+    options = IndexOptions()
+    options.numpy_threshold = 1000
+
+    flat_options = IndexOptions()
+    flat_options.numpy_threshold = 0
+
+    index = EntityIndex(list(range(len(rows))), rows.copy(), options)
+    flat = EntityIndex(list(range(len(rows))), rows.copy(), flat_options)
+
+    assert index.backend == "numpy"
+    assert flat.backend == "flat"
+    # A strong prior ranks facts far outside the nearest limit * 10 first.
+    result = index.search_many(rows[150:153], 3, rank_weight=0.8)
+    expected = flat.search_many(rows[150:153], 3, rank_weight=0.8)
+    assert [[fact_id for fact_id, _ in r] for r in result] == [
+        [fact_id for fact_id, _ in r] for r in expected
+    ]
+
+
+def test_entity_index_numpy_backend_limit_above_rows():
+    index = _index([1, 2], [[0.0, 1.0], [1.0, 0.0]])
+
+    assert index.backend == "numpy"
+    assert [fact_id for fact_id, _ in index.search([1.0, 0.0], 5)] == [2, 1]
+
+
+def test_index_cache_configure():
+    config = Config()
+    config.recall_index_cache_max_bytes = 2048
+    config.recall_index_cache_secs_ttl = 10
+
+    cache = IndexCache().configure(config)
+
+    assert cache.max_bytes == 2048
+    assert cache.secs_ttl == 10
+
+
+def test_index_cache_put_and_get():
+    cache = _cache()
+    index = _index([1], [[1.0, 0.0]])
+
+    cache.put(42, index)
+
+    assert cache.contains(42)
+    assert cache.get(42) is index
+    assert cache.nbytes == index.nbytes
+
+
+def test_index_cache_evicts_least_recently_used():
+    cache = _cache(max_bytes=16)
+    cache.put(1, _index([1], [[1.0, 0.0]]))
+    cache.put(2, _index([2], [[0.0, 1.0]]))
+
+    cache.get(1)
+    cache.put(3, _index([3], [[1.0, 1.0]]))
+
+    assert cache.contains(1)
+    assert not cache.contains(2)
+    assert cache.contains(3)
+    assert cache.nbytes == 16
+
+
+def test_index_cache_does_not_keep_oversized_entry():
+    cache = _cache(max_bytes=4)
+    index = _index([1], [[1.0, 0.0]])
+
+    assert cache.put(1, index) is index
+    assert not cache.contains(1)
+    assert cache.nbytes == 0
+
+
+def test_index_cache_expires_entries():
+    cache = _cache(secs_ttl=60)
+    index = _index([1], [[1.0, 0.0]])
+    cache.put(1, index)
+
+    index.date_created -= 120
+
+    assert cache.get(1) is None
+    assert cache.nbytes == 0
+
+
+def test_index_cache_add_to_cached_entity():
+    cache = _cache()
+    cache.put(42, _index([1], [[1.0, 0.0]]))
+
+    cache.add(42, [2, 3], [[0.0, 1.0], [1.0, 0.0, 0.0]])
+
+    index = cache.get(42)
+    assert index.ids == [1, 2]
+    assert cache.nbytes == index.nbytes
+    assert index.search([0.0, 1.0], 1)[0][0] == 2
+
+
+def test_index_cache_add_ignores_uncached_entity():
+    cache = _cache()
+
+    cache.add(42, [1], [[1.0, 0.0]])
+
+    assert not cache.contains(42)
+
+
+def test_index_cache_invalidate_and_clear():
+    cache = _cache()
+    cache.put(1, _index([1], [[1.0, 0.0]]))
+    cache.put(2, _index([2], [[0.0, 1.0]]))
+
+    cache.invalidate(1)
+    assert not cache.contains(1)
+    assert cache.contains(2)
+
+    cache.clear()
+    assert not cache.contains(2)
+    assert cache.nbytes == 0
+
+
+def test_get_index_cache_returns_singleton():
+    assert get_index_cache() is get_index_cache()
+
+
+def test_get_index_cache_by_config():
+    config = Config()
+    config.recall_index_cache_max_bytes = 1024
+    other = Config()
+    other.recall_index_cache_max_bytes = 2048
+
+    cache = get_index_cache(config)
+
+    assert get_index_cache(config) is cache
+    assert get_index_cache(other) is not cache
+    assert get_index_cache(other).max_bytes == 2048
+    assert cache.max_bytes == 1024
+    assert cache in get_index_caches()
+
+
+def test_index_cache_add_contents_updates_nbytes():
+    cache = _cache()
+    index = cache.put(1, _index([1, 2], [[1.0, 0.0], [0.0, 1.0]]))
+
+    cache.add_contents(1, index, {1: "abcd"})
+
+    assert cache.nbytes == index.nbytes
+    assert index.contents == {1: "abcd"}
+
+
+def test_index_cache_add_keeps_contents():
+    cache = _cache()
+    index = cache.put(1, _index([1], [[1.0, 0.0]]))
+
+    cache.add(1, [2], [[0.0, 1.0]], ["fact two"])
+
+    assert index.contents == {2: "fact two"}
+    assert cache.nbytes == index.nbytes
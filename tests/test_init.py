@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from memori import Memori
@@ -41,3 +43,26 @@ def test_set_session_resets_cache():
 
     assert mem.config.cache.conversation_id is None
     assert mem.config.cache.session_id is None
+
+
+def test_embeddings_warm_up_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MEMORI_EMBEDDINGS_WARM_UP", raising=False)
+
+    with patch("memori.warm_up_embeddings") as mock_warm_up:
+        mem = Memori()
+
+    assert mem.config.embeddings_warm_up is False
+    mock_warm_up.assert_not_called()
+
+
+def test_embeddings_warm_up(monkeypatch):
+    monkeypatch.setenv("MEMORI_EMBEDDINGS_WARM_UP", "1")
+
+    with patch("memori.warm_up_embeddings") as mock_warm_up:
+        mem = Memori()
+
+    assert mem.config.embeddings_warm_up is True
+    mock_warm_up.assert_called_once()
+    assert mock_warm_up.call_args.kwargs["options"].backend == (
+        mem.config.embeddings_backend
+    )
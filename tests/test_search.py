@@ -10,11 +10,57 @@ r"""
 
 import json
 import struct
+from decimal import Decimal
 from unittest.mock import MagicMock
 
 import numpy as np
-
-from memori._search import find_similar_embeddings, parse_embedding, search_entity_facts
+import pytest
+
+from memori import _search as search_module
+from memori._index import EntityIndex, IndexCache, IndexOptions
+from memori._search import (
+    compute_signature,
+    encode_embedding,
+    find_similar_embeddings,
+    fuse_facts,
+    hamming_top_k,
+    lexical_terms,
+    parse_embedding,
+    parse_embeddings,
+    scan_entity_embeddings,
+    search_entity_facts,
+    search_entity_facts_many,
+    search_shared_matrix,
+    search_signatures,
+)
+from memori._shared import SharedMatrixStore
+from memori._snapshot import SnapshotStore
+from memori.storage._base import BaseEntityFact
+
+
+def _entity_fact_driver():
+    mock_driver = MagicMock()
+    mock_driver.cache_key.side_effect = lambda entity_id: ("db", entity_id)
+    mock_driver.search_similar.return_value = None
+    mock_driver.get_signatures.return_value = None
+    mock_driver.get_embedding_stats.return_value = None
+    mock_driver.search_lexical.return_value = None
+    mock_driver.get_embedding_matrix.side_effect = lambda entity_id, limit: (
+        BaseEntityFact.get_embedding_matrix(mock_driver, entity_id, limit)
+    )
+    mock_driver.get_embedding_matrix_with_content.side_effect = (
+        lambda entity_id, limit: BaseEntityFact.get_embedding_matrix_with_content(
+            mock_driver, entity_id, limit
+        )
+    )
+    mock_driver.iter_embedding_matrices.side_effect = (
+        lambda entity_id, chunk_size, after_id=None: (
+            BaseEntityFact.iter_embedding_matrices(
+                mock_driver, entity_id, chunk_size, after_id
+            )
+        )
+    )
+    return mock_driver
 
 
 def test_parse_embedding_from_bytes_postgresql():
@@ -57,6 +103,99 @@ def test_parse_embedding_maintains_float32_dtype():
     assert result.dtype == np.float32
 
 
+def test_parse_embeddings_vectorized_bytes():
+    rows = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    raws = [struct.pack("<3f", *row) for row in rows]
+
+    ids, matrix = parse_embeddings([10, 11], raws)
+
+    assert ids == [10, 11]
+    assert matrix.shape == (2, 3)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix.flags["WRITEABLE"]
+    np.testing.assert_array_almost_equal(matrix, rows, decimal=5)
+
+
+def test_parse_embeddings_vectorized_memoryview():
+    raws = [memoryview(struct.pack("<2f", 1.0, 0.0)), struct.pack("<2f", 0.0, 1.0)]
+
+    ids, matrix = parse_embeddings([1, 2], raws)
+
+    assert ids == [1, 2]
+    np.testing.assert_array_almost_equal(matrix, [[1.0, 0.0], [0.0, 1.0]])
+
+
+def test_parse_embeddings_falls_back_for_mixed_formats():
+    raws = [struct.pack("<2f", 1.0, 0.0), json.dumps([0.0, 1.0]), "invalid"]
+
+    ids, matrix = parse_embeddings([1, 2, 3], raws)
+
+    assert ids == [1, 2]
+    np.testing.assert_array_almost_equal(matrix, [[1.0, 0.0], [0.0, 1.0]])
+
+
+def test_encode_embedding_float32_has_no_header():
+    assert encode_embedding([1.0, 2.0], "float32") == struct.pack("<2f", 1.0, 2.0)
+
+
+def test_encode_embedding_float16_round_trip():
+    embedding = [0.5, -0.25, 0.125]
+    raw = encode_embedding(embedding, "float16")
+
+    assert len(raw) == 8 + 3 * 2
+    np.testing.assert_array_equal(parse_embedding(raw), embedding)
+    assert parse_embedding(raw).dtype == np.float32
+
+
+def test_encode_embedding_int8_round_trip():
+    embedding = np.linspace(-1.0, 1.0, 768, dtype=np.float32)
+    raw = encode_embedding(embedding, "int8")
+
+    assert len(raw) == 8 + 4 + 768
+    np.testing.assert_allclose(parse_embedding(raw), embedding, atol=1 / 127)
+
+
+def test_encode_embedding_int8_zero_vector():
+    np.testing.assert_array_equal(
+        parse_embedding(encode_embedding([0.0, 0.0], "int8")), [0.0, 0.0]
+    )
+
+
+def test_encode_embedding_unsupported_format():
+    with pytest.raises(ValueError, match="Unsupported embeddings format"):
+        encode_embedding([1.0], "bfloat16")
+
+
+def test_parse_embeddings_vectorized_quantized():
+    rows = [[1.0, 0.5, -1.0], [0.25, -0.5, 0.75]]
+
+    for embeddings_format, atol in (("float16", 0), ("int8", 1 / 127)):
+        ids, matrix = parse_embeddings(
+            [1, 2], [encode_embedding(row, embeddings_format) for row in rows]
+        )
+
+        assert ids == [1, 2]
+        assert matrix.dtype == np.float32
+        np.testing.assert_allclose(matrix, rows, atol=atol)
+
+
+def test_parse_embeddings_mixed_encodings():
+    raws = [
+        struct.pack("<2f", 1.0, 0.0),
+        encode_embedding([0.0, 1.0], "float16"),
+        memoryview(encode_embedding([1.0, 1.0], "int8")),
+    ]
+
+    ids, matrix = parse_embeddings([1, 2, 3], raws)
+
+    assert ids == [1, 2, 3]
+    np.testing.assert_allclose(matrix, [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+
+def test_parse_embeddings_empty():
+    assert parse_embeddings([], []) == ([], None)
+
+
 def test_find_similar_embeddings_basic():
     embeddings = [
         (1, [1.0, 0.0, 0.0]),
@@ -186,7 +325,7 @@ def test_find_similar_embeddings_high_dimensional():
 
 
 def test_search_entity_facts_success():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
         {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
@@ -217,7 +356,7 @@ def test_search_entity_facts_success():
 
 
 def test_search_entity_facts_no_embeddings():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = []
 
     query_embedding = [1.0, 0.0, 0.0]
@@ -235,7 +374,7 @@ def test_search_entity_facts_no_embeddings():
 
 
 def test_search_entity_facts_no_similar_results():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": "invalid_json"},
     ]
@@ -254,7 +393,7 @@ def test_search_entity_facts_no_similar_results():
 
 
 def test_search_entity_facts_respects_limit():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": i, "content_embedding": [1.0 if j == i else 0.0 for j in range(5)]}
         for i in range(5)
@@ -276,7 +415,7 @@ def test_search_entity_facts_respects_limit():
 
 
 def test_search_entity_facts_returns_required_keys():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
     ]
@@ -300,7 +439,7 @@ def test_search_entity_facts_returns_required_keys():
 
 
 def test_search_entity_facts_handles_missing_content():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
         {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
@@ -323,7 +462,7 @@ def test_search_entity_facts_handles_missing_content():
 
 
 def test_search_entity_facts_maintains_similarity_order():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
         {"id": 2, "content_embedding": [0.707, 0.707, 0.0]},
@@ -351,7 +490,7 @@ def test_search_entity_facts_maintains_similarity_order():
 
 
 def test_search_entity_facts_with_different_db_formats():
-    mock_driver = MagicMock()
+    mock_driver = _entity_fact_driver()
     mock_driver.get_embeddings.return_value = [
         {"id": 1, "content_embedding": json.dumps([1.0, 0.0, 0.0])},
         {"id": 2, "content_embedding": struct.pack("<3f", 0.0, 1.0, 0.0)},
@@ -374,3 +513,761 @@ def test_search_entity_facts_with_different_db_formats():
 
     assert len(result) == 3
     assert result[0]["id"] == 1
+
+
+def test_search_entity_facts_populates_index_cache():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+
+    index_cache = IndexCache()
+    index_cache.max_bytes = 1024
+
+    for _ in range(2):
+        result = search_entity_facts(
+            mock_driver,
+            entity_id=42,
+            query_embedding=[1.0, 0.0, 0.0],
+            limit=1,
+            embeddings_limit=1000,
+            index_cache=index_cache,
+        )
+
+        assert result[0]["id"] == 1
+
+    assert index_cache.contains(("db", 42))
+    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+    mock_driver.get_facts_by_ids.assert_called_once_with([1])
+
+
+def test_search_entity_facts_does_not_cache_empty_entity():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = []
+
+    index_cache = IndexCache()
+    index_cache.max_bytes = 1024
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        index_cache=index_cache,
+    )
+
+    assert result == []
+    assert not index_cache.contains(("db", 42))
+
+
+def test_search_entity_facts_uses_index_options():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": i, "content_embedding": [1.0 if j == i else 0.1 for j in range(8)]}
+        for i in range(8)
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 3, "content": "Fact three"}]
+
+    index_options = IndexOptions()
+    index_options.ann_backend = "hnsw"
+    index_options.ann_threshold = 4
+    index_cache = IndexCache()
+    index_cache.max_bytes = 1 << 20
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0 if j == 3 else 0.0 for j in range(8)],
+        limit=1,
+        embeddings_limit=None,
+        index_cache=index_cache,
+        index_options=index_options,
+    )
+
+    assert result[0]["id"] == 3
+    mock_driver.get_embeddings.assert_called_once_with(42, None)
+    assert next(iter(index_cache.entries.values())).backend == "hnsw"
+
+
+def test_search_entity_facts_builds_flat_index_when_uncached(monkeypatch):
+    built = []
+    monkeypatch.setattr(
+        search_module,
+        "EntityIndex",
+        lambda *args: built.append(EntityIndex(*args)) or built[-1],
+    )
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": i, "content_embedding": [1.0 if j == i else 0.1 for j in range(8)]}
+        for i in range(8)
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 3, "content": "Fact three"}]
+
+    index_options = IndexOptions()
+    index_options.ann_backend = "hnsw"
+    index_options.ann_threshold = 4
+    index_options.numpy_threshold = 0
+    index_cache = IndexCache()
+    index_cache.max_bytes = 64
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0 if j == 3 else 0.0 for j in range(8)],
+        limit=1,
+        embeddings_limit=None,
+        index_cache=index_cache,
+        index_options=index_options,
+    )
+
+    assert result[0]["id"] == 3
+    assert [index.backend for index in built] == ["flat"]
+    assert index_cache.entries == {}
+
+
+def test_search_entity_facts_uses_search_similar():
+    mock_driver = _entity_fact_driver()
+    mock_driver.search_similar.return_value = [
+        {"id": 2, "content": "Fact two", "similarity": Decimal("0.9")},
+        {"id": 1, "content": "Fact one", "similarity": 0.5},
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0, 0.0],
+        limit=2,
+        embeddings_limit=1000,
+    )
+
+    assert result == [
+        {"id": 2, "content": "Fact two", "similarity": 0.9},
+        {"id": 1, "content": "Fact one", "similarity": 0.5},
+    ]
+    mock_driver.search_similar.assert_called_once_with(42, [1.0, 0.0, 0.0], 2)
+    mock_driver.get_embeddings.assert_not_called()
+    mock_driver.get_facts_by_ids.assert_not_called()
+
+
+def test_search_entity_facts_many():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+        {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [
+        {"id": 1, "content": "Fact one"},
+        {"id": 3, "content": "Fact three"},
+    ]
+
+    result = search_entity_facts_many(
+        mock_driver,
+        entity_id=42,
+        query_embeddings=[[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.9, 0.0, 0.1]],
+        limit=1,
+        embeddings_limit=1000,
+    )
+
+    assert [[fact["content"] for fact in facts] for facts in result] == [
+        ["Fact one"],
+        ["Fact three"],
+        ["Fact one"],
+    ]
+    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+    mock_driver.get_facts_by_ids.assert_called_once_with([1, 3])
+
+
+def test_search_entity_facts_many_array_queries():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [
+        {"id": 1, "content": "Fact one"},
+        {"id": 2, "content": "Fact two"},
+    ]
+
+    result = search_entity_facts_many(
+        mock_driver,
+        entity_id=42,
+        query_embeddings=np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], np.float32),
+        limit=1,
+        embeddings_limit=1000,
+    )
+
+    assert [[fact["content"] for fact in facts] for facts in result] == [
+        ["Fact one"],
+        ["Fact two"],
+    ]
+
+
+def test_search_entity_facts_many_no_embeddings():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = []
+
+    result = search_entity_facts_many(
+        mock_driver,
+        entity_id=42,
+        query_embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        limit=5,
+        embeddings_limit=1000,
+    )
+
+    assert result == [[], []]
+    mock_driver.get_facts_by_ids.assert_not_called()
+
+
+def test_search_entity_facts_many_uses_search_similar():
+    mock_driver = _entity_fact_driver()
+    mock_driver.search_similar.side_effect = [
+        [{"id": 1, "content": "Fact one", "similarity": 0.9}],
+        [{"id": 2, "content": "Fact two", "similarity": 0.8}],
+    ]
+
+    result = search_entity_facts_many(
+        mock_driver,
+        entity_id=42,
+        query_embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        limit=1,
+        embeddings_limit=1000,
+    )
+
+    assert result == [
+        [{"id": 1, "content": "Fact one", "similarity": 0.9}],
+        [{"id": 2, "content": "Fact two", "similarity": 0.8}],
+    ]
+    assert mock_driver.search_similar.call_count == 2
+    mock_driver.get_embeddings.assert_not_called()
+
+
+def test_search_entity_facts_include_content():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0, 0.0], "content": "Fact one"},
+        {"id": 2, "content_embedding": [0.0, 1.0, 0.0], "content": "Fact two"},
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[0.0, 1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        include_content=True,
+    )
+
+    assert result[0]["id"] == 2
+    assert result[0]["content"] == "Fact two"
+    mock_driver.get_embeddings.assert_called_once_with(42, 1000, include_content=True)
+    mock_driver.get_facts_by_ids.assert_not_called()
+
+
+def _embeddings_after(rows):
+    def get_embeddings_after(entity_id, after_id, limit):
+        remaining = [row for row in rows if after_id is None or row["id"] > after_id]
+        return remaining[:limit]
+
+    return get_embeddings_after
+
+
+def test_scan_entity_embeddings_matches_exact_search():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((25, 8)).astype(np.float32)
+    rows = [
+        {"id": i + 1, "content_embedding": embedding.tolist()}
+        for i, embedding in enumerate(embeddings)
+    ]
+    queries = rng.standard_normal((2, 8)).astype(np.float32).tolist()
+
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings_after.side_effect = _embeddings_after(rows)
+
+    result = scan_entity_embeddings(mock_driver, 42, queries, limit=3, chunk_size=4)
+
+    for query, similar in zip(queries, result, strict=True):
+        expected = find_similar_embeddings(
+            [(row["id"], row["content_embedding"]) for row in rows], query, limit=3
+        )
+        assert [fact_id for fact_id, _ in similar] == [
+            fact_id for fact_id, _ in expected
+        ]
+        np.testing.assert_allclose(
+            [score for _, score in similar],
+            [score for _, score in expected],
+            rtol=1e-5,
+        )
+    assert mock_driver.get_embeddings_after.call_count == 7
+
+
+def test_scan_entity_embeddings_scans_every_chunk():
+    rows = [{"id": i, "content_embedding": [1.0, 0.0]} for i in range(1, 6)]
+    rows.append({"id": 6, "content_embedding": [0.0, 1.0]})
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings_after.side_effect = _embeddings_after(rows)
+
+    result = scan_entity_embeddings(
+        mock_driver, 42, [[0.0, 1.0]], limit=2, chunk_size=2
+    )
+
+    assert [fact_id for fact_id, _ in result[0]][0] == 6
+    assert len(result[0]) == 2
+    assert mock_driver.get_embeddings_after.call_count == 4
+
+
+def test_search_entity_facts_scan_chunk_size():
+    rows = [
+        {"id": 1, "content_embedding": [1.0, 0.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0, 0.0]},
+        {"id": 3, "content_embedding": [0.0, 0.0, 1.0]},
+    ]
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings_after.side_effect = _embeddings_after(rows)
+    mock_driver.get_facts_by_ids.return_value = [{"id": 3, "content": "Fact three"}]
+    index_cache = IndexCache()
+    index_cache.max_bytes = 1024 * 1024
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[0.0, 0.0, 1.0],
+        limit=1,
+        embeddings_limit=None,
+        index_cache=index_cache,
+        scan_chunk_size=2,
+    )
+
+    assert result == [{"id": 3, "content": "Fact three", "similarity": 1.0}]
+    mock_driver.get_embeddings.assert_not_called()
+    mock_driver.get_facts_by_ids.assert_called_once_with([3])
+    assert not index_cache.contains(("db", 42))
+
+
+def test_compute_signature():
+    embedding = np.where(np.arange(768) % 3 == 0, 1.0, -1.0)
+
+    signature = compute_signature(embedding)
+
+    assert len(signature) == 96
+    assert signature[:3] == bytes([0b10010010, 0b01001001, 0b00100100])
+
+
+def test_hamming_top_k():
+    signatures = np.array([[0b1111], [0b0000], [0b0111], [0b0001]], dtype=np.uint8)
+    queries = np.array([[0b1111], [0b0000]], dtype=np.uint8)
+
+    result = hamming_top_k(signatures, queries, 2)
+
+    assert result[0].tolist() == [0, 2]
+    assert result[1].tolist() == [1, 3]
+    assert hamming_top_k(signatures, queries, 0)[0].tolist() == []
+
+
+def test_search_signatures_reranks_shortlist():
+    embeddings = {
+        1: [1.0, 1.0, 1.0, 1.0],
+        2: [1.0, 1.0, 1.0, -1.0],
+        3: [-1.0, -1.0, -1.0, -1.0],
+        4: [1.0, 0.9, 1.0, 1.2],
+    }
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_signatures.return_value = [
+        {"id": fact_id, "content_signature": compute_signature(embedding)}
+        for fact_id, embedding in embeddings.items()
+    ]
+    mock_driver.get_embeddings_by_ids.side_effect = lambda fact_ids: [
+        {"id": fact_id, "content_embedding": embeddings[fact_id]}
+        for fact_id in fact_ids
+    ]
+
+    result = search_signatures(
+        mock_driver, 42, [[1.0, 1.0, 1.0, 1.0]], limit=2, candidates=2
+    )
+
+    assert [fact_id for fact_id, _ in result[0]] == [1, 4]
+    assert result[0][0][1] == pytest.approx(1.0)
+    mock_driver.get_signatures.assert_called_once_with(42, None)
+    mock_driver.get_embeddings_by_ids.assert_called_once_with([1, 4])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"scan_chunk_size": 1},
+        {"signature_candidates": 2},
+        {"shared_store": "shared"},
+    ],
+)
+def test_search_entity_facts_include_embeddings(tmp_path, kwargs):
+    embeddings = {1: [3.0, 0.0], 2: [0.0, 2.0]}
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": fact_id, "content_embedding": embedding}
+        for fact_id, embedding in embeddings.items()
+    ]
+    mock_driver.get_embeddings_after.side_effect = lambda entity_id, after_id, n: [
+        row
+        for row in mock_driver.get_embeddings.return_value
+        if after_id is None or row["id"] > after_id
+    ][:n]
+    mock_driver.get_signatures.return_value = [
+        {"id": fact_id, "content_signature": compute_signature(embedding)}
+        for fact_id, embedding in embeddings.items()
+    ]
+    mock_driver.get_embeddings_by_ids.side_effect = lambda fact_ids: [
+        {"id": fact_id, "content_embedding": embeddings[fact_id]}
+        for fact_id in fact_ids
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+    if kwargs.get("shared_store") == "shared":
+        kwargs = {"shared_store": SharedMatrixStore()}
+        kwargs["shared_store"].directory = str(tmp_path)
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        include_embeddings=True,
+        **kwargs,
+    )
+
+    assert [fact["id"] for fact in result] == [1]
+    embedding = np.asarray(result[0]["embedding"], dtype=np.float32)
+    np.testing.assert_allclose(embedding / np.linalg.norm(embedding), [1.0, 0.0])
+
+
+def test_search_entity_facts_omits_embeddings_by_default():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+    )
+
+    assert "embedding" not in result[0]
+
+
+@pytest.mark.parametrize("missing", [None, b""], ids=["null", "empty"])
+def test_search_signatures_partial_coverage(missing):
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_signatures.return_value = [
+        {"id": 1, "content_signature": compute_signature([1.0, -1.0])},
+        {"id": 2, "content_signature": missing},
+    ]
+
+    result = search_signatures(mock_driver, 42, [[1.0, -1.0]], limit=1, candidates=1)
+
+    assert result is None
+    mock_driver.get_embeddings_by_ids.assert_not_called()
+
+
+def test_search_entity_facts_signature_candidates():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_signatures.return_value = [
+        {"id": 1, "content_signature": compute_signature([1.0, -1.0])},
+        {"id": 2, "content_signature": compute_signature([-1.0, 1.0])},
+    ]
+    mock_driver.get_embeddings_by_ids.return_value = [
+        {"id": 2, "content_embedding": [-1.0, 1.0]}
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 2, "content": "Fact two"}]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[-0.5, 0.5],
+        limit=1,
+        embeddings_limit=1000,
+        signature_candidates=1,
+    )
+
+    assert result == [
+        {"id": 2, "content": "Fact two", "similarity": pytest.approx(1.0)}
+    ]
+    mock_driver.get_signatures.assert_called_once_with(42, 1000)
+    mock_driver.get_embeddings_by_ids.assert_called_once_with([2])
+    mock_driver.get_embeddings.assert_not_called()
+
+
+def test_search_entity_facts_signature_candidates_unsupported():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        signature_candidates=10,
+    )
+
+    assert result[0]["id"] == 1
+    mock_driver.get_embeddings_by_ids.assert_not_called()
+
+
+def test_lexical_terms():
+    assert lexical_terms('Where is "my" RED-bike?') == [
+        "where",
+        "is",
+        "my",
+        "red",
+        "bike",
+    ]
+    assert lexical_terms("?!") == []
+
+
+def test_fuse_facts():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings_by_ids.return_value = [
+        {"id": 3, "content_embedding": [0.6, 0.8]}
+    ]
+    dense = [
+        {"id": 1, "content": "Fact one", "similarity": 0.9},
+        {"id": 2, "content": "Fact two", "similarity": 0.8},
+    ]
+    lexical = [
+        {"id": 3, "content": "Fact three", "score": 2.0},
+        {"id": 2, "content": "Fact two", "score": 1.0},
+    ]
+
+    result = fuse_facts(mock_driver, [[1.0, 0.0]], [dense], [lexical], 3, 0.5)
+
+    assert [fact["id"] for fact in result[0]] == [2, 1, 3]
+    assert result[0][2] == {
+        "id": 3,
+        "content": "Fact three",
+        "similarity": pytest.approx(0.6),
+    }
+    mock_driver.get_embeddings_by_ids.assert_called_once_with([3])
+
+
+def test_search_entity_facts_hybrid():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [
+        {"id": 1, "content": "Fact one"},
+        {"id": 2, "content": "Fact two"},
+    ]
+    mock_driver.search_lexical.return_value = [
+        {"id": 2, "content": "Fact two", "score": 3.0}
+    ]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        query_text="fact two",
+        lexical_weight=0.75,
+        lexical_limit=5,
+    )
+
+    assert [fact["id"] for fact in result] == [2]
+    assert result[0]["similarity"] == pytest.approx(0.0)
+    mock_driver.search_lexical.assert_called_once_with(42, "fact two", 5)
+    mock_driver.get_embeddings_by_ids.assert_not_called()
+
+
+def test_search_entity_facts_hybrid_without_fulltext():
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+
+    result = search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        query_text="fact one",
+        lexical_weight=0.5,
+    )
+
+    assert result == [{"id": 1, "content": "Fact one", "similarity": 1.0}]
+
+
+def test_search_entity_facts_shared_store(tmp_path):
+    store = SharedMatrixStore()
+    store.directory = str(tmp_path)
+
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 2, "content": "Fact two"}]
+
+    for _ in range(2):
+        result = search_entity_facts(
+            mock_driver,
+            entity_id=42,
+            query_embedding=[0.0, 2.0],
+            limit=1,
+            embeddings_limit=1000,
+            shared_store=store,
+        )
+        assert result == [{"id": 2, "content": "Fact two", "similarity": 1.0}]
+
+    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+
+    store.invalidate(("db", 42))
+    search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[0.0, 2.0],
+        limit=1,
+        embeddings_limit=1000,
+        shared_store=store,
+    )
+    assert mock_driver.get_embeddings.call_count == 2
+
+
+def test_search_shared_matrix_rank_weight(tmp_path):
+    store = SharedMatrixStore()
+    store.directory = str(tmp_path)
+
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [0.9, 0.1]},
+        {"id": 2, "content_embedding": [1.0, 0.0]},
+    ]
+
+    similar = search_shared_matrix(
+        mock_driver, store, 42, [[1.0, 0.0]], 2, 1000, rank_weight=0.5
+    )
+
+    assert [fact_id for fact_id, _ in similar[0]] == [1, 2]
+    assert search_shared_matrix(mock_driver, store, 42, [[1.0]], 2, 1000) == [[]]
+
+
+def test_search_entity_facts_snapshot_store(tmp_path):
+    store = SnapshotStore()
+    store.directory = str(tmp_path)
+
+    rows = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0]},
+    ]
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings_after.side_effect = _embeddings_after(rows)
+    mock_driver.get_facts_by_ids.return_value = [{"id": 2, "content": "Fact two"}]
+
+    for _ in range(2):
+        result = search_entity_facts(
+            mock_driver,
+            entity_id=42,
+            query_embedding=[0.0, 2.0],
+            limit=1,
+            embeddings_limit=None,
+            include_content=True,
+            snapshot_store=store,
+        )
+        assert result == [{"id": 2, "content": "Fact two", "similarity": 1.0}]
+
+    mock_driver.get_embeddings.assert_not_called()
+    mock_driver.get_embedding_matrix_with_content.assert_not_called()
+    assert [
+        call.args[1] for call in mock_driver.get_embeddings_after.call_args_list
+    ] == [
+        None,
+        2,
+    ]
+
+
+def test_search_entity_facts_snapshot_store_with_limit(tmp_path):
+    store = SnapshotStore()
+    store.directory = str(tmp_path)
+
+    mock_driver = _entity_fact_driver()
+    mock_driver.get_embeddings.return_value = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+    ]
+    mock_driver.get_facts_by_ids.return_value = [{"id": 1, "content": "Fact one"}]
+
+    search_entity_facts(
+        mock_driver,
+        entity_id=42,
+        query_embedding=[1.0, 0.0],
+        limit=1,
+        embeddings_limit=1000,
+        snapshot_store=store,
+    )
+
+    mock_driver.get_embeddings.assert_called_once_with(42, 1000)
+    mock_driver.get_embeddings_after.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+
+def _sqlite_entity_fact_driver(path, facts):
+    import sqlite3
+
+    from memori import Memori
+
+    mem = Memori(conn=lambda: sqlite3.connect(path, check_same_thread=False))
+    mem.config.storage.build()
+    driver = mem.config.storage.driver
+    entity_id = driver.entity.create("user")
+    driver.entity_fact.create(entity_id, facts, [[1.0, 0.0, 0.0]] * len(facts))
+    mem.config.storage.adapter.commit()
+    return driver.entity_fact, entity_id
+
+
+def test_search_entity_facts_caches_keep_databases_apart(tmp_path):
+    driver_a, entity_a = _sqlite_entity_fact_driver(
+        str(tmp_path / "a.db"), ["A likes pizza"]
+    )
+    driver_b, entity_b = _sqlite_entity_fact_driver(
+        str(tmp_path / "b.db"), ["B likes sushi"]
+    )
+    assert entity_a == entity_b
+
+    index_cache = IndexCache()
+    index_cache.max_bytes = 1024 * 1024
+    shared_store = SharedMatrixStore()
+    shared_store.directory = str(tmp_path / "shared")
+    snapshot_store = SnapshotStore()
+    snapshot_store.directory = str(tmp_path / "snapshots")
+
+    for kwargs in (
+        {"index_cache": index_cache},
+        {"shared_store": shared_store},
+        {"shared_store": shared_store, "snapshot_store": snapshot_store},
+    ):
+        for driver, content in (
+            (driver_a, "A likes pizza"),
+            (driver_b, "B likes sushi"),
+        ):
+            result = search_entity_facts(
+                driver,
+                entity_id=entity_a,
+                query_embedding=[1.0, 0.0, 0.0],
+                limit=5,
+                embeddings_limit=1000,
+                **kwargs,
+            )
+
+            assert [fact["content"] for fact in result] == [content]
@@ -0,0 +1,164 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from memori._config import Config
+from memori._shared import (
+    SharedMatrixStore,
+    get_shared_matrix_store,
+    get_shared_matrix_stores,
+)
+
+
+def _store(directory, secs_ttl=None, max_bytes=None):
+    store = SharedMatrixStore()
+    store.directory = str(directory)
+    store.max_bytes = max_bytes
+    store.secs_ttl = secs_ttl
+    return store
+
+
+def test_shared_matrix_store_configure(tmp_path):
+    config = Config()
+    config.recall_shared_matrix_dir = str(tmp_path)
+    config.recall_shared_matrix_secs_ttl = 60
+    config.recall_shared_matrix_max_bytes = 4096
+
+    store = SharedMatrixStore().configure(config)
+
+    assert store.enabled
+    assert store.directory == str(tmp_path)
+    assert store.max_bytes == 4096
+    assert store.secs_ttl == 60
+
+
+def test_get_shared_matrix_store_by_config(tmp_path):
+    config = Config()
+    config.recall_shared_matrix_dir = str(tmp_path / "a")
+    other = Config()
+    other.recall_shared_matrix_dir = str(tmp_path / "b")
+
+    store = get_shared_matrix_store(config)
+
+    assert get_shared_matrix_store(config) is store
+    assert get_shared_matrix_store(other) is not store
+    assert get_shared_matrix_store(other).directory == str(tmp_path / "b")
+    assert store.directory == str(tmp_path / "a")
+    assert not get_shared_matrix_store().enabled
+    assert store in get_shared_matrix_stores()
+
+
+def test_shared_matrix_store_disabled():
+    store = SharedMatrixStore()
+
+    ids, matrix = store.put(1, 1000, b"0" * 16, [1], [[3.0, 4.0]])
+
+    assert ids == [1]
+    assert matrix.tolist() == [[pytest.approx(0.6), pytest.approx(0.8)]]
+    assert store.get(1, 1000) is None
+
+
+def test_shared_matrix_store_put_and_get(tmp_path):
+    writer = _store(tmp_path)
+    reader = _store(tmp_path)
+
+    token = writer.generation(42)
+    writer.put(42, 1000, token, [7, 8], [[3.0, 4.0], [0.0, 2.0]])
+
+    ids, matrix = reader.get(42, 1000)
+
+    assert ids == [7, 8]
+    assert matrix.tolist() == [[pytest.approx(0.6), pytest.approx(0.8)], [0.0, 1.0]]
+    assert not matrix.flags.writeable
+    assert reader.get(42, None) is None
+    assert reader.get(43, 1000) is None
+
+
+def test_shared_matrix_store_invalidate(tmp_path):
+    store = _store(tmp_path)
+
+    token = store.generation(42)
+    store.put(42, 1000, token, [7], [[1.0, 0.0]])
+    store.invalidate(42)
+
+    assert store.generation(42) != token
+    assert store.get(42, 1000) is None
+    assert not os.path.exists(store._path(42, store._suffix(1000)))
+
+
+def test_shared_matrix_store_stale_build(tmp_path):
+    store = _store(tmp_path)
+
+    token = store.generation(42)
+    store.invalidate(42)
+    store.put(42, 1000, token, [7], [[1.0, 0.0]])
+
+    assert store.get(42, 1000) is None
+
+
+def test_shared_matrix_store_expired(tmp_path):
+    store = _store(tmp_path, secs_ttl=60)
+
+    store.put(42, 1000, store.generation(42), [7], [[1.0, 0.0]])
+    assert store.get(42, 1000) is not None
+
+    path = store._path(42, store._suffix(1000))
+    os.utime(path, (0, 0))
+    assert store.get(42, 1000) is None
+
+
+def test_shared_matrix_store_non_integer_ids(tmp_path):
+    store = _store(tmp_path)
+
+    ids, matrix = store.put(42, 1000, store.generation(42), ["a"], [[1.0, 0.0]])
+
+    assert ids == ["a"]
+    assert isinstance(matrix, np.ndarray)
+    assert store.get(42, 1000) is None
+
+
+def test_shared_matrix_store_evicts_oldest_segments(tmp_path):
+    # One segment of a single 2-dimensional row takes 48 bytes.
+    store = _store(tmp_path, max_bytes=100)
+
+    for entity_id in (1, 2):
+        store.put(entity_id, None, store.generation(entity_id), [7], [[1.0, 0.0]])
+        os.utime(store._path(entity_id, "all.mat"), (entity_id, entity_id))
+    store.put(3, None, store.generation(3), [7], [[1.0, 0.0]])
+
+    assert store.get(1, None) is None
+    assert not os.path.exists(store._path(1, "all.mat"))
+    assert store.get(2, None) is not None
+    assert store.get(3, None) is not None
+
+
+def test_shared_matrix_store_evicts_expired_segments(tmp_path):
+    store = _store(tmp_path, secs_ttl=60)
+
+    store.put(1, None, store.generation(1), [7], [[1.0, 0.0]])
+    os.utime(store._path(1, "all.mat"), (0, 0))
+    store.put(2, None, store.generation(2), [7], [[1.0, 0.0]])
+
+    assert not os.path.exists(store._path(1, "all.mat"))
+    assert store.get(2, None) is not None
+
+
+def test_shared_matrix_store_skips_segments_over_max_bytes(tmp_path):
+    store = _store(tmp_path, max_bytes=40)
+
+    ids, matrix = store.put(1, None, store.generation(1), [7], [[3.0, 4.0]])
+
+    assert ids == [7]
+    assert matrix.tolist() == [[pytest.approx(0.6), pytest.approx(0.8)]]
+    assert store.get(1, None) is None
@@ -0,0 +1,264 @@
+r"""
+ __  __                           _
+|  \/  | ___ _ __ ___   ___  _ __(_)
+| |\/| |/ _ \ '_ ` _ \ / _ \| '__| |
+| |  | |  __/ | | | | | (_) | |  | |
+|_|  |_|\___|_| |_| |_|\___/|_|  |_|
+                 perfectam memoriam
+                      memorilabs.ai
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from memori._config import Config
+from memori._snapshot import SnapshotStore, get_snapshot_store
+from memori.storage._base import BaseEntityFact
+
+
+def _store(directory, max_bytes=None):
+    store = SnapshotStore()
+    store.directory = str(directory)
+    store.max_bytes = max_bytes
+    return store
+
+
+def _entity_fact_driver(rows):
+    def get_embeddings_after(entity_id, after_id, limit):
+        newer = [row for row in rows if after_id is None or row["id"] > after_id]
+        return newer[:limit]
+
+    def get_embedding_stats(entity_id, until_id):
+        older = [row["id"] for row in rows if row["id"] <= until_id]
+        return {"count": len(older), "max_id": max(older, default=None)}
+
+    mock_driver = MagicMock()
+    mock_driver.cache_key.side_effect = lambda entity_id: ("db", entity_id)
+    mock_driver.get_embeddings_after.side_effect = get_embeddings_after
+    mock_driver.get_embedding_stats.side_effect = get_embedding_stats
+    mock_driver.iter_embedding_matrices.side_effect = (
+        lambda entity_id, chunk_size, after_id=None: (
+            BaseEntityFact.iter_embedding_matrices(
+                mock_driver, entity_id, chunk_size, after_id
+            )
+        )
+    )
+    return mock_driver
+
+
+def test_snapshot_store_configure(tmp_path):
+    config = Config()
+    config.recall_snapshot_dir = str(tmp_path)
+    config.recall_scan_chunk_size = 50
+    config.recall_snapshot_max_bytes = 4096
+
+    store = SnapshotStore().configure(config)
+
+    assert store.enabled
+    assert store.directory == str(tmp_path)
+    assert store.chunk_size == 50
+    assert store.max_bytes == 4096
+
+
+def test_get_snapshot_store_by_config(tmp_path):
+    config = Config()
+    config.recall_snapshot_dir = str(tmp_path / "a")
+    other = Config()
+    other.recall_snapshot_dir = str(tmp_path / "b")
+
+    store = get_snapshot_store(config)
+
+    assert get_snapshot_store(config) is store
+    assert get_snapshot_store(other) is not store
+    assert get_snapshot_store(other).directory == str(tmp_path / "b")
+    assert store.directory == str(tmp_path / "a")
+    assert not get_snapshot_store().enabled
+
+
+def test_snapshot_store_disabled():
+    mock_driver = _entity_fact_driver([{"id": 1, "content_embedding": [1.0, 0.0]}])
+
+    ids, matrix = SnapshotStore().load(mock_driver, 42)
+
+    assert ids == [1]
+    assert matrix.tolist() == [[1.0, 0.0]]
+
+
+def test_snapshot_store_load_incremental(tmp_path):
+    rows = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+        {"id": 2, "content_embedding": [0.0, 1.0]},
+    ]
+    mock_driver = _entity_fact_driver(rows)
+
+    ids, matrix = _store(tmp_path).load(mock_driver, 42)
+
+    assert ids == [1, 2]
+    assert isinstance(matrix, np.memmap)
+    assert not matrix.flags.writeable
+
+    rows.append({"id": 3, "content_embedding": [1.0, 1.0]})
+    mock_driver.get_embeddings_after.reset_mock()
+
+    ids, matrix = _store(tmp_path).load(mock_driver, 42)
+
+    assert ids == [1, 2, 3]
+    assert matrix.tolist() == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    mock_driver.get_embeddings_after.assert_called_once_with(42, 2, 1000)
+
+
+def test_snapshot_store_appends_new_rows(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    _, matrix_path, _ = store._paths(("db", 42))
+    inode = os.stat(matrix_path).st_ino
+
+    rows.append({"id": 2, "content_embedding": [0.0, 1.0]})
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == [1, 2]
+    assert matrix.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+    assert os.stat(matrix_path).st_ino == inode
+    assert os.path.getsize(matrix_path) == 2 * 2 * 4
+
+
+def test_snapshot_store_ignores_rows_past_header(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    ids_path, matrix_path, _ = store._paths(("db", 42))
+    with open(ids_path, "ab") as f:
+        f.write(np.asarray([7], dtype="<i8").tobytes())
+    with open(matrix_path, "ab") as f:
+        f.write(np.asarray([[9.0, 9.0]], dtype="<f4").tobytes())
+
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == [1]
+    assert matrix.tolist() == [[1.0, 0.0]]
+
+
+def test_snapshot_store_append_cuts_off_interrupted_rows(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    ids_path, matrix_path, _ = store._paths(("db", 42))
+    with open(matrix_path, "ab") as f:
+        f.write(np.zeros((3, 2), dtype="<f4").tobytes())
+
+    rows.append({"id": 2, "content_embedding": [0.0, 1.0]})
+    store.load(mock_driver, 42)
+
+    assert os.path.getsize(ids_path) == 2 * 8
+    assert os.path.getsize(matrix_path) == 2 * 2 * 4
+
+
+def test_snapshot_store_evicts_least_recently_used(tmp_path):
+    # One snapshot of a single 2-dimensional row takes 36 bytes.
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path, max_bytes=80)
+
+    store.load(mock_driver, 1)
+    store.load(mock_driver, 2)
+    os.utime(store._paths(("db", 1))[2], (0, 0))
+    os.utime(store._paths(("db", 2))[2], (1, 1))
+    store.load(mock_driver, 1)
+    store.load(mock_driver, 3)
+
+    assert all(os.path.exists(path) for path in store._paths(("db", 1)))
+    assert not any(os.path.exists(path) for path in store._paths(("db", 2)))
+    assert all(os.path.exists(path) for path in store._paths(("db", 3)))
+
+
+def test_snapshot_store_eviction_keeps_other_files(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    store = _store(tmp_path, max_bytes=0)
+    shared_path = tmp_path / "memori-0123.all.mat"
+    shared_path.write_bytes(b"0" * 64)
+    tmp_header = tmp_path / "memori-4567.snap.1.2.tmp"
+    tmp_header.write_bytes(b"0")
+    os.utime(tmp_header, (0, 0))
+
+    store.load(_entity_fact_driver(rows), 42)
+
+    assert shared_path.exists()
+    assert not tmp_header.exists()
+    assert not any(os.path.exists(path) for path in store._paths(("db", 42)))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda rows: rows.pop(0),
+        lambda rows: rows.pop(),
+        lambda rows: rows.insert(1, {"id": 2, "content_embedding": [1.0, 1.0]}),
+    ],
+    ids=["deleted", "deleted_last", "late_lower_id"],
+)
+def test_snapshot_store_rebuilds_when_stale(tmp_path, change):
+    rows = [
+        {"id": 1, "content_embedding": [1.0, 0.0]},
+        {"id": 3, "content_embedding": [0.0, 1.0]},
+    ]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    change(rows)
+
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == [row["id"] for row in rows]
+    assert matrix.tolist() == [row["content_embedding"] for row in rows]
+
+
+def test_snapshot_store_invalidate(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    rows[0] = {"id": 1, "content_embedding": [0.0, 1.0]}
+    store.invalidate(("db", 42))
+
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == [1]
+    assert matrix.tolist() == [[0.0, 1.0]]
+
+
+def test_snapshot_store_dimension_change(tmp_path):
+    rows = [{"id": 1, "content_embedding": [1.0, 0.0]}]
+    mock_driver = _entity_fact_driver(rows)
+    store = _store(tmp_path)
+
+    store.load(mock_driver, 42)
+    rows[0] = {"id": 1, "content_embedding": [1.0, 0.0, 0.0]}
+    rows.append({"id": 2, "content_embedding": [0.0, 1.0, 0.0]})
+
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == [1, 2]
+    assert matrix.tolist() == [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+
+
+def test_snapshot_store_non_integer_ids(tmp_path):
+    mock_driver = _entity_fact_driver([{"id": "a", "content_embedding": [1.0, 0.0]}])
+    store = _store(tmp_path)
+
+    ids, matrix = store.load(mock_driver, 42)
+
+    assert ids == ["a"]
+    assert matrix.tolist() == [[1.0, 0.0]]
+    assert list(tmp_path.iterdir()) == []